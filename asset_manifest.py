@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+빌드 후 처리: 콘텐츠 해시 자산 이름 + 미리 압축한 gzip/brotli 파일 + 자산 매니페스트
+
+gameserver.js는 dist/를 express.static으로 그대로 내보내서 큰 JSON 맵과 타일셋이
+압축 없이, 장기 캐시 헤더 없이 전송된다. (해시 이름이 붙는 파일은 Vite가 만든 JS뿐)
+빌드가 끝난 dist/에서
+1) 맵 JSON, 타일셋/스프라이트 이미지 등을 내용 해시 이름(name.<hash>.ext)으로 복사하고
+2) 압축 효과가 있는 파일마다 .gz / .br 형제 파일을 병렬로 만들고
+3) 논리 이름 → 해시 URL 매니페스트(asset-manifest.json)를 쓴다.
+gameserver.js는 매니페스트를 읽어 해시 파일에 immutable 캐시 헤더를 붙이고
+Accept-Encoding에 맞는 미리 압축한 파일을 보낸다. main.js는 매니페스트로 자산 URL을 바꾼다.
+
+brotli 모듈이 없으면 gzip만 만든다 (pip install brotli).
+
+사용 예:
+    npm run build && python asset_manifest.py dist
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from tile_match_cache import file_digest
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = 'asset-manifest.json'
+HASH_LENGTH = 8
+
+# 해시 이름을 붙일 자산 (dist 기준 glob)
+FINGERPRINT_PATTERNS = [
+    'default_map.json',
+    'tavern_map.json',
+    'assets/*.json',
+    'assets/*.png',
+    'assets/*.jpg',
+    'assets/*.jpeg',
+    'assets/*.webp',
+    'assets/chunks/*',
+    'bundles/*.bundle',
+]
+# 이름은 그대로 두고 미리 압축만 하는 파일 (Vite 결과물 등)
+PRECOMPRESS_PATTERNS = [
+    'index.html',
+    'assets/*.js',
+    'assets/*.css',
+]
+VITE_HASHED = re.compile(r'-[A-Za-z0-9_-]{8}\.(js|css)$')  # Vite가 이미 해시를 붙인 파일
+MIN_SAVING = 0.1  # 10% 이상 줄어들 때만 압축 파일 유지
+
+
+def _is_generated(path):
+    """이 스크립트가 만든 파일 (해시 복사본, 압축 파일, 매니페스트)"""
+    name = os.path.basename(path)
+    return (name.endswith(('.gz', '.br')) or name == MANIFEST_NAME
+            or re.search(rf'\.[0-9a-f]{{{HASH_LENGTH}}}\.[^.]+$', name) is not None)
+
+
+def collect(dist_dir, patterns):
+    """dist 기준 상대 경로 목록 (정렬, 이 스크립트가 만든 파일 제외)"""
+    found = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(dist_dir, pattern)):
+            if os.path.isfile(path) and not _is_generated(path):
+                found.add(os.path.relpath(path, dist_dir).replace(os.sep, '/'))
+    return sorted(found)
+
+
+def hashed_name(rel_path, digest):
+    """assets/New_Tileset.png → assets/New_Tileset.<hash>.png"""
+    stem, ext = os.path.splitext(rel_path)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def fingerprint(dist_dir, rel_path):
+    """해시 이름 복사본 만들기 (같은 자산의 예전 해시 복사본은 삭제) → (해시 경로, 해시)"""
+    src = os.path.join(dist_dir, rel_path)
+    digest = file_digest(src)
+    target = hashed_name(rel_path, digest)
+
+    stem, ext = os.path.splitext(os.path.basename(rel_path))
+    stale = re.compile(rf'^{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(ext)}(\.gz|\.br)?$')
+    folder = os.path.dirname(src)
+    for name in os.listdir(folder):
+        if stale.match(name) and not name.startswith(os.path.basename(target)):
+            os.remove(os.path.join(folder, name))
+
+    if not os.path.exists(os.path.join(dist_dir, target)):
+        shutil.copy2(src, os.path.join(dist_dir, target))
+    return target, digest
+
+
+def precompress(path, min_saving=MIN_SAVING):
+    """
+    .gz / .br 형제 파일 만들기 (압축 효과가 min_saving 미만이면 만들지 않음)
+
+    Returns:
+        {인코딩: 압축 크기} (예: {"br": 1234, "gzip": 2345})
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    limit = len(data) * (1 - min_saving)
+
+    variants = [('gzip', '.gz', lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.insert(0, ('br', '.br', lambda d: brotli.compress(d, quality=11)))
+
+    sizes = {}
+    for encoding, suffix, compress in variants:
+        out = path + suffix
+        packed = compress(data)
+        if len(packed) <= limit:
+            with open(out, 'wb') as f:
+                f.write(packed)
+            sizes[encoding] = len(packed)
+        elif os.path.exists(out):
+            os.remove(out)
+    return sizes
+
+
+def build_manifest(dist_dir, workers=None):
+    """
+    dist 폴더 처리 후 매니페스트 dict 반환
+
+    manifest["assets"]: {"/논리 경로": {"url", "hash", "bytes", "encodings"}}
+    manifest["immutable"]: 영구 캐시해도 되는 URL 목록 (해시 이름 + Vite 해시 파일)
+    manifest["precompressed"]: {URL: [인코딩, ...]} (선호 순서)
+    """
+    assets = {}
+    served = []  # (URL, 파일 경로)
+    for rel_path in collect(dist_dir, FINGERPRINT_PATTERNS):
+        target, digest = fingerprint(dist_dir, rel_path)
+        assets['/' + rel_path] = {
+            "url": '/' + target,
+            "hash": digest,
+            "bytes": os.path.getsize(os.path.join(dist_dir, rel_path)),
+        }
+        served.append(('/' + target, os.path.join(dist_dir, target)))
+
+    passthrough = collect(dist_dir, PRECOMPRESS_PATTERNS)
+    served += [('/' + rel_path, os.path.join(dist_dir, rel_path)) for rel_path in passthrough]
+
+    # zlib/brotli는 압축 중 GIL을 놓으므로 스레드로 병렬 처리
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(precompress, [path for _, path in served]))
+
+    precompressed = {url: list(sizes) for (url, _), sizes in zip(served, results) if sizes}
+    for entry in assets.values():
+        entry["encodings"] = precompressed.get(entry["url"], [])
+
+    immutable = [entry["url"] for entry in assets.values()]
+    immutable += ['/' + rel_path for rel_path in passthrough if VITE_HASHED.search(rel_path)]
+
+    manifest = {
+        "assets": assets,
+        "immutable": sorted(immutable),
+        "precompressed": precompressed,
+    }
+    with open(os.path.join(dist_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest, served, results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='해시 자산 이름 + 미리 압축 + 자산 매니페스트')
+    parser.add_argument('dist', nargs='?', default='dist')
+    parser.add_argument('--workers', type=int, default=None, help='압축 스레드 수 (기본값: CPU 수 기반)')
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("⚠️ brotli 모듈이 없어 gzip만 생성합니다 (pip install brotli)")
+
+    manifest, served, results = build_manifest(args.dist, args.workers)
+    original = sum(os.path.getsize(path) for _, path in served)
+    best = sum(min(sizes.values()) if sizes else os.path.getsize(path)
+               for (_, path), sizes in zip(served, results))
+    print(f"🔖 해시 자산 {len(manifest['assets'])}개, 미리 압축 {len(manifest['precompressed'])}개")
+    print(f"📦 전송 크기: {original / 2 ** 20:.2f} MB → {best / 2 ** 20:.2f} MB")
+    print(f"✅ 매니페스트: {os.path.join(args.dist, MANIFEST_NAME)}")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+비트마스크 오토타일링 (벡터화)
+
+generate_large_map.py / expand_map.py는 칸마다 지형 계열의 첫 타일(WATER[0], SAND[0], ...)을 넣어
+물/모래/풀 경계가 딱딱하게 끊긴다. 모든 칸의 4방향 또는 8방향 이웃 비트마스크를
+배열 밀기(shift) 몇 번으로 한꺼번에 계산하고, 지형별 조회표(Wang/blob)로 경계 타일 ID를 고른다.
+
+비트 (이웃이 같은 지형이면 1, 맵 밖은 같은 지형으로 봄):
+    4방향: N=1, E=2, S=4, W=8                         → 16가지
+    8방향: N=1, NE=2, E=4, SE=8, S=16, SW=32, W=64, NW=128
+           모서리 비트는 맞닿은 두 변이 모두 같은 지형일 때만 남김 (blob) → 47가지
+
+조회표 값이 -1이면 원래 타일을 그대로 둔다 (내부 칸의 변형 타일 유지).
+전환 타일이 특정 지형과의 경계만 그린 경우(풀 물가, 모래 해변 등) 규칙의 "borders"로
+그 방향 이웃이 해당 타일일 때만 경계로 보게 좁힌다.
+
+사용 예:
+    python autotile.py public/default_map.json --out public/default_map_autotiled.json
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from sparse_map import decode_map
+
+EDGE_BITS_4 = {'N': 1, 'E': 2, 'S': 4, 'W': 8}
+EDGE_BITS_8 = {'N': 1, 'NE': 2, 'E': 4, 'SE': 8, 'S': 16, 'SW': 32, 'W': 64, 'NW': 128}
+OFFSETS = {'N': (-1, 0), 'NE': (-1, 1), 'E': (0, 1), 'SE': (1, 1),
+           'S': (1, 0), 'SW': (1, -1), 'W': (0, -1), 'NW': (-1, -1)}
+CORNER_EDGES = {'NE': ('N', 'E'), 'SE': ('S', 'E'), 'SW': ('S', 'W'), 'NW': ('N', 'W')}
+
+
+def _blob_tables():
+    """8방향 마스크 256개 → blob 축약 마스크, 축약 마스크 → 0..46 번호"""
+    reduce = np.arange(256, dtype=np.int64)
+    for corner, (a, b) in CORNER_EDGES.items():
+        both = (reduce & EDGE_BITS_8[a]).astype(bool) & (reduce & EDGE_BITS_8[b]).astype(bool)
+        reduce = np.where(both, reduce, reduce & ~EDGE_BITS_8[corner])
+    masks = np.unique(reduce)
+    index = np.searchsorted(masks, reduce)
+    return reduce, masks, index
+
+
+BLOB_REDUCE, BLOB_MASKS, BLOB_INDEX = _blob_tables()  # BLOB_MASKS: 47개 축약 마스크 (오름차순)
+
+
+def shifted(grid, direction):
+    """칸마다 direction 방향 이웃 값 (맵 밖은 가장자리 복제)"""
+    grid = np.asarray(grid)
+    dy, dx = OFFSETS[direction]
+    h, w = grid.shape
+    return np.pad(grid, 1, mode='edge')[1 + dy:1 + dy + h, 1 + dx:1 + dx + w]
+
+
+def neighbour_masks(terrain, mode=4):
+    """
+    (H, W) 지형 번호 격자 → 칸별 이웃 비트마스크 (H, W)
+
+    mode 8이면 blob 축약 전 원래 8비트 마스크
+    """
+    terrain = np.asarray(terrain)
+    bits = EDGE_BITS_4 if mode == 4 else EDGE_BITS_8
+    masks = np.zeros(terrain.shape, dtype=np.int64)
+    for direction, bit in bits.items():
+        masks |= np.where(shifted(terrain, direction) == terrain, bit, 0)
+    return masks
+
+
+def mask_index(masks, mode=4):
+    """이웃 마스크 → 조회표 칸 번호 (4방향: 0..15, 8방향: blob 0..46)"""
+    return masks if mode == 4 else BLOB_INDEX[masks]
+
+
+def edge_lut(edges, mode=4):
+    """
+    경계 방향별 타일로 지형 하나의 조회표 만들기
+
+    Args:
+        edges: {방향: 타일 ID} (앞에 있는 방향 우선)
+               변 'N'/'E'/'S'/'W'는 그 방향 이웃이 다른 지형일 때,
+               모서리 'NE' 등(8방향만)은 두 변은 같고 모서리만 다른 안쪽 모서리일 때 사용
+        mode: 4 또는 8
+
+    Returns:
+        (16,) 또는 (47,) int64 조회표 (해당 없는 마스크는 -1)
+    """
+    bits = EDGE_BITS_4 if mode == 4 else EDGE_BITS_8
+    masks = np.arange(16) if mode == 4 else BLOB_MASKS
+    lut = np.full(len(masks), -1, dtype=np.int64)
+    for i, mask in enumerate(masks.tolist()):
+        for direction, tile in edges.items():
+            if direction in CORNER_EDGES:
+                a, b = CORNER_EDGES[direction]
+                missing = (mask & bits[a]) and (mask & bits[b]) and not (mask & bits[direction])
+            else:
+                missing = not (mask & bits[direction])
+            if missing:
+                lut[i] = tile
+                break
+    return lut
+
+
+def classify(data, families):
+    """타일 ID 격자 → 지형 번호 격자 (families[i]에 속하면 i, 아니면 -1)"""
+    data = np.asarray(data, dtype=np.int64)
+    table = np.full(max(int(data.max()), max(max(f) for f in families)) + 1, -1, dtype=np.int64)
+    for i, family in enumerate(families):
+        table[list(family)] = i
+    return table[data]
+
+
+def autotile(data, rules, mode=4):
+    """
+    지형 경계 칸을 전환 타일로 바꾼 mapData 배열
+
+    Args:
+        data: (H, W) 타일 ID 격자
+        rules: [{"tiles": 지형에 속한 타일 ID 목록, "lut": 조회표 또는 "edges": {방향: 타일},
+                 "borders": {방향: 타일 ID 목록} (선택)}, ...]
+               borders에 있는 방향은 그 방향 이웃이 목록의 타일일 때만 경계로 본다.
+        mode: 4 또는 8
+
+    Returns:
+        (H, W) int64 배열 (규칙에 없는 타일과 조회표 값이 -1인 칸은 그대로)
+    """
+    data = np.asarray(data, dtype=np.int64)
+    terrain = classify(data, [rule["tiles"] for rule in rules])
+    luts = np.stack([np.asarray(rule["lut"]) if "lut" in rule else edge_lut(rule["edges"], mode)
+                     for rule in rules] + [np.full(16 if mode == 4 else 47, -1)])
+
+    # 규칙 밖 타일(-1)은 마지막 빈 조회표로 보냄
+    masks = neighbour_masks(terrain, mode)
+    bits = EDGE_BITS_4 if mode == 4 else EDGE_BITS_8
+    for t, rule in enumerate(rules):
+        for direction, border in rule.get("borders", {}).items():
+            # 전환 타일이 그리지 않는 지형과의 경계는 같은 지형처럼 취급
+            other = (terrain == t) & ~np.isin(shifted(data, direction), border)
+            masks |= np.where(other, bits[direction], 0)
+    index = mask_index(masks, mode)
+    tiles = luts[terrain, index]
+    return np.where(tiles >= 0, tiles, data)
+
+
+# New_Tileset.png (64px, 16열) 지형과 전환 타일
+GRASS = list(range(0, 64))     # 풀 + 풀 위 나무
+WATER = list(range(80, 96))    # 열린 물
+SAND = list(range(112, 128))   # 모래
+WATER_EDGE_TILES = [64, 96]    # 대부분 물인 전환 타일 (충돌 타일에 포함)
+NEW_TILESET_RULES = [
+    # 물: 위쪽이 풀이면 풀 물가(64), 아래쪽이 모래면 모래 해변이 보이는 물(96)
+    {"tiles": WATER, "edges": {'N': 64, 'S': 96}, "borders": {'N': GRASS, 'S': SAND}},
+    # 모래: 왼쪽이 물이면 왼쪽에 얕은 물이 있는 모래(231)
+    {"tiles": SAND, "edges": {'W': 231}, "borders": {'W': WATER}},
+]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='지형 경계 오토타일링 (New_Tileset 규칙)')
+    parser.add_argument('map')
+    parser.add_argument('--out', default=None, help='기본값: 입력 파일 덮어쓰기')
+    parser.add_argument('--mode', type=int, choices=[4, 8], default=4)
+    args = parser.parse_args()
+
+    with open(args.map, 'r', encoding='utf-8') as f:
+        map_json = decode_map(json.load(f))
+    before = np.asarray(map_json["mapData"], dtype=np.int64)
+    after = autotile(before, NEW_TILESET_RULES, args.mode)
+    map_json["mapData"] = after.tolist()
+
+    out = args.out or args.map
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(map_json, f, indent=2, ensure_ascii=False)
+    print(f"✅ 경계 타일 {int((before != after).sum())}칸 변경 → {out}")
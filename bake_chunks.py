@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+정적 지형 레이어를 큰 청크 이미지로 미리 굽기
+
+main.js는 120x168 지형 레이어를 타일셋에서 타일 하나씩 그린다.
+움직이지 않는 지형은 mapData + 타일셋으로 고정 크기(예: 1024x1024px) 청크 이미지를
+미리 만들어 두면 클라이언트는 큰 스프라이트 몇 장만 그리고 타일맵은 충돌용으로만 쓸 수 있다.
+
+청크 그리기는 타일 배열 (T, ts, ts, C)을 청크의 타일 ID 블록으로 인덱싱한 뒤
+reshape 한 번으로 이미지를 조립한다 (타일별 paste 없음).
+타일 ID 구성이 같은 청크(바다만 있는 청크 등)는 이미지 파일 하나를 같이 쓴다.
+
+매니페스트 (<맵 이름>.chunks.json):
+    chunks: [{file, x, y, width, height, tileX, tileY, tileWidth, tileHeight}, ...]
+    x/y/width/height는 월드 픽셀 좌표, tile*은 청크가 덮는 타일 범위
+
+사용 예:
+    python bake_chunks.py public/default_map.json public/assets/New_Tileset.png \\
+        --out-dir public/assets/chunks --chunk-size 1024
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+from PIL import Image
+
+from sparse_map import decode_map
+from tile_store import atlas_to_tiles
+
+
+def load_tileset(tileset_path, tile_size):
+    """타일셋 → (T, ts, ts, C) 타일 배열 (완전 불투명하면 RGB, 아니면 RGBA)"""
+    img = Image.open(tileset_path).convert('RGBA')
+    arr = np.asarray(img)
+    if (arr[..., 3] == 255).all():
+        arr = arr[..., :3]
+    return atlas_to_tiles(arr, tile_size)
+
+
+def chunk_grid(width, height, chunk_tiles):
+    """[(tile_x, tile_y, tile_w, tile_h), ...] 청크 범위 (행 우선, 오른쪽/아래 가장자리는 잘림)"""
+    return [
+        (x0, y0, min(chunk_tiles, width - x0), min(chunk_tiles, height - y0))
+        for y0 in range(0, height, chunk_tiles)
+        for x0 in range(0, width, chunk_tiles)
+    ]
+
+
+def render_tiles(data, tiles):
+    """(h, w) 타일 ID 블록 → (h*ts, w*ts, C) 이미지 배열"""
+    h, w = data.shape
+    ts, channels = tiles.shape[1], tiles.shape[3]
+    return tiles[data].swapaxes(1, 2).reshape(h * ts, w * ts, channels)
+
+
+def bake_chunks(data, tiles, chunk_tiles):
+    """
+    청크 이미지 생성 (같은 타일 ID 블록은 한 번만 그림)
+
+    Yields:
+        (range, block_key, image 배열 또는 이미 그린 블록이면 None)
+    """
+    seen = set()
+    for x0, y0, w, h in chunk_grid(data.shape[1], data.shape[0], chunk_tiles):
+        block = np.ascontiguousarray(data[y0:y0 + h, x0:x0 + w])
+        block_key = (block.shape, block.tobytes())
+        if block_key in seen:
+            yield (x0, y0, w, h), block_key, None
+        else:
+            seen.add(block_key)
+            yield (x0, y0, w, h), block_key, render_tiles(block, tiles)
+
+
+def bake_map(map_path, tileset_path, out_dir, chunk_size=1024, tile_size=None, image_format='png'):
+    """
+    맵 파일 → 청크 이미지 + 매니페스트
+
+    Returns:
+        매니페스트 dict
+    """
+    with open(map_path, 'r', encoding='utf-8') as f:
+        map_json = decode_map(json.load(f))
+    tile_size = tile_size or map_json.get("tileSize", 32)
+    if chunk_size % tile_size:
+        raise ValueError(f"청크 크기({chunk_size})는 타일 크기({tile_size})의 배수여야 합니다")
+    chunk_tiles = chunk_size // tile_size
+
+    tiles = load_tileset(tileset_path, tile_size)
+    data = np.asarray(map_json["mapData"], dtype=np.int64)
+    if data.min() < 0 or data.max() >= len(tiles):
+        raise ValueError(f"mapData에 타일셋 범위(0-{len(tiles) - 1})를 벗어난 타일 ID가 있습니다")
+
+    os.makedirs(out_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(map_path))[0]
+    files = {}  # 타일 ID 블록 → 파일 이름
+    chunks = []
+    for (x0, y0, w, h), block_key, pixels in bake_chunks(data, tiles, chunk_tiles):
+        if pixels is not None:
+            file_name = f"{name}_{x0 // chunk_tiles}_{y0 // chunk_tiles}.{image_format}"
+            img = Image.fromarray(pixels)
+            if image_format == 'webp':
+                img.save(os.path.join(out_dir, file_name), 'WEBP', lossless=True)
+            else:
+                img.save(os.path.join(out_dir, file_name), optimize=True)
+            files[block_key] = file_name
+        file_name = files[block_key]
+        chunks.append({
+            "file": file_name,
+            "x": x0 * tile_size,
+            "y": y0 * tile_size,
+            "width": w * tile_size,
+            "height": h * tile_size,
+            "tileX": x0,
+            "tileY": y0,
+            "tileWidth": w,
+            "tileHeight": h
+        })
+
+    manifest = {
+        "map": os.path.basename(map_path),
+        "tileset": os.path.basename(tileset_path),
+        "tileSize": tile_size,
+        "chunkSize": chunk_size,
+        "width": int(data.shape[1]),
+        "height": int(data.shape[0]),
+        "pixelWidth": int(data.shape[1]) * tile_size,
+        "pixelHeight": int(data.shape[0]) * tile_size,
+        "chunks": chunks
+    }
+    with open(os.path.join(out_dir, f"{name}.chunks.json"), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='정적 지형 레이어를 청크 이미지로 굽기')
+    parser.add_argument('map')
+    parser.add_argument('tileset')
+    parser.add_argument('--out-dir', default=None, help='기본값: 맵 파일 폴더의 assets/chunks')
+    parser.add_argument('--chunk-size', type=int, default=1024, help='청크 한 변 픽셀 수 (타일 크기의 배수)')
+    parser.add_argument('--tile-size', type=int, default=None, help='기본값: 맵의 tileSize')
+    parser.add_argument('--format', choices=['png', 'webp'], default='png')
+    args = parser.parse_args()
+
+    out_dir = args.out_dir or os.path.join(os.path.dirname(os.path.abspath(args.map)), 'assets', 'chunks')
+    manifest = bake_map(args.map, args.tileset, out_dir, args.chunk_size, args.tile_size, args.format)
+
+    unique = len({chunk["file"] for chunk in manifest["chunks"]})
+    total_bytes = sum(os.path.getsize(os.path.join(out_dir, f)) for f in {c["file"] for c in manifest["chunks"]})
+    print(f"🗺️ {manifest['map']}: {manifest['width']}x{manifest['height']} 타일 "
+          f"→ {manifest['pixelWidth']}x{manifest['pixelHeight']}px")
+    print(f"🧱 청크 {len(manifest['chunks'])}개 ({manifest['chunkSize']}px, 이미지 {unique}장, "
+          f"{total_bytes / (1024 * 1024):.2f} MB)")
+    print(f"✅ 매니페스트: {os.path.join(out_dir, os.path.splitext(manifest['map'])[0] + '.chunks.json')}")
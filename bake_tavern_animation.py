@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+선술집 애니메이션 타일 베이커
+
+tavern_frame1~3.jpg는 일부 영역만 다른 전체 이미지 3장이라 클라이언트가 큰 텍스처 3개를 유지한다.
+프레임을 타일로 나눠 첫 프레임(기본 레이어)과 벡터 연산으로 비교하고,
+기본 레이어는 한 번만, 나머지 프레임은 바뀐 타일만 타일셋에 넣는다.
+결과는 tavern_map.json의 "animation" 항목(기본 레이어 + 프레임별 변경 타일 표)으로 기록한다.
+
+main.js TavernScene은 기본 레이어를 타일맵으로 그리고 프레임마다 변경 타일만 putTileAt으로 바꾼다.
+카메라 확대 시 선형 필터가 옆 타일을 섞지 않도록 타일마다 가장자리 1px을 복제해 두르고
+(Phaser addTilesetImage margin 1 / spacing 2), 사진 타일이라 타일셋은 JPEG로 저장한다.
+
+사용 예 (public 폴더에서):
+    python ../bake_tavern_animation.py
+"""
+
+import argparse
+import json
+
+import numpy as np
+from PIL import Image
+
+from tile_store import build_atlas, dedup_tiles, flatten_tiles, split_tiles
+
+FRAME_PATHS = [
+    "assets/tavern_frame1.jpg",
+    "assets/tavern_frame2.jpg",
+    "assets/tavern_frame3.jpg",
+]
+FRAME_DURATION = 1000  # main.js TavernScene.switchFrame 주기 (ms)
+EXTRUDE = 1  # 타일 가장자리 복제 폭 (px)
+MAX_ATLAS_WIDTH = 2048
+
+
+def load_frames(paths, tile_size):
+    """프레임을 (F, H, W, 3) 배열로 로드 (타일 크기 배수가 되도록 가장자리 복제)"""
+    frames = [np.asarray(Image.open(p).convert('RGB')) for p in paths]
+    height, width = frames[0].shape[:2]
+    for path, frame in zip(paths, frames):
+        if frame.shape[:2] != (height, width):
+            raise ValueError(f"프레임 크기가 다릅니다: {path} {frame.shape[1]}x{frame.shape[0]}")
+    pad_h = -height % tile_size
+    pad_w = -width % tile_size
+    stack = np.stack(frames)
+    if pad_h or pad_w:
+        stack = np.pad(stack, ((0, 0), (0, pad_h), (0, pad_w), (0, 0)), mode='edge')
+    return stack, (width, height)
+
+
+def bake_animation(frames, tile_size, tolerance=8.0):
+    """
+    기본 레이어 + 프레임별 변경 타일 계산
+
+    Args:
+        frames: (F, H, W, 3) uint8 프레임 배열 (H, W는 tile_size 배수)
+        tolerance: 기본 프레임과의 타일 평균 절대 오차가 이보다 크면 변경으로 간주 (JPEG 노이즈 무시)
+
+    Returns:
+        (tiles, base_layer, frame_changes)
+        tiles: (N, ts, ts, 3) 타일셋 타일
+        base_layer: (tiles_y, tiles_x) 기본 레이어 타일 ID
+        frame_changes: 프레임별 [[x, y, tile_id], ...] (0번 프레임은 빈 목록)
+    """
+    grids = np.stack([split_tiles(f, tile_size) for f in frames])  # (F, ty, tx, ts, ts, C)
+    base = grids[0]
+
+    # 모든 프레임의 모든 타일을 한 번에 기본 프레임과 비교
+    errors = np.abs(grids.astype(np.int16) - base.astype(np.int16)).mean(axis=(3, 4, 5))
+    changed = errors > tolerance  # (F, ty, tx)
+
+    # 기본 레이어 타일 + 변경된 타일만 모아 중복 제거
+    base_tiles = flatten_tiles(base)
+    frame_idx, ys, xs = np.nonzero(changed[1:])
+    changed_tiles = grids[1:][frame_idx, ys, xs]
+    tiles, inverse = dedup_tiles(np.concatenate([base_tiles, changed_tiles]))
+
+    tiles_y, tiles_x = base.shape[:2]
+    base_layer = inverse[:len(base_tiles)].reshape(tiles_y, tiles_x)
+    changed_ids = inverse[len(base_tiles):]
+
+    frame_changes = [[] for _ in range(len(frames))]
+    for f, x, y, tile_id in zip((frame_idx + 1).tolist(), xs.tolist(), ys.tolist(), changed_ids.tolist()):
+        frame_changes[f].append([x, y, tile_id])
+    return tiles, base_layer, frame_changes
+
+
+def extrude_tiles(tiles, pad=EXTRUDE):
+    """(N, ts, ts, C) → (N, ts+2*pad, ts+2*pad, C) 가장자리 픽셀 복제"""
+    return np.pad(tiles, ((0, 0), (pad, pad), (pad, pad), (0, 0)), mode='edge')
+
+
+def save_tileset(atlas, path):
+    """JPEG면 4:4:4 고품질 (타일 경계에서 색 번짐 최소화), 아니면 PNG"""
+    img = Image.fromarray(atlas)
+    if path.lower().endswith(('.jpg', '.jpeg')):
+        img.save(path, quality=90, subsampling=0, optimize=True)
+    else:
+        img.save(path, optimize=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='선술집 프레임 → 애니메이션 타일 레이어')
+    parser.add_argument('--frames', nargs='+', default=FRAME_PATHS)
+    parser.add_argument('--map', default='tavern_map.json')
+    parser.add_argument('--tileset', default='assets/tavern_tileset.jpg')
+    parser.add_argument('--tolerance', type=float, default=8.0)
+    args = parser.parse_args()
+
+    with open(args.map, 'r', encoding='utf-8') as f:
+        tavern_map = json.load(f)
+    tile_size = tavern_map.get('tileSize', 32)
+
+    frames, (image_width, image_height) = load_frames(args.frames, tile_size)
+    tiles, base_layer, frame_changes = bake_animation(frames, tile_size, args.tolerance)
+
+    cells = extrude_tiles(tiles)
+    atlas = build_atlas(cells, MAX_ATLAS_WIDTH // cells.shape[1])
+    save_tileset(atlas, args.tileset)
+
+    tavern_map["animation"] = {
+        "tileset": args.tileset,
+        "tileSize": tile_size,
+        "margin": EXTRUDE,
+        "spacing": 2 * EXTRUDE,
+        "imageWidth": image_width,
+        "imageHeight": image_height,
+        "frameDuration": FRAME_DURATION,
+        "baseLayer": base_layer.tolist(),
+        "frames": [{"changes": changes} for changes in frame_changes]
+    }
+    with open(args.map, 'w', encoding='utf-8') as f:
+        json.dump(tavern_map, f, indent=2, ensure_ascii=False)
+
+    # RGBA 텍스처 기준 (프레임 3장 vs 타일셋 1장)
+    full_bytes = len(frames) * image_width * image_height * 4
+    baked_bytes = atlas.shape[0] * atlas.shape[1] * 4
+    print(f"🎞️ 프레임 {len(frames)}장, 기본 레이어 {base_layer.shape[1]}x{base_layer.shape[0]} 타일")
+    for i, changes in enumerate(frame_changes[1:], start=2):
+        print(f"   프레임 {i}: 변경 타일 {len(changes)}개")
+    print(f"🎨 타일셋: {args.tileset} ({len(tiles)}개 타일, {atlas.shape[1]}x{atlas.shape[0]})")
+    print(f"💾 텍스처 메모리: {full_bytes / 1024 / 1024:.1f}MB → {baked_bytes / 1024 / 1024:.1f}MB")
+    print(f"✅ {args.map}에 animation 항목 추가")
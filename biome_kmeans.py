@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+데이터 기반 지형(바이옴) 분류기 (미니배치 k-평균)
+
+extract_map_simple.color_to_tile_index의 손으로 맞춘 임계값은 지역을 잘못 분류하기 쉽고,
+조정할 때마다 전체 파이프라인을 다시 돌려야 한다.
+모든 블록 평균 색상에 NumPy 미니배치 k-평균을 돌려 색상 군집을 찾고,
+군집 중심마다 타일(물/눈/풀/모래/돌/흙/숲 계열)을 한 번 정해 중심값과 함께 JSON으로 저장한다.
+(저장된 tiles 값은 직접 고쳐서 군집별 타일을 조정할 수 있다.)
+이후 변환은 가장 가까운 중심만 찾으면 된다.
+
+사용 예:
+    python biome_kmeans.py public/assets/world_map_original.jpg --tile-size 8 -k 24 --out biome_centroids.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from image_cache import load_image_array
+
+# 지형 계열 대표 색상 → 타일 (군집 중심을 가장 가까운 대표 색상의 타일로 지정)
+FAMILY_PROTOTYPES = [
+    ('water', (20, 60, 100), 250),
+    ('water', (40, 90, 140), 253),
+    ('water', (140, 180, 195), 253),
+    ('snow', (235, 240, 240), 3),
+    ('grass', (100, 135, 55), 1),
+    ('forest', (35, 60, 35), 154),
+    ('sand', (225, 200, 110), 46),
+    ('sand', (185, 120, 70), 176),
+    ('rock', (90, 85, 80), 193),
+    ('dirt', (120, 80, 50), 48),
+    ('dirt', (160, 130, 90), 25),
+]
+
+# color_to_tile_index가 돌려주는 타일 → 지형 계열
+TILE_FAMILIES = {
+    250: 'water', 253: 'water',
+    3: 'snow',
+    1: 'grass',
+    46: 'sand', 176: 'sand',
+    177: 'rock', 193: 'rock',
+    25: 'dirt', 48: 'dirt',
+    61: 'forest', 154: 'forest',
+}
+
+
+def block_means(pixels, tile_size):
+    """(H, W, 3) 이미지 → 블록별 평균 색상 (tiles_y * tiles_x, 3), 남는 가장자리는 버림"""
+    tiles_y = pixels.shape[0] // tile_size
+    tiles_x = pixels.shape[1] // tile_size
+    blocks = np.asarray(pixels[:tiles_y * tile_size, :tiles_x * tile_size], dtype=np.float32)
+    means = blocks.reshape(tiles_y, tile_size, tiles_x, tile_size, -1).mean(axis=(1, 3))
+    return means.reshape(-1, means.shape[-1]), (tiles_x, tiles_y)
+
+
+def prototype_tile(r, g, b):
+    """가장 가까운 지형 대표 색상의 타일"""
+    colors = np.array([c for _, c, _ in FAMILY_PROTOTYPES], dtype=np.float32)
+    i = int(((colors - (r, g, b)) ** 2).sum(axis=1).argmin())
+    return FAMILY_PROTOTYPES[i][2]
+
+
+def nearest_centroid(points, centroids, chunk_size=65536):
+    """각 점에서 가장 가까운 중심 인덱스 (메모리를 위해 chunk_size개씩)"""
+    points = np.asarray(points, dtype=np.float32)
+    centroids = np.asarray(centroids, dtype=np.float32)
+    c_norm = (centroids ** 2).sum(axis=1)
+    result = np.empty(len(points), dtype=np.int64)
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size]
+        # |p - c|^2 = |p|^2 - 2 p·c + |c|^2 (|p|^2는 argmin에 영향 없음)
+        result[start:start + chunk_size] = (c_norm - 2 * chunk @ centroids.T).argmin(axis=1)
+    return result
+
+
+def kmeans_plus_plus(points, k, rng):
+    """k-means++ 초기 중심"""
+    centroids = [points[rng.integers(len(points))]]
+    dist = ((points - centroids[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        total = dist.sum()
+        if total <= 0:  # 서로 다른 점이 k개보다 적음
+            centroids.append(points[rng.integers(len(points))])
+            continue
+        centroids.append(points[rng.choice(len(points), p=dist / total)])
+        dist = np.minimum(dist, ((points - centroids[-1]) ** 2).sum(axis=1))
+    return np.array(centroids, dtype=np.float32)
+
+
+def minibatch_kmeans(points, k=16, batch_size=4096, max_iter=200, tol=1e-3, seed=0):
+    """
+    미니배치 k-평균 (Sculley 2010)
+
+    매 반복마다 batch_size개 표본만 가장 가까운 중심에 배정하고,
+    중심별 누적 개수에 반비례하는 학습률로 중심을 옮긴다. 전체 데이터 크기와 상관없이
+    반복 한 번의 비용이 일정하므로 수백만 블록에도 쓸 수 있다.
+
+    Returns:
+        (k, C) 중심
+    """
+    points = np.asarray(points, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    init_sample = points[rng.choice(len(points), min(len(points), batch_size * 4), replace=False)]
+    centroids = kmeans_plus_plus(init_sample, k, rng)
+    counts = np.zeros(k, dtype=np.float64)
+
+    for _ in range(max_iter):
+        batch = points[rng.integers(len(points), size=min(batch_size, len(points)))]
+        labels = nearest_centroid(batch, centroids)
+
+        n = np.bincount(labels, minlength=k).astype(np.float64)
+        sums = np.zeros_like(centroids, dtype=np.float64)
+        np.add.at(sums, labels, batch)
+
+        # 중심 c: counts[c] += n_c, c += (sum_c - n_c * c) / counts[c]
+        counts += n
+        hit = n > 0
+        step = (sums[hit] - n[hit, None] * centroids[hit]) / counts[hit, None]
+        centroids[hit] += step.astype(np.float32)
+
+        if np.abs(step).max(initial=0) < tol:
+            break
+
+    return centroids
+
+
+class BiomeClassifier:
+    """저장된 중심값으로 블록 색상 → 타일 인덱스"""
+
+    def __init__(self, centroids, tiles, families=None, tile_size=None):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.tiles = np.asarray(tiles, dtype=np.int64)
+        self.families = families or [TILE_FAMILIES.get(int(t), 'other') for t in self.tiles]
+        self.tile_size = tile_size
+
+    @classmethod
+    def fit(cls, colors, labeler, k=16, seed=0, tile_size=None, **kwargs):
+        """블록 색상으로 중심을 학습하고 labeler(r, g, b)로 중심마다 타일 지정"""
+        centroids = minibatch_kmeans(colors, k, seed=seed, **kwargs)
+        tiles = [labeler(*(int(round(v)) for v in c[:3])) for c in centroids]
+        return cls(centroids, tiles, tile_size=tile_size)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data["centroids"], data["tiles"], data.get("families"), data.get("tileSize"))
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "tileSize": self.tile_size,
+                "k": len(self.centroids),
+                "centroids": np.round(self.centroids, 2).tolist(),
+                "tiles": self.tiles.tolist(),
+                "families": self.families
+            }, f, indent=2)
+
+    def classify(self, colors):
+        """(N, 3) 색상 → (N,) 타일 인덱스"""
+        return self.tiles[nearest_centroid(colors, self.centroids)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='블록 색상 k-평균 지형 분류기 학습')
+    parser.add_argument('images', nargs='+')
+    parser.add_argument('--tile-size', type=int, default=8, help='블록 크기 (작을수록 표본이 많음)')
+    parser.add_argument('-k', type=int, default=16, help='군집 수')
+    parser.add_argument('--batch-size', type=int, default=4096)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--labeler', choices=['prototype', 'heuristic'], default='prototype',
+                        help='군집 → 타일 지정 방식 (대표 색상 / color_to_tile_index 임계값)')
+    parser.add_argument('--out', default='biome_centroids.json')
+    args = parser.parse_args()
+
+    labeler = prototype_tile
+    if args.labeler == 'heuristic':
+        # 기존 임계값 휴리스틱을 블록마다가 아니라 군집 중심에만 한 번 적용
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public', 'map-editor'))
+        from extract_map_simple import color_to_tile_index as labeler
+
+    colors = np.concatenate([block_means(load_image_array(path), args.tile_size)[0] for path in args.images])
+    print(f"🎨 블록 {len(colors)}개 ({len(args.images)}개 이미지, {args.tile_size}px)")
+
+    classifier = BiomeClassifier.fit(colors, labeler, args.k, seed=args.seed,
+                                     tile_size=args.tile_size, batch_size=args.batch_size)
+    labels = nearest_centroid(colors, classifier.centroids)
+    counts = np.bincount(labels, minlength=args.k)
+    for i in np.argsort(-counts):
+        r, g, b = classifier.centroids[i][:3]
+        print(f"   군집 {i:2d}: ({r:5.1f}, {g:5.1f}, {b:5.1f}) → 타일 {classifier.tiles[i]:3d} "
+              f"{classifier.families[i]:6s} {counts[i] / len(colors) * 100:5.1f}%")
+
+    classifier.save(args.out)
+    print(f"✅ 저장: {args.out}")
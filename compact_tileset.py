@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+타일셋 정리: 사용하지 않는 타일 제거 + 사용 빈도순 타일 ID 재배치
+
+convert_world_map.py / expand_map.py 결과 맵은 256칸 타일셋 중 일부만 쓰지만
+타일셋 전체가 배포된다. mapData 히스토그램으로 사용 타일만 남기고,
+많이 쓰는 타일이 앞쪽(첫 페이지)에 오도록 ID를 다시 매긴 뒤
+mapData와 collisionTiles를 같은 규칙으로 변환한다.
+
+사용 예:
+    python compact_tileset.py default_map.json assets/New_Tileset.png \\
+        --out-map default_map_compact.json --out-tileset assets/Compact_Tileset.png
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+from PIL import Image
+
+from sparse_map import decode_map
+from tile_store import atlas_to_tiles, build_atlas
+
+
+def compact_tiles(map_json, tile_count):
+    """
+    빈도순 ID 재배치 계산
+
+    Returns:
+        (new_map_json, order): order[new_id] == old_id
+    """
+    data = np.asarray(map_json["mapData"], dtype=np.int64)
+    counts = np.bincount(data.ravel(), minlength=tile_count)
+    used = np.flatnonzero(counts)
+    order = used[np.argsort(-counts[used], kind='stable')]
+
+    remap = np.full(len(counts), -1, dtype=np.int64)
+    remap[order] = np.arange(len(order))
+
+    collision = sorted(int(remap[t]) for t in map_json.get("collisionTiles", [])
+                       if 0 <= t < len(remap) and remap[t] >= 0)
+
+    new_map = dict(map_json)
+    new_map["mapData"] = remap[data].tolist()
+    new_map["collisionTiles"] = collision
+    return new_map, order
+
+
+def compact_map_file(map_path, tileset_path, output_map, output_tileset, tile_size=None, tiles_per_row=16):
+    """맵 + 타일셋 파일을 읽어 정리된 맵/타일셋 파일로 저장"""
+    with open(map_path, 'r', encoding='utf-8') as f:
+        map_json = decode_map(json.load(f))
+    tile_size = tile_size or map_json.get("tileSize", 32)
+
+    tileset = Image.open(tileset_path)
+    if tileset.mode not in ('RGB', 'RGBA'):
+        tileset = tileset.convert('RGBA')
+    tiles = atlas_to_tiles(np.asarray(tileset), tile_size)
+
+    new_map, order = compact_tiles(map_json, len(tiles))
+    if order.size and order.max() >= len(tiles):
+        raise ValueError(f"mapData에 타일셋 범위({len(tiles)})를 벗어난 타일 ID가 있습니다")
+
+    Image.fromarray(build_atlas(tiles[order], tiles_per_row)).save(output_tileset, optimize=True)
+    if "tilesetImage" in new_map:
+        new_map["tilesetImage"] = os.path.basename(output_tileset)
+    with open(output_map, 'w', encoding='utf-8') as f:
+        json.dump(new_map, f, indent=2, ensure_ascii=False)
+
+    print(f"🧹 타일 {len(tiles)}개 → {len(order)}개 (사용 빈도순 재배치)")
+    print(f"✅ 맵: {output_map}")
+    print(f"✅ 타일셋: {output_tileset}")
+    return new_map, order
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='사용하지 않는 타일 제거 + 빈도순 ID 재배치')
+    parser.add_argument('map')
+    parser.add_argument('tileset')
+    parser.add_argument('--out-map', required=True)
+    parser.add_argument('--out-tileset', required=True)
+    parser.add_argument('--tile-size', type=int, default=None, help='기본값: 맵의 tileSize')
+    args = parser.parse_args()
+
+    compact_map_file(args.map, args.tileset, args.out_map, args.out_tileset, args.tile_size)
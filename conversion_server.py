@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+맵 에디터용 상주 변환 서비스 (localhost)
+
+매 변환마다 새 Python 프로세스를 띄우면 PIL/NumPy 임포트, 타일셋 로드, 캐시 구성이 반복된다.
+이 서비스는 한 번 띄워 두고 타일셋 타일/매칭 캐시를 메모리에 유지한 채
+map-editor/editor.js에서 보내는 변환 작업을 워커 풀로 처리하고 진행 상황을 SSE로 보낸다.
+
+API:
+    POST /jobs                 {"type", "imageData"(data URL) | "image"(경로), "tileSize"} → 202 {"id"}
+                               (대기열이 가득 차면 503, "image"는 에디터 폴더 안의 파일만)
+    GET  /jobs/<id>            작업 상태 + 결과
+    GET  /jobs/<id>/events     진행 상황 스트림 (text/event-stream)
+    GET  /jobs/<id>/files/<f>  작업 결과 파일 (타일셋 이미지 등)
+
+다른 웹 페이지가 로컬 파일 변환을 요청하지 못하도록 --allow-origin에 등록된
+출처(기본값: Vite 개발 서버, gameserver.js)에서 온 요청만 받는다.
+
+작업 종류 (type):
+    extract_simple  : extract_map_simple.extract_map_simple (색상 기반)
+    extract_tiles   : extract_map_tiles.extract_map_from_image (타일셋 비교)
+    create_tileset  : create_tileset_from_image.create_tileset_and_map
+    progressive     : progressive_convert.progressive_convert (미리보기 후 구역별 패치 이벤트)
+
+사용 예:
+    python conversion_server.py --port 8765 --workers 2 --queue-size 8
+    python conversion_server.py --allow-origin http://localhost:8080
+"""
+
+import argparse
+import base64
+import itertools
+import json
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+EDITOR_DIR = os.path.join(ROOT_DIR, 'public', 'map-editor')
+JOBS_DIR = os.path.join(ROOT_DIR, '.conversion_jobs')
+sys.path.insert(0, EDITOR_DIR)
+
+# 프로세스 시작 시 한 번만 임포트 (PIL/NumPy 포함)
+from create_tileset_from_image import create_tileset_and_map  # noqa: E402
+from extract_map_simple import extract_map_simple  # noqa: E402
+from extract_map_tiles import extract_map_from_image  # noqa: E402
+from progressive_convert import apply_patch, progressive_convert  # noqa: E402
+from tile_match_cache import TileMatchCache, tileset_namespace  # noqa: E402
+
+JOB_TYPES = ('extract_simple', 'extract_tiles', 'create_tileset', 'progressive')
+# 에디터를 띄우는 출처 (vite --port 5176, gameserver.js PORT 3005)
+DEFAULT_ORIGINS = [
+    'http://localhost:5176', 'http://127.0.0.1:5176',
+    'http://localhost:3005', 'http://127.0.0.1:3005',
+]
+TILESET_NAME = 'New_Tileset.png'
+
+
+def resolve_editor_path(path):
+    """요청의 이미지 경로 → 에디터 폴더 안의 실제 경로 (폴더 밖이면 ValueError)"""
+    if not isinstance(path, str):
+        raise ValueError(f"이미지 경로는 문자열이어야 합니다: {path!r}")
+    resolved = os.path.realpath(os.path.join(EDITOR_DIR, path))
+    if os.path.commonpath([resolved, os.path.realpath(EDITOR_DIR)]) != os.path.realpath(EDITOR_DIR):
+        raise ValueError(f"에디터 폴더 밖의 파일은 변환할 수 없습니다: {path}")
+    if not os.path.isfile(resolved):
+        raise ValueError(f"이미지 파일이 없습니다: {path}")
+    return resolved
+
+
+class Job:
+    def __init__(self, job_id, params):
+        self.id = job_id
+        self.params = params
+        self.dir = os.path.join(JOBS_DIR, job_id)
+        self.status = 'queued'
+        self.events = []  # 진행 이벤트 기록 (SSE 재생용)
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.cond = threading.Condition()
+
+    def emit(self, **event):
+        with self.cond:
+            self.events.append(event)
+            self.cond.notify_all()
+
+    def summary(self):
+        return {"id": self.id, "status": self.status, "type": self.params.get("type"),
+                "result": self.result, "error": self.error}
+
+
+class ConversionService:
+    """작업 대기열 + 워커 풀 + 상주 캐시"""
+
+    def __init__(self, workers=2, queue_size=8, keep_jobs=64):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.jobs = {}
+        self.keep_jobs = keep_jobs
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.match_caches = {}  # (타일셋, 타일 크기) → TileMatchCache (프로세스 동안 유지)
+        self.workers = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, params):
+        """작업 등록 (대기열이 가득 차면 queue.Full)"""
+        if not isinstance(params, dict):
+            raise ValueError("요청 본문은 JSON 객체여야 합니다")
+        if params.get("type") not in JOB_TYPES:
+            raise ValueError(f"알 수 없는 작업 종류: {params.get('type')}")
+        if not params.get("imageData"):
+            params = dict(params, image=resolve_editor_path(params["image"]))
+        job = Job(f"{int(time.time())}-{next(self.ids)}", params)
+        with self.lock:
+            self.jobs[job.id] = job
+            # 오래된 완료 작업은 목록에서 정리
+            finished = [j for j in self.jobs.values() if j.status in ('done', 'error')]
+            pruned = sorted(finished, key=lambda j: j.created)[:max(0, len(self.jobs) - self.keep_jobs)]
+            for old in pruned:
+                del self.jobs[old.id]
+        # 정리한 작업의 업로드 이미지/결과 파일도 삭제
+        for old in pruned:
+            shutil.rmtree(old.dir, ignore_errors=True)
+        job.emit(status='queued', queued=self.queue.qsize())
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            with self.lock:
+                del self.jobs[job.id]
+            raise
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def _match_cache(self, tileset_path, tile_size):
+        key = (tileset_path, tile_size, os.path.getmtime(tileset_path))
+        with self.lock:
+            cache = self.match_caches.get(key)
+            if cache is None:
+                cache = TileMatchCache(namespace=tileset_namespace(tileset_path, tile_size, 'compare_tiles'))
+                self.match_caches[key] = cache
+            return cache
+
+    def _worker(self):
+        while True:
+            job = self.queue.get()
+            job.status = 'running'
+            job.emit(status='running')
+            try:
+                job.result = self._run(job)
+                job.status = 'done'
+                job.emit(status='done', result=job.result)
+            except Exception as e:  # 작업 하나의 실패가 서비스를 멈추지 않도록
+                job.status = 'error'
+                job.error = str(e)
+                job.emit(status='error', error=job.error)
+            finally:
+                self.queue.task_done()
+
+    def _run(self, job):
+        params = job.params
+        os.makedirs(job.dir, exist_ok=True)
+
+        if params.get("imageData"):
+            header, _, data = params["imageData"].partition(',')
+            ext = '.png' if 'png' in header else '.jpg'
+            image_path = os.path.join(job.dir, f"source{ext}")
+            with open(image_path, 'wb') as f:
+                f.write(base64.b64decode(data))
+        else:
+            image_path = params["image"]
+
+        tile_size = int(params.get("tileSize", 64))
+        output_json = os.path.join(job.dir, 'map.json')
+
+        def progress(done, total):
+            job.emit(status='running', done=done, total=total)
+
+        # 작업 스레드가 여럿인 서버 프로세스에서는 fork하지 않도록 순차 실행 (동시성은 작업 단위로)
+        if params["type"] == 'extract_simple':
+            map_json = extract_map_simple(image_path, tile_size, output_json, progress=progress, workers=1)
+        elif params["type"] == 'extract_tiles':
+            # extract_map_tiles는 현재 폴더(에디터 폴더)의 New_Tileset.png와 비교
+            match_cache = None
+            if os.path.exists(TILESET_NAME):
+                match_cache = self._match_cache(os.path.abspath(TILESET_NAME), tile_size)
+            map_json = extract_map_from_image(image_path, tile_size, output_json,
+                                              match_cache=match_cache, progress=progress, workers=1)
+        elif params["type"] == 'progressive':
+            # 미리보기(전체) 패치 → 구역별 다듬기 패치를 이벤트로 바로 전송
+            if not os.path.exists(TILESET_NAME):
+                raise FileNotFoundError(f"점진 변환에 필요한 타일셋이 에디터 폴더에 없습니다: {TILESET_NAME}")
+            map_json = {
+                "width": int(params.get("width", 120)),
+                "height": int(params.get("height", 168)),
+                "tileSize": tile_size,
+                "mapData": None,
+                "collisionTiles": [80, 81, 82, 83, 192, 193, 194, 195],
+                "source": "progressive conversion"
+            }
+            focus = tuple(params["focus"]) if params.get("focus") else None
+            for patch in progressive_convert(image_path, os.path.abspath(TILESET_NAME),
+                                             map_json["width"], map_json["height"], tile_size,
+                                             focus=focus):
+                if map_json["mapData"] is None:
+                    map_json["mapData"] = patch["data"]
+                else:
+                    apply_patch(map_json["mapData"], patch)
+                job.emit(status='running', patch=patch)
+            with open(output_json, 'w') as f:
+                json.dump(map_json, f)
+        else:
+            output_tileset = os.path.join(job.dir, 'tileset.png')
+            _, map_json = create_tileset_and_map(
+                image_path, tile_size, output_tileset, output_json,
+                near_duplicate_distance=params.get("nearDuplicateDistance"),
+                progress=progress)
+            map_json = dict(map_json, tilesetImage=f"/jobs/{job.id}/files/tileset.png")
+
+        return {"map": map_json}
+
+
+def make_handler(service, allowed_origins=DEFAULT_ORIGINS):
+    allowed_origins = set(allowed_origins)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, fmt, *args):
+            print(f"[{time.strftime('%H:%M:%S')}] {self.address_string()} {fmt % args}")
+
+        def _origin_allowed(self):
+            """Origin 헤더가 없거나(같은 출처/명령줄 도구) 등록된 에디터 출처"""
+            origin = self.headers.get('Origin')
+            return origin is None or origin in allowed_origins
+
+        def _cors(self):
+            origin = self.headers.get('Origin')
+            if origin in allowed_origins:
+                self.send_header('Access-Control-Allow-Origin', origin)
+                self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+                self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            self.send_header('Vary', 'Origin')
+
+        def _json(self, code, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(code)
+            self._cors()
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_OPTIONS(self):
+            self.send_response(204)
+            self._cors()
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def do_POST(self):
+            if not self._origin_allowed():
+                return self._json(403, {"error": "허용되지 않은 출처"})
+            if self.path.rstrip('/') != '/jobs':
+                return self._json(404, {"error": "not found"})
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                params = json.loads(self.rfile.read(length) or b'{}')
+                job = service.submit(params)
+            except queue.Full:
+                return self._json(503, {"error": "작업 대기열이 가득 찼습니다"})
+            except (ValueError, KeyError) as e:
+                return self._json(400, {"error": str(e)})
+            self._json(202, {"id": job.id, "events": f"/jobs/{job.id}/events"})
+
+        def do_GET(self):
+            if not self._origin_allowed():
+                return self._json(403, {"error": "허용되지 않은 출처"})
+            parts = [p for p in self.path.split('?')[0].split('/') if p]
+            if len(parts) < 2 or parts[0] != 'jobs':
+                return self._json(404, {"error": "not found"})
+            job = service.get(parts[1])
+            if job is None:
+                return self._json(404, {"error": "unknown job"})
+
+            if len(parts) == 2:
+                return self._json(200, job.summary())
+            if len(parts) == 3 and parts[2] == 'events':
+                return self._stream(job)
+            if len(parts) == 4 and parts[2] == 'files':
+                return self._file(job, os.path.basename(parts[3]))
+            self._json(404, {"error": "not found"})
+
+        def _file(self, job, name):
+            path = os.path.join(job.dir, name)
+            if not os.path.isfile(path):
+                return self._json(404, {"error": "not found"})
+            with open(path, 'rb') as f:
+                body = f.read()
+            self.send_response(200)
+            self._cors()
+            self.send_header('Content-Type', 'image/png' if name.endswith('.png') else 'application/octet-stream')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self, job):
+            self.send_response(200)
+            self._cors()
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.close_connection = True
+
+            sent = 0
+            while True:
+                with job.cond:
+                    while sent == len(job.events):
+                        job.cond.wait(timeout=15)
+                        if sent == len(job.events):
+                            break
+                    events = job.events[sent:]
+                try:
+                    if not events:
+                        self.wfile.write(b": keep-alive\n\n")  # 연결 유지
+                    for event in events:
+                        self.wfile.write(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode('utf-8'))
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+                sent += len(events)
+                if events and events[-1].get('status') in ('done', 'error'):
+                    return
+
+    return Handler
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='맵 에디터용 상주 변환 서비스')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--queue-size', type=int, default=8)
+    parser.add_argument('--allow-origin', action='append', default=None,
+                        help='요청을 받을 에디터 출처 (여러 번 지정 가능, 기본값: localhost:5176/3005)')
+    args = parser.parse_args()
+
+    # extract_map_tiles는 현재 폴더의 New_Tileset.png를 사용하므로 에디터 폴더에서 실행
+    os.chdir(EDITOR_DIR)
+    service = ConversionService(args.workers, args.queue_size)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service, args.allow_origin or DEFAULT_ORIGINS))
+    server.daemon_threads = True
+    print(f"🛠️ 변환 서비스: http://{args.host}:{args.port} (워커 {args.workers}, 대기열 {args.queue_size})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 종료")
@@ -1,6 +1,8 @@
 import json
 from PIL import Image
 import numpy as np
+from progressive_convert import match_means
+from summed_area import image_grid_means
 
 # 원본 맵 이미지 로드
 map_image_path = "../map-editor/Generated Image December 30, 2025 - 3_48PM.jpeg"
@@ -17,6 +19,7 @@ print(f"📐 타일셋 이미지 크기: {tileset_img.size}")
 target_width = 120
 target_height = 168
 tile_size = 32
+mean_only = True  # 원본 적분 영상으로 칸 평균 계산 (False면 LANCZOS 리사이즈 + resized_map.png 저장)
 
 # 맵 이미지를 목표 크기로 리사이즈
 target_pixel_width = target_width * tile_size  # 3840
@@ -24,10 +27,11 @@ target_pixel_height = target_height * tile_size  # 5376
 
 print(f"🎯 목표 맵 크기: {target_pixel_width}x{target_pixel_height}px ({target_width}x{target_height} 타일)")
 
-# 맵 이미지 리사이즈 (비율 유지하면서 확대/축소)
-map_img_resized = map_img.resize((target_pixel_width, target_pixel_height), Image.Resampling.LANCZOS)
-map_img_resized.save("resized_map.png")
-print(f"✅ 리사이즈된 맵 저장: resized_map.png")
+if not mean_only:
+    # 맵 이미지 리사이즈 (비율 유지하면서 확대/축소)
+    map_img_resized = map_img.resize((target_pixel_width, target_pixel_height), Image.Resampling.LANCZOS)
+    map_img_resized.save("resized_map.png")
+    print(f"✅ 리사이즈된 맵 저장: resized_map.png")
 
 # 타일셋 분석 (16x16 타일셋 가정)
 tiles_per_row = tileset_img.width // tile_size
@@ -49,38 +53,45 @@ for row in range(tiles_per_col):
 
 print(f"✅ {len(tiles)}개 타일 추출 완료")
 
-# 맵 이미지를 타일로 변환
-map_array = np.array(map_img_resized)
-map_data = []
-
-print("🔄 맵을 타일로 변환 중...")
-for y in range(target_height):
-    row = []
-    for x in range(target_width):
-        # 현재 위치의 타일 추출
-        px = x * tile_size
-        py = y * tile_size
-        current_tile = map_array[py:py+tile_size, px:px+tile_size]
-        
-        # 가장 유사한 타일 찾기 (간단한 색상 평균 비교)
-        current_avg = current_tile.mean(axis=(0, 1))
-        
-        best_match = 0
-        best_diff = float('inf')
-        
-        for tile_idx, tile in tiles.items():
-            tile_avg = tile.mean(axis=(0, 1))
-            diff = np.sum((current_avg - tile_avg) ** 2)
-            
-            if diff < best_diff:
-                best_diff = diff
-                best_match = tile_idx
-        
-        row.append(int(best_match))
-    
-    map_data.append(row)
-    if (y + 1) % 10 == 0:
-        print(f"  진행: {y + 1}/{target_height} 행")
+if mean_only:
+    # 리사이즈 없이 원본 해상도 적분 영상에서 칸별 면적 가중 평균을 바로 읽음
+    print("🔄 원본 이미지에서 칸 평균 계산 중...")
+    tile_averages = np.array([tile[..., :3].mean(axis=(0, 1)) for tile in tiles.values()])
+    block_means = image_grid_means(map_image_path, target_width, target_height)
+    map_data = match_means(block_means, tile_averages).tolist()
+else:
+    # 맵 이미지를 타일로 변환
+    map_array = np.array(map_img_resized)
+    map_data = []
+
+    print("🔄 맵을 타일로 변환 중...")
+    for y in range(target_height):
+        row = []
+        for x in range(target_width):
+            # 현재 위치의 타일 추출
+            px = x * tile_size
+            py = y * tile_size
+            current_tile = map_array[py:py+tile_size, px:px+tile_size]
+
+            # 가장 유사한 타일 찾기 (간단한 색상 평균 비교)
+            current_avg = current_tile.mean(axis=(0, 1))
+
+            best_match = 0
+            best_diff = float('inf')
+
+            for tile_idx, tile in tiles.items():
+                tile_avg = tile.mean(axis=(0, 1))
+                diff = np.sum((current_avg - tile_avg) ** 2)
+
+                if diff < best_diff:
+                    best_diff = diff
+                    best_match = tile_idx
+
+            row.append(int(best_match))
+
+        map_data.append(row)
+        if (y + 1) % 10 == 0:
+            print(f"  진행: {y + 1}/{target_height} 행")
 
 # JSON 저장
 output = {
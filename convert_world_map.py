@@ -1,6 +1,10 @@
 import json
 from PIL import Image
 import numpy as np
+from image_cache import load_image_array
+from progressive_convert import match_means
+from summed_area import image_grid_means
+from tile_match_cache import TileMatchCache, tileset_namespace
 
 # 설정
 map_image_path = "assets/world_map_original.jpg"
@@ -8,9 +12,11 @@ tileset_path = "assets/New_Tileset.png"
 target_width = 120
 target_height = 168
 tile_size = 32
+match_cache_path = "tile_match_cache.json"  # None이면 디스크 저장 안 함
+mean_only = True  # 원본 적분 영상으로 칸 평균 계산 (False면 LANCZOS 리사이즈 후 블록 평균)
 
 print("🖼️ 이미지 로딩 중...")
-map_img = Image.open(map_image_path).convert('RGB')
+map_img = Image.open(map_image_path)
 tileset_img = Image.open(tileset_path).convert('RGB')
 
 print(f"📐 원본 맵 이미지: {map_img.size}")
@@ -20,11 +26,6 @@ print(f"📐 타일셋 이미지: {tileset_img.size}")
 target_pixel_width = target_width * tile_size  # 3840
 target_pixel_height = target_height * tile_size  # 5376
 
-# 맵 이미지를 정확한 크기로 리사이즈
-print(f"🔄 맵을 {target_pixel_width}x{target_pixel_height}px로 리사이즈 중...")
-map_img = map_img.resize((target_pixel_width, target_pixel_height), Image.Resampling.LANCZOS)
-map_array = np.array(map_img)
-
 # 타일셋 분석
 tiles_per_row = tileset_img.width // tile_size
 tiles_per_col = tileset_img.height // tile_size
@@ -46,28 +47,48 @@ for row in range(tiles_per_col):
 tile_averages = np.array(tile_averages)
 print(f"✅ {len(tile_averages)}개 타일 준비 완료")
 
-# 맵을 타일로 변환 (배치 처리로 최적화)
-print("🔄 맵 변환 중...")
-map_data = []
-
-for y in range(target_height):
-    row = []
-    for x in range(target_width):
-        # 현재 타일의 평균 색상 계산
-        px = x * tile_size
-        py = y * tile_size
-        tile_region = map_array[py:py+tile_size, px:px+tile_size]
+if mean_only:
+    # 리사이즈 없이 원본 해상도 적분 영상에서 칸별 면적 가중 평균을 바로 읽음
+    print(f"🔄 원본 {map_img.size[0]}x{map_img.size[1]}px를 {target_width}x{target_height}칸으로 평균 계산 중...")
+    block_means = image_grid_means(map_image_path, target_width, target_height)
+    map_data = match_means(block_means, tile_averages).tolist()
+else:
+    # 맵 이미지를 정확한 크기로 리사이즈
+    print(f"🔄 맵을 {target_pixel_width}x{target_pixel_height}px로 리사이즈 중...")
+    map_array = load_image_array(map_image_path, (target_pixel_width, target_pixel_height), Image.Resampling.LANCZOS)
+
+    # 동일 블록은 한 번만 매칭 (바다/풀밭 등 반복 영역)
+    match_cache = TileMatchCache(
+        namespace=tileset_namespace(tileset_path, tile_size, 'mean-rgb'),
+        cache_path=match_cache_path
+    )
+
+    def match_block(tile_region):
         avg_color = tile_region.mean(axis=(0, 1))
-        
         # 가장 유사한 타일 인덱스 찾기 (벡터화)
         diffs = np.sum((tile_averages - avg_color) ** 2, axis=1)
-        best_match = int(np.argmin(diffs))
-        row.append(best_match)
+        return int(np.argmin(diffs))
+
+    # 맵을 타일로 변환 (배치 처리로 최적화)
+    print("🔄 맵 변환 중...")
+    map_data = []
+
+    for y in range(target_height):
+        row = []
+        for x in range(target_width):
+            px = x * tile_size
+            py = y * tile_size
+            tile_region = map_array[py:py+tile_size, px:px+tile_size]
+            best_match = match_cache.match(tile_region, match_block)
+            row.append(best_match)
     
-    map_data.append(row)
+        map_data.append(row)
     
-    if (y + 1) % 20 == 0:
-        print(f"  진행: {y + 1}/{target_height} 행 ({(y+1)/target_height*100:.1f}%)")
+        if (y + 1) % 20 == 0:
+            print(f"  진행: {y + 1}/{target_height} 행 ({(y+1)/target_height*100:.1f}%)")
+
+    match_cache.save()
+    print(f"🧠 {match_cache.stats()}")
 
 # JSON 저장
 print("💾 JSON 저장 중...")
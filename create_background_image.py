@@ -1,7 +1,10 @@
 from PIL import Image
 
+from image_cache import load_image
+
 # 맵 이미지 로드
-map_img = Image.open("assets/world_map_original.jpg")
+map_image_path = "assets/world_map_original.jpg"
+map_img = Image.open(map_image_path)
 
 # 120x168 타일 * 64px = 7680x10752px
 target_width = 7680
@@ -10,8 +13,8 @@ target_height = 10752
 print(f"원본 크기: {map_img.size}")
 print(f"목표 크기: {target_width}x{target_height}px")
 
-# 리사이즈
-resized = map_img.resize((target_width, target_height), Image.Resampling.LANCZOS)
+# 리사이즈 (같은 원본/크기/필터는 공유 캐시에서 바로 로드)
+resized = load_image(map_image_path, (target_width, target_height), Image.Resampling.LANCZOS)
 
 # PNG로 저장 (최적화)
 output_path = "assets/World_Map_Background.png"
@@ -1,5 +1,7 @@
 import json
 
+from sparse_map import SparseMap, dump_sparse_map
+
 # 원본 맵 로드
 with open('assets/default_map.json', 'r') as f:
     original_map = json.load(f)
@@ -20,37 +22,23 @@ print(f"새 맵: {new_width}x{new_height} (32px 타일)")
 center_x = (new_width - original_width) // 2
 center_y = (new_height - original_height) // 2
 
-new_map_data = []
-
-for y in range(new_height):
-    row = []
-    for x in range(new_width):
-        # 원본 맵이 배치되는 영역인지 확인
-        orig_x = x - center_x
-        orig_y = y - center_y
-        
-        if 0 <= orig_x < original_width and 0 <= orig_y < original_height:
-            # 원본 맵의 타일 사용
-            row.append(original_data[orig_y][orig_x])
-        else:
-            # 외곽은 풀 타일(0)로 채우기
-            row.append(0)
-    
-    new_map_data.append(row)
+# 외곽은 풀 타일(0), 원본 영역만 런으로 저장
+sparse = SparseMap(new_width, new_height, 0)
+sparse.paste(original_data, center_x, center_y)
 
 # 새로운 맵 JSON 생성
 new_map = {
     "width": new_width,
     "height": new_height,
     "tileSize": new_tile_size,
-    "mapData": new_map_data,
+    "defaultTile": sparse.default,
+    "mapRuns": sparse.runs(),
     "collisionTiles": original_map.get('collisionTiles', [80, 81, 82, 83, 192, 193, 194, 195]),
     "source": "Expanded from 13x19 original map"
 }
 
 # 저장
-with open('default_map.json', 'w') as f:
-    json.dump(new_map, f, indent=2)
+dump_sparse_map(new_map, 'default_map.json')
 
 print(f"✅ 맵 확장 완료!")
 print(f"📦 파일: default_map.json")
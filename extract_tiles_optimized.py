@@ -2,6 +2,11 @@ import json
 from PIL import Image
 import os
 
+import numpy as np
+
+from image_cache import load_image_array
+from tile_store import build_atlas, flatten_tiles, split_tiles
+
 # 설정
 map_image_path = "assets/world_map_original.jpg"
 target_width = 120
@@ -9,15 +14,15 @@ target_height = 168
 tile_size = 64
 
 print("🖼️ 맵 이미지 로딩...")
-map_img = Image.open(map_image_path).convert('RGB')
-print(f"📐 원본 크기: {map_img.size}")
+print(f"📐 원본 크기: {Image.open(map_image_path).size}")
 
 # 목표 픽셀 크기로 리사이즈
 target_pixel_width = target_width * tile_size  # 7680
 target_pixel_height = target_height * tile_size  # 10752
 
 print(f"🔄 {target_pixel_width}x{target_pixel_height}px로 리사이즈 중...")
-map_img = map_img.resize((target_pixel_width, target_pixel_height), Image.Resampling.LANCZOS)
+# 같은 원본/크기/필터는 공유 캐시에서 바로 로드
+map_array = load_image_array(map_image_path, (target_pixel_width, target_pixel_height), Image.Resampling.LANCZOS)
 
 # 타일셋 크기 계산 (16열 기준)
 tiles_per_row = 16
@@ -30,36 +35,13 @@ tileset_height = tileset_rows * tile_size
 print(f"🎨 타일셋 생성: {tileset_width}x{tileset_height}px")
 print(f"   ({tiles_per_row}x{tileset_rows} = {total_tiles}개 타일)")
 
-# 새 타일셋 이미지 생성
-tileset_img = Image.new('RGB', (tileset_width, tileset_height), color=(0, 0, 0))
-
-# 맵 데이터 초기화
-map_data = []
-tile_index = 0
-
+# 타일 분할 (reshape/transpose 뷰) 후 타일셋을 배열 재배치 한 번으로 조립
 print("✂️ 타일 추출 및 배치 중...")
+tiles = flatten_tiles(split_tiles(map_array, tile_size))
+tileset_img = Image.fromarray(build_atlas(tiles, tiles_per_row))
 
-for map_y in range(target_height):
-    row = []
-    for map_x in range(target_width):
-        # 맵에서 타일 추출
-        px = map_x * tile_size
-        py = map_y * tile_size
-        tile = map_img.crop((px, py, px + tile_size, py + tile_size))
-        
-        # 타일셋에 배치
-        tileset_x = (tile_index % tiles_per_row) * tile_size
-        tileset_y = (tile_index // tiles_per_row) * tile_size
-        tileset_img.paste(tile, (tileset_x, tileset_y))
-        
-        # 맵 데이터에 타일 인덱스 저장
-        row.append(tile_index)
-        tile_index += 1
-    
-    map_data.append(row)
-    
-    if (map_y + 1) % 20 == 0:
-        print(f"  진행: {map_y + 1}/{target_height} 행 ({(map_y+1)/target_height*100:.1f}%)")
+# 맵 데이터: 타일 i가 타일셋의 i번째 칸
+map_data = np.arange(total_tiles).reshape(target_height, target_width).tolist()
 
 # 타일셋 저장 (최적화 옵션 사용)
 tileset_output = "assets/Generated_Tileset.png"
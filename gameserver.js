@@ -30,6 +30,39 @@ try {
     console.error(`[SERVER] ❌ Error checking dist folder: ${e.message}`);
 }
 
+// asset_manifest.py 결과 적용: 해시 이름 자산은 영구 캐시, 미리 압축한 .br/.gz가 있으면 그대로 전송
+const immutableAssets = new Set();
+const precompressedAssets = new Map();
+try {
+    const manifest = JSON.parse(fs.readFileSync(path.join(distPath, 'asset-manifest.json'), 'utf-8'));
+    (manifest.immutable || []).forEach(url => immutableAssets.add(url));
+    Object.entries(manifest.precompressed || {}).forEach(([url, encodings]) => precompressedAssets.set(url, encodings));
+    console.log(`[SERVER] Asset manifest: ${immutableAssets.size} immutable, ${precompressedAssets.size} precompressed`);
+} catch (e) {
+    console.log('[SERVER] No asset-manifest.json, serving dist as-is');
+}
+
+app.use((req, res, next) => {
+    if (req.method !== 'GET' && req.method !== 'HEAD') return next();
+    if (immutableAssets.has(req.path)) {
+        res.setHeader('Cache-Control', 'public, max-age=31536000, immutable');
+    }
+    const encodings = precompressedAssets.get(req.path === '/' ? '/index.html' : req.path);
+    if (!encodings) return next();
+
+    res.setHeader('Vary', 'Accept-Encoding');
+    const accepted = req.headers['accept-encoding'] || '';
+    const encoding = encodings.find(e => accepted.includes(e));
+    if (!encoding) return next();
+
+    // express.static은 Content-Type/Cache-Control이 이미 있으면 덮어쓰지 않음
+    const filePath = req.path === '/' ? '/index.html' : req.path;
+    res.type(path.extname(filePath));
+    res.setHeader('Content-Encoding', encoding);
+    req.url = filePath + (encoding === 'br' ? '.br' : '.gz');
+    next();
+});
+
 app.use(express.static(distPath));
 
 // 404 에러 방지를 위한 SPA 리다이렉트
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+게임 서버 로그 분석 (용량 계획용)
+
+gameserver.js가 남기는 로그(gameserver*.log)를 제너레이터 파이프라인으로 한 줄씩 읽어
+일정한 메모리로 다음을 계산한다.
+    - 시간 구간별 동시 접속자 (최대 / 시간 가중 평균)
+    - 구간별 이벤트 수 (접속, 참가, 종료, 채팅)
+    - 세션 길이 분포 (참가 → 종료)
+    - 동시 접속/이벤트가 가장 많았던 구간 (피크)
+
+로그 시각은 "[11:29:09 PM]"처럼 날짜가 없으므로, 시각이 크게 되돌아가면 다음 날로 넘어간 것으로 본다.
+--date는 첫 파일 첫 줄의 날짜이고, 이후 파일은 앞 파일의 마지막 시각에서 이어지는 것으로 본다
+(파일은 시간 순으로 지정, 기본 glob은 수정 시각 순). --date가 없으면 파일마다
+수정 시각의 날짜(마지막 줄 날짜)에서 파일 안에서 넘긴 자정 수를 빼서 첫 줄 날짜를 추정한다(근사값).
+
+사용 예:
+    python gameserver_log_stats.py gameserver*.log --bucket 5 --csv load.csv
+"""
+
+import argparse
+import csv
+import glob
+import gzip
+import heapq
+import os
+import re
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+LINE_RE = re.compile(r'^\[(\d{1,2}):(\d{2}):(\d{2})\s*([AP]M)\]\s+(.*)$')
+CONNECT_RE = re.compile(r'🟢 Player connected: (\S+)')
+JOIN_RE = re.compile(r'👤 Player joined: (.*) \((\S{1,4})\.\.\.\)$')
+DISCONNECT_RE = re.compile(r'🔴 Player disconnected: (.*) \((\S{1,4})\.\.\.\)$')
+TOTAL_RE = re.compile(r'📊 Total players: (\d+)')
+CHAT_RE = re.compile(r'💬 \[(\w+)\] ')
+SERVER_START = '🎮 Re-Be World Game Server'
+
+# 시각이 이만큼 이상 되돌아가면 자정을 넘긴 것으로 판단 (서머타임 등 작은 되돌림은 무시)
+ROLLOVER_SECONDS = 2 * 3600
+
+# 세션 길이 구간 (분)
+SESSION_BINS = [1, 5, 15, 30, 60, 120, 240]
+
+LogEvent = namedtuple('LogEvent', 'time kind key value')
+
+
+def read_lines(paths):
+    """여러 로그 파일(.gz 포함)을 순서대로 한 줄씩 (파일 경로, 줄)"""
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                yield path, line.rstrip('\n')
+
+
+def second_of_day(match):
+    """LINE_RE 매치 → 하루 중 시각(초)"""
+    hour, minute, second, ampm = match.groups()[:4]
+    return (int(hour) % 12 + (12 if ampm == 'PM' else 0)) * 3600 + int(minute) * 60 + int(second)
+
+
+def count_rollovers(path):
+    """파일 안에서 자정을 넘긴 횟수"""
+    days, last_sod = 0, None
+    for _, line in read_lines([path]):
+        m = LINE_RE.match(line)
+        if not m:
+            continue
+        sod = second_of_day(m)
+        if last_sod is not None and sod < last_sod - ROLLOVER_SECONDS:
+            days += 1
+        last_sod = sod
+    return days
+
+
+def file_start_date(path):
+    """수정 시각(마지막 줄 날짜) - 파일 안의 자정 넘김 수 → 첫 줄 날짜 추정"""
+    end_date = datetime.fromtimestamp(os.path.getmtime(path)).date()
+    return end_date - timedelta(days=count_rollovers(path))
+
+
+def parse_events(lines, start_date=None):
+    """
+    (경로, 줄) → LogEvent 스트림
+
+    time은 기준 날짜 자정 + 경과 일수 + 하루 중 시각(초)인 POSIX 유사 타임스탬프.
+    서버 시작 줄은 kind='start' 이벤트로 내보내 세션 상태를 초기화할 수 있게 한다.
+    start_date가 있으면 첫 파일에만 적용하고 다음 파일은 날짜/시각을 이어받아 자정 넘김을 판단한다.
+    없으면 파일마다 file_start_date로 첫 줄 날짜를 추정한다.
+    """
+    current_path = None
+    base = None
+    day, last_sod = 0, None
+    for path, line in lines:
+        if path != current_path:
+            current_path = path
+            if start_date is None:
+                date = file_start_date(path)
+                base = datetime(date.year, date.month, date.day).timestamp()
+                day, last_sod = 0, None
+            elif base is None:
+                base = datetime(start_date.year, start_date.month, start_date.day).timestamp()
+
+        if line.startswith(SERVER_START):
+            # 시작 배너에는 시각이 없으므로 직전 줄 시각 사용 (파일 첫 줄이면 None)
+            t = base + day * 86400 + last_sod if last_sod is not None else None
+            yield LogEvent(t, 'start', None, None)
+            continue
+
+        m = LINE_RE.match(line)
+        if not m:
+            continue
+        message = m.group(5)
+        sod = second_of_day(m)
+        if last_sod is not None and sod < last_sod - ROLLOVER_SECONDS:
+            day += 1
+        last_sod = sod
+        t = base + day * 86400 + sod
+
+        if (e := TOTAL_RE.search(message)):
+            yield LogEvent(t, 'total', None, int(e.group(1)))
+        elif (e := JOIN_RE.search(message)):
+            yield LogEvent(t, 'join', (e.group(1), e.group(2)), None)
+        elif (e := DISCONNECT_RE.search(message)):
+            yield LogEvent(t, 'disconnect', (e.group(1), e.group(2)), None)
+        elif (e := CONNECT_RE.search(message)):
+            yield LogEvent(t, 'connect', e.group(1)[:4], None)
+        elif (e := CHAT_RE.search(message)):
+            yield LogEvent(t, 'chat', None, e.group(1))
+
+
+def bucketize(events, bucket_seconds, session_sink=None):
+    """
+    시간 순 이벤트 → 끝난 시간 구간 통계를 차례로 내보내는 제너레이터
+
+    동시 접속자 수는 "Total players" 줄 사이에서 그대로 유지된다고 보고 시간 가중 평균을 낸다.
+    세션(참가 → 종료) 길이(초)는 session_sink(길이)로 전달한다.
+    """
+    bucket = None
+    players = 0
+    last_t = None
+    open_sessions = {}
+
+    def new_bucket(start):
+        return {"start": start, "peak": players, "weighted": 0.0,
+                "connect": 0, "join": 0, "disconnect": 0, "chat": 0}
+
+    def advance(t):
+        """last_t → t 구간의 접속자 수 누적, 지난 구간은 내보냄"""
+        nonlocal bucket, last_t
+        while t >= bucket["start"] + bucket_seconds:
+            end = bucket["start"] + bucket_seconds
+            bucket["weighted"] += players * (end - last_t)
+            bucket["avg"] = bucket.pop("weighted") / bucket_seconds
+            yield bucket
+            last_t = end
+            bucket = new_bucket(end)
+        bucket["weighted"] += players * (t - last_t)
+        last_t = t
+
+    for event in events:
+        if event.time is None:
+            if event.kind == 'start':
+                open_sessions.clear()
+                players = 0
+            continue
+        if bucket is None:
+            start = event.time - event.time % bucket_seconds
+            bucket = new_bucket(start)
+            last_t = start
+        yield from advance(max(event.time, last_t))
+
+        if event.kind == 'start':
+            # 서버 재시작: 열린 세션은 종료 기록 없이 끊긴 것으로 버림
+            open_sessions.clear()
+            players = 0
+        elif event.kind == 'total':
+            players = event.value
+            bucket["peak"] = max(bucket["peak"], players)
+        elif event.kind == 'join':
+            bucket["join"] += 1
+            open_sessions[event.key] = event.time
+        elif event.kind == 'disconnect':
+            bucket["disconnect"] += 1
+            joined = open_sessions.pop(event.key, None)
+            if joined is not None and session_sink:
+                session_sink(event.time - joined)
+        else:
+            bucket[event.kind] += 1
+
+    if bucket is not None:
+        yield from advance(bucket["start"] + bucket_seconds)
+
+
+class SessionHistogram:
+    """세션 길이 고정 구간 히스토그램 (일정한 메모리)"""
+
+    def __init__(self, bins=SESSION_BINS):
+        self.bins = bins
+        self.counts = [0] * (len(bins) + 1)
+        self.total = 0
+        self.seconds = 0.0
+        self.longest = 0.0
+
+    def add(self, seconds):
+        minutes = seconds / 60
+        i = next((i for i, b in enumerate(self.bins) if minutes < b), len(self.bins))
+        self.counts[i] += 1
+        self.total += 1
+        self.seconds += seconds
+        self.longest = max(self.longest, seconds)
+
+    def percentile(self, q):
+        """구간 상한으로 근사한 q 분위 (분)"""
+        target = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return self.bins[i] if i < len(self.bins) else float('inf')
+        return 0
+
+    def labels(self):
+        edges = [0] + self.bins
+        for i, count in enumerate(self.counts):
+            if i < len(self.bins):
+                yield f"{edges[i]}~{self.bins[i]}분", count
+            else:
+                yield f"{self.bins[-1]}분 이상", count
+
+
+def analyze(paths, bucket_minutes=5, start_date=None, top=5, csv_path=None):
+    """로그 파일들을 한 번 읽어 요약 통계 반환 (구간 통계는 csv_path로 스트리밍 저장)"""
+    bucket_seconds = bucket_minutes * 60
+    sessions = SessionHistogram()
+    peaks = []  # (동시 접속 최대, 시작) 상위 top개
+    busiest = []  # (이벤트 수, 시작) 상위 top개
+    totals = {"connect": 0, "join": 0, "disconnect": 0, "chat": 0}
+    buckets = 0
+    active_buckets = 0
+    peak_players = 0
+
+    csv_file = open(csv_path, 'w', newline='', encoding='utf-8') if csv_path else None
+    writer = None
+    try:
+        events = parse_events(read_lines(paths), start_date)
+        for bucket in bucketize(events, bucket_seconds, sessions.add):
+            buckets += 1
+            count = sum(bucket[k] for k in totals)
+            for k in totals:
+                totals[k] += bucket[k]
+            if bucket["peak"] or count:
+                active_buckets += 1
+            peak_players = max(peak_players, bucket["peak"])
+
+            for heap, score in ((peaks, bucket["peak"]), (busiest, count)):
+                item = (score, bucket["start"])
+                if not score:
+                    continue
+                if len(heap) < top:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+            if csv_file:
+                if writer is None:
+                    writer = csv.writer(csv_file)
+                    writer.writerow(['start', 'peak_players', 'avg_players', *totals])
+                writer.writerow([datetime.fromtimestamp(bucket["start"]).isoformat(sep=' '),
+                                 bucket["peak"], f"{bucket['avg']:.2f}", *(bucket[k] for k in totals)])
+    finally:
+        if csv_file:
+            csv_file.close()
+
+    return {
+        "buckets": buckets,
+        "active_buckets": active_buckets,
+        "peak_players": peak_players,
+        "totals": totals,
+        "sessions": sessions,
+        "peak_windows": sorted(peaks, reverse=True),
+        "busiest_windows": sorted(busiest, reverse=True),
+    }
+
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='게임 서버 로그 동시 접속/이벤트/세션 분석')
+    parser.add_argument('logs', nargs='*', help='로그 파일 (기본: gameserver*.log, 수정 시각 순)')
+    parser.add_argument('--bucket', type=int, default=5, help='집계 구간 (분)')
+    parser.add_argument('--date', default=None, help='첫 파일 첫 줄의 날짜 YYYY-MM-DD, 이후 파일은 이어지는 날짜 '
+                             '(기본: 파일마다 수정 날짜에서 추정)')
+    parser.add_argument('--top', type=int, default=5, help='피크 구간 개수')
+    parser.add_argument('--csv', default=None, help='구간별 통계 CSV 저장 경로')
+    args = parser.parse_args()
+
+    paths = args.logs or sorted(glob.glob('gameserver*.log'), key=os.path.getmtime)
+    start_date = datetime.strptime(args.date, '%Y-%m-%d').date() if args.date else None
+
+    stats = analyze(paths, args.bucket, start_date, args.top, args.csv)
+    sessions = stats["sessions"]
+    bucket_delta = timedelta(minutes=args.bucket)
+
+    print(f"📂 로그 {len(paths)}개, {args.bucket}분 구간 {stats['buckets']}개 (활동 {stats['active_buckets']}개)")
+    print(f"📊 최대 동시 접속: {stats['peak_players']}명")
+    print("📨 이벤트: " + ", ".join(f"{k} {v}" for k, v in stats["totals"].items()))
+    if sessions.total:
+        print(f"⏱️ 세션 {sessions.total}개, 평균 {sessions.seconds / sessions.total / 60:.1f}분, "
+              f"중앙값 ≤{sessions.percentile(0.5)}분, 최장 {sessions.longest / 60:.1f}분")
+        for label, count in sessions.labels():
+            if count:
+                print(f"   {label}: {count}")
+    print("🔥 동시 접속 피크 구간:")
+    for players, start in stats["peak_windows"]:
+        print(f"   {format_time(start)} (+{bucket_delta}) 최대 {players}명")
+    print("📈 이벤트가 많은 구간:")
+    for count, start in stats["busiest_windows"]:
+        print(f"   {format_time(start)} (+{bucket_delta}) 이벤트 {count}개")
+    if args.csv:
+        print(f"✅ 구간별 통계: {args.csv}")
@@ -1,5 +1,9 @@
 import json
 
+import numpy as np
+
+from autotile import NEW_TILESET_RULES, WATER_EDGE_TILES, autotile
+
 # 120x168 크기의 맵 생성
 width = 120
 height = 168
@@ -9,46 +13,34 @@ tile_size = 32
 GRASS_LIGHT = [0, 1, 2, 3]
 GRASS_DARK = [16, 17, 18, 19]
 FOREST = [32, 33, 34, 35]
-SAND = [96, 97, 98, 99]
+SAND = [112, 113, 114, 115]  # 96~99는 아래쪽에 해변이 보이는 물 타일
 WATER = [80, 81, 82, 83]
 MOUNTAIN = [192, 193, 194, 195]
 DIRT = [128, 129, 130]
 
-# 맵 데이터 초기화
-map_data = []
+# 중심으로부터의 거리에 따라 지형 배치 (격자 전체를 한 번에 계산)
+y, x = np.mgrid[0:height, 0:width]
+dist = np.sqrt((x - width / 2) ** 2 + (y - height / 2) ** 2)
+
+grid = np.select(
+    [
+        dist > 80,  # 외곽: 물
+        dist > 75,  # 해변: 모래
+        dist > 55,  # 외곽 지대: 어두운 풀/숲
+        dist > 35,  # 중간 지대: 밝은 풀
+    ],
+    [
+        WATER[0],
+        SAND[0],
+        np.where((x + y) % 3 == 0, FOREST[0], GRASS_DARK[0]),
+        np.where((x * y) % 7 == 0, GRASS_DARK[0], GRASS_LIGHT[0]),
+    ],
+    default=GRASS_LIGHT[0]  # 중앙: 안전 지대 (밝은 풀)
+)
 
-for y in range(height):
-    row = []
-    for x in range(width):
-        # 중심으로부터의 거리 계산
-        center_x = width / 2
-        center_y = height / 2
-        dist = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
-        
-        # 거리에 따라 다른 타일 배치
-        if dist > 80:
-            # 외곽: 물
-            row.append(WATER[0])
-        elif dist > 75:
-            # 해변: 모래
-            row.append(SAND[0])
-        elif dist > 55:
-            # 외곽 지대: 어두운 풀/숲
-            if (x + y) % 3 == 0:
-                row.append(FOREST[0])
-            else:
-                row.append(GRASS_DARK[0])
-        elif dist > 35:
-            # 중간 지대: 밝은 풀
-            if (x * y) % 7 == 0:
-                row.append(GRASS_DARK[0])
-            else:
-                row.append(GRASS_LIGHT[0])
-        else:
-            # 중앙: 안전 지대 (밝은 풀)
-            row.append(GRASS_LIGHT[0])
-    
-    map_data.append(row)
+# 물/모래 경계를 전환 타일로 (4방향 비트마스크, 타일이 실제로 그린 경계만)
+grid = autotile(grid, NEW_TILESET_RULES)
+map_data = grid.tolist()
 
 # JSON 형식으로 저장
 map_json = {
@@ -56,7 +48,7 @@ map_json = {
     "height": height,
     "tileSize": tile_size,
     "mapData": map_data,
-    "collisionTiles": WATER + MOUNTAIN
+    "collisionTiles": WATER + WATER_EDGE_TILES + MOUNTAIN
 }
 
 # 파일 저장
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+디코딩/리사이즈된 이미지 공유 캐시
+
+같은 원본(world_map_original.jpg 등)을 같은 크기·필터로 리사이즈한 결과를
+메모리 맵 .npy 파일로 저장해 두고, 이후 스크립트는 디코딩/리사이즈 없이 바로 사용한다.
+
+캐시 폴더는 저장소가 아닌 사용자 캐시 폴더(~/.cache/re-be-world/images, XDG_CACHE_HOME 반영)이며
+IMAGE_CACHE_DIR 환경 변수로 바꿀 수 있다.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+from PIL import Image
+
+from tile_match_cache import file_digest
+
+DEFAULT_CACHE_DIR = os.environ.get('IMAGE_CACHE_DIR') or os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 're-be-world', 'images')
+DEFAULT_CACHE_BYTES = 2 * 1024 ** 3  # 2GB
+
+
+def _cache_key(source_digest, size, resample, mode):
+    key = f"{source_digest}:{size}:{Image.Resampling(resample).name}:{mode}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _decode_resized(path, size, resample, mode):
+    """원본 디코딩 + 리사이즈 (축소 시 JPEG draft 모드로 작은 해상도부터 디코딩)"""
+    img = Image.open(path)
+    if size is not None and img.format == 'JPEG' and size[0] < img.width and size[1] < img.height:
+        # draft는 요청 크기 이상인 1/2, 1/4, 1/8 스케일 중 가장 작은 것으로 디코딩
+        img.draft(mode, size)
+    img = img.convert(mode)
+    if size is not None and img.size != tuple(size):
+        img = img.resize(tuple(size), resample)
+    return np.asarray(img)
+
+
+def evict_cache(cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_BYTES, keep=None):
+    """
+    캐시 총 크기가 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 항목 삭제
+
+    keep 파일(방금 쓴 항목)은 그 하나만으로 max_bytes를 넘어도 지우지 않는다.
+    """
+    if not os.path.isdir(cache_dir):
+        return
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith('.npy'):
+            continue
+        path = os.path.join(cache_dir, name)
+        if keep is not None and os.path.abspath(path) == os.path.abspath(keep):
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:  # 다른 프로세스가 방금 지운 경우
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    if keep is not None and os.path.exists(keep):
+        total += os.path.getsize(keep)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def load_image_array(path, size=None, resample=Image.Resampling.LANCZOS, mode='RGB',
+                     cache_dir=DEFAULT_CACHE_DIR, max_cache_bytes=DEFAULT_CACHE_BYTES):
+    """
+    리사이즈된 이미지를 (H, W, C) uint8 배열로 반환 (읽기 전용 메모리 맵)
+
+    Args:
+        path: 원본 이미지 경로
+        size: 목표 크기 (width, height), None이면 원본 크기
+        resample: PIL 리샘플링 필터
+        mode: PIL 색상 모드 ('RGB', 'RGBA' 등)
+        cache_dir: 캐시 폴더 (None이면 캐시 없이 바로 디코딩)
+        max_cache_bytes: 캐시 폴더 최대 크기
+    """
+    if cache_dir is None:
+        return _decode_resized(path, size, resample, mode)
+
+    size = tuple(size) if size is not None else None
+    key = _cache_key(file_digest(path), size, resample, mode)
+    cache_file = os.path.join(cache_dir, f"{key}.npy")
+
+    if os.path.exists(cache_file):
+        os.utime(cache_file)  # LRU 갱신
+        return np.load(cache_file, mmap_mode='r')
+
+    arr = _decode_resized(path, size, resample, mode)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    out = np.lib.format.open_memmap(tmp_file, mode='w+', dtype=np.uint8, shape=arr.shape)
+    out[...] = arr
+    out.flush()
+    del out
+    os.replace(tmp_file, cache_file)
+
+    evict_cache(cache_dir, max_cache_bytes, keep=cache_file)
+    return np.load(cache_file, mmap_mode='r')
+
+
+def load_image(path, size=None, resample=Image.Resampling.LANCZOS, mode='RGB', **kwargs):
+    """load_image_array 결과를 PIL 이미지로 반환"""
+    return Image.fromarray(np.asarray(load_image_array(path, size, resample, mode, **kwargs)))
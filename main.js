@@ -27,6 +27,68 @@ const CHARACTERS = [
     { key: 'char08', file: '/assets/Character08.png', name: 'Character 08' }
 ];
 
+// 빌드 후 asset_manifest.py가 만든 논리 경로 → 해시 URL 표 (개발 서버에서는 비어 있음)
+let ASSET_URLS = {};
+
+// 씬 묶음 파일(scene_bundle.py)에서 꺼낸 자산의 blob URL
+const BUNDLE_URLS = {};
+const sceneBundles = new Map();
+
+function assetUrl(url) {
+    const name = url.replace(/^\.\//, '/');
+    if (BUNDLE_URLS[name]) return BUNDLE_URLS[name];
+    const entry = ASSET_URLS[name];
+    return entry ? entry.url : url;
+}
+
+// 씬 자산 묶음을 한 번에 받아 헤더 색인대로 잘라 blob URL로 등록 (헤더의 prefetch 씬은 이어서 백그라운드로)
+function loadSceneBundle(scene) {
+    if (sceneBundles.has(scene)) return sceneBundles.get(scene);
+    const promise = fetch(assetUrl(`/bundles/${scene}.bundle`))
+        .then(response => {
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            return response.arrayBuffer();
+        })
+        .then(buffer => {
+            const view = new DataView(buffer);
+            // 매직 'RBWB', 버전 1, 헤더 길이 (scene_bundle.py 파일 구조)
+            if (buffer.byteLength < 16 || view.getUint32(0, false) !== 0x52425742 || view.getUint32(4, true) !== 1) {
+                throw new Error('묶음 파일 형식이 아님');
+            }
+            const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 16, view.getUint32(8, true))));
+            header.assets.forEach(asset => {
+                // 오프셋이 정렬되어 있어 복사 없이 뷰로 자름
+                const bytes = new Uint8Array(buffer, asset.offset, asset.length);
+                BUNDLE_URLS[asset.name] = URL.createObjectURL(new Blob([bytes], { type: asset.type }));
+            });
+            console.log(`[BUNDLE] ${scene}: ${header.assets.length}개 자산`);
+            header.prefetch.forEach(next => loadSceneBundle(next).catch(() => {}));
+            return header;
+        });
+    sceneBundles.set(scene, promise);
+    return promise;
+}
+
+// 씬 묶음이 있으면 다 받은 뒤 진행 (묶음이 없거나 실패하면 바로 진행해 개별 요청)
+function sceneAssetsReady(scene) {
+    if (!ASSET_URLS[`/bundles/${scene}.bundle`]) return Promise.resolve();
+    return loadSceneBundle(scene)
+        .catch(error => console.warn(`[BUNDLE] ${scene} 묶음 로드 실패, 개별 요청 사용: ${error.message}`));
+}
+
+// 희소 맵(defaultTile + 행별 런 [x, 길이, 타일, ...])을 2차원 mapData로 복원
+function decodeMapRuns(mapJson) {
+    if (!mapJson.mapRuns) return mapJson.mapData;
+    const fill = mapJson.defaultTile || 0;
+    return mapJson.mapRuns.map(runs => {
+        const row = Array(mapJson.width).fill(fill);
+        for (let i = 0; i < runs.length; i += 3) {
+            row.fill(runs[i + 2], runs[i], runs[i] + runs[i + 1]);
+        }
+        return row;
+    });
+}
+
 class StartScene extends Phaser.Scene {
     constructor() {
         super('StartScene');
@@ -36,10 +98,10 @@ class StartScene extends Phaser.Scene {
 
     preload() {
         // 배경 이미지 로드
-        this.load.image('introBg', '/assets/Background_intro.jpeg');
+        this.load.image('introBg', assetUrl('/assets/Background_intro.jpeg'));
 
         // 캐릭터 미리보기용 로드
-        CHARACTERS.forEach(char => this.load.spritesheet(char.key, char.file, { frameWidth: 256, frameHeight: 256 }));
+        CHARACTERS.forEach(char => this.load.spritesheet(char.key, assetUrl(char.file), { frameWidth: 256, frameHeight: 256 }));
         CHARACTERS.forEach(char => {
             this.load.on(`filecomplete-spritesheet-${char.key}`, () => {
                 const texture = this.textures.get(char.key);
@@ -48,8 +110,8 @@ class StartScene extends Phaser.Scene {
         });
 
         // 배경 음악 로드
-        this.load.audio('lobbyMusic', '/assets/audio/lobby.mp3');
-        this.load.audio('bgm', '/assets/audio/bgm.mp3');
+        this.load.audio('lobbyMusic', assetUrl('/assets/audio/lobby.mp3'));
+        this.load.audio('bgm', assetUrl('/assets/audio/bgm.mp3'));
     }
 
     create() {
@@ -186,7 +248,11 @@ class StartScene extends Phaser.Scene {
             this.sound.add('bgm', { loop: true, volume: 0.3 }).play();
             document.body.removeChild(this.nicknameInput);
             window.playerNickname = nickname;
-            this.scene.start('GameScene', { characterIndex: this.selectedCharacterIndex, nickname });
+            this.startButton.disableInteractive();
+            // StartScene 묶음 뒤에 미리 받기 시작한 GameScene 묶음이 끝나면 시작
+            sceneAssetsReady('GameScene').then(() => {
+                this.scene.start('GameScene', { characterIndex: this.selectedCharacterIndex, nickname });
+            });
         });
 
         // 리사이즈 이벤트 처리
@@ -258,16 +324,41 @@ class GameScene extends Phaser.Scene {
     }
 
     preload() {
-        CHARACTERS.forEach(char => this.load.spritesheet(char.key, char.file, { frameWidth: 256, frameHeight: 256 }));
+        CHARACTERS.forEach(char => this.load.spritesheet(char.key, assetUrl(char.file), { frameWidth: 256, frameHeight: 256 }));
         CHARACTERS.forEach(char => {
             this.load.on(`filecomplete-spritesheet-${char.key}`, () => {
                 const texture = this.textures.get(char.key);
                 console.log(`[TEXTURE] ${char.key} loaded: ${texture.source[0].width}x${texture.source[0].height}`);
             });
         });
-        this.load.image('terrain', '/assets/New_Tileset.png');
-        this.load.image('mapBackground', '/assets/Re-Be_World.jpeg');
-        this.load.spritesheet('portal', '/assets/new_portal_spritesheet.png', { frameWidth: 988, frameHeight: 986 });
+        this.load.image('terrain', assetUrl('/assets/New_Tileset.png'));
+        this.load.image('mapBackground', assetUrl('/assets/Re-Be_World.jpeg'));
+        this.load.spritesheet('portal', assetUrl('/assets/new_portal_spritesheet.png'), { frameWidth: 988, frameHeight: 986 });
+    }
+
+    // 청크 매니페스트를 읽고 청크 이미지 로드 (없거나 맵과 크기가 다르면 null)
+    async loadTerrainChunks(mapWidth, mapHeight, tileSize) {
+        try {
+            const response = await fetch(assetUrl('/assets/chunks/default_map.chunks.json'));
+            if (!response.ok) return null;
+            const manifest = await response.json();
+            if (manifest.width !== mapWidth || manifest.height !== mapHeight || manifest.tileSize !== tileSize) {
+                console.warn('[MAP] 청크 매니페스트가 현재 맵과 맞지 않음, 배경 이미지 사용');
+                return null;
+            }
+            // 같은 파일을 쓰는 청크는 텍스처 하나를 공유
+            new Set(manifest.chunks.map(c => c.file)).forEach(file => {
+                if (!this.textures.exists(`chunk:${file}`)) this.load.image(`chunk:${file}`, assetUrl(`/assets/chunks/${file}`));
+            });
+            await new Promise(resolve => {
+                this.load.once('complete', resolve);
+                this.load.start();
+            });
+            console.log(`[MAP] 지형 청크 ${manifest.chunks.length}개 로드 (${manifest.chunkSize}px)`);
+            return manifest.chunks;
+        } catch (error) {
+            return null;
+        }
     }
 
     async create() {
@@ -276,11 +367,11 @@ class GameScene extends Phaser.Scene {
 
         try {
             // public/default_map.json을 먼저 시도
-            const response = await fetch('./default_map.json');
+            const response = await fetch(assetUrl('/default_map.json'));
             if (!response.ok) throw new Error('파일 없음');
 
             const mapJson = await response.json();
-            mapData = mapJson.mapData;
+            mapData = decodeMapRuns(mapJson);
             tileSize = mapJson.tileSize || 32;
             collisionTiles = mapJson.collisionTiles || [1];
 
@@ -297,16 +388,24 @@ class GameScene extends Phaser.Scene {
         const mapWidth = mapData[0].length;
         const mapHeight = mapData.length;
 
-        // 배경 이미지 표시 (실제 맵 그래픽)
-        const bg = this.add.image(0, 0, 'mapBackground').setOrigin(0, 0);
+        // 미리 구운 지형 청크(bake_chunks.py)가 있으면 큰 이미지 몇 장으로 지형 표시
+        const chunks = await this.loadTerrainChunks(mapWidth, mapHeight, tileSize);
+        let bg;
+        if (chunks) {
+            bg = this.add.container(0, 0, chunks.map(c =>
+                this.add.image(c.x, c.y, `chunk:${c.file}`).setOrigin(0, 0)));
+        } else {
+            // 배경 이미지 표시 (실제 맵 그래픽)
+            bg = this.add.image(0, 0, 'mapBackground').setOrigin(0, 0);
 
-        // 텍스처 필터링을 NEAREST로 설정 (픽셀 아트용, 선명하게)
-        bg.texture.setFilter(Phaser.Textures.FilterMode.NEAREST);
+            // 텍스처 필터링을 NEAREST로 설정 (픽셀 아트용, 선명하게)
+            bg.texture.setFilter(Phaser.Textures.FilterMode.NEAREST);
 
-        // 스케일 계산 (setDisplaySize 대신 setScale 사용)
-        const scaleX = (mapWidth * tileSize) / bg.width;
-        const scaleY = (mapHeight * tileSize) / bg.height;
-        bg.setScale(scaleX, scaleY);
+            // 스케일 계산 (setDisplaySize 대신 setScale 사용)
+            const scaleX = (mapWidth * tileSize) / bg.width;
+            const scaleY = (mapHeight * tileSize) / bg.height;
+            bg.setScale(scaleX, scaleY);
+        }
 
         // 타일맵 (충돌 감지용, 투명하게)
         const map = this.make.tilemap({ data: mapData, tileWidth: tileSize, tileHeight: tileSize });
@@ -1085,11 +1184,13 @@ class GameScene extends Phaser.Scene {
         // GameScene 정지 (렌더링도 멈춤)
         this.scene.sleep();
 
-        // TavernScene 시작
-        this.scene.launch('TavernScene', {
-            returnPosition,
-            characterIndex: this.currentCharacterIndex,
-            socket: this.socket
+        // TavernScene 시작 (미리 받던 선술집 묶음이 아직이면 끝난 뒤)
+        sceneAssetsReady('TavernScene').then(() => {
+            this.scene.launch('TavernScene', {
+                returnPosition,
+                characterIndex: this.currentCharacterIndex,
+                socket: this.socket
+            });
         });
 
         console.log('[TAVERN] Entered tavern from position:', returnPosition);
@@ -1115,11 +1216,12 @@ class TavernScene extends Phaser.Scene {
     }
 
     preload() {
-        this.load.image('tavern1', '/assets/tavern_frame1.jpg');
-        this.load.image('tavern2', '/assets/tavern_frame2.jpg');
-        this.load.image('tavern3', '/assets/tavern_frame3.jpg');
-        this.load.audio('pubMusic', '/assets/audio/pub.mp3');
-        this.load.json('tavernMap', '/tavern_map.json');
+        this.load.audio('pubMusic', assetUrl('/assets/audio/pub.mp3'));
+        // 선술집 배경은 프레임 이미지 3장 대신 bake_tavern_animation.py가 만든 타일셋 + 프레임별 변경 타일
+        this.load.once('filecomplete-json-tavernMap', (key, type, data) => {
+            this.load.image('tavernTiles', assetUrl(`/${data.animation.tileset}`));
+        });
+        this.load.json('tavernMap', assetUrl('/tavern_map.json'));
     }
 
     create() {
@@ -1131,10 +1233,20 @@ class TavernScene extends Phaser.Scene {
             this.tweens.add({ targets: mainBgm, volume: 0, duration: 1000, onComplete: () => mainBgm.pause() });
         }
 
-        this.tavernImage = this.add.image(0, 0, 'tavern1').setOrigin(0.5, 0.5);
-        const imgW = this.tavernImage.width;
-        const imgH = this.tavernImage.height;
-        this.tavernImage.setPosition(imgW / 2, imgH / 2);
+        // 기본 레이어를 타일맵으로 그리고, switchFrame에서 프레임별 변경 타일만 바꿈
+        const animation = this.cache.json.get('tavernMap').animation;
+        const imgW = animation.imageWidth;
+        const imgH = animation.imageHeight;
+        this.tavernSize = { width: imgW, height: imgH };
+        this.tavernBase = animation.baseLayer;
+        this.tavernFrames = animation.frames;
+        this.currentFrame = 0;
+        const tavernTilemap = this.make.tilemap({
+            data: animation.baseLayer, tileWidth: animation.tileSize, tileHeight: animation.tileSize
+        });
+        const tavernTileset = tavernTilemap.addTilesetImage('tavernTiles', 'tavernTiles',
+            animation.tileSize, animation.tileSize, animation.margin, animation.spacing);
+        this.tavernLayer = tavernTilemap.createLayer(0, tavernTileset, 0, 0);
         this.physics.world.setBounds(0, 0, imgW, imgH);
 
         if (this.cache.json.exists('tavernMap')) {
@@ -1208,7 +1320,7 @@ class TavernScene extends Phaser.Scene {
             fontSize: '24px', fill: '#fff', backgroundColor: '#00000088', padding: { x: 15, y: 10 }, align: 'center'
         }).setOrigin(0.5, 0).setScrollFactor(0).setDepth(1000);
 
-        this.time.addEvent({ delay: 1000, callback: this.switchFrame, callbackScope: this, loop: true });
+        this.time.addEvent({ delay: animation.frameDuration, callback: this.switchFrame, callbackScope: this, loop: true });
         this.scale.on('resize', this.resize, this);
         this.updateLayout();
         this.setupMultiplayer();
@@ -1504,18 +1616,24 @@ class TavernScene extends Phaser.Scene {
     }
 
     switchFrame() {
-        this.currentFrame = (this.currentFrame + 1) % 3;
-        this.tavernImage.setTexture(['tavern1', 'tavern2', 'tavern3'][this.currentFrame]);
+        // 현재 프레임에서 바뀐 타일을 기본 레이어로 되돌린 뒤 다음 프레임의 변경 타일 적용
+        this.tavernFrames[this.currentFrame].changes.forEach(([x, y]) => {
+            this.tavernLayer.putTileAt(this.tavernBase[y][x], x, y);
+        });
+        this.currentFrame = (this.currentFrame + 1) % this.tavernFrames.length;
+        this.tavernFrames[this.currentFrame].changes.forEach(([x, y, tile]) => {
+            this.tavernLayer.putTileAt(tile, x, y);
+        });
     }
 
     resize(gameSize) { this.updateLayout(); }
 
     updateLayout() {
-        if (!this.tavernImage) return;
+        if (!this.tavernLayer) return;
         const width = this.scale.width;
         const height = this.scale.height;
-        const imgW = this.tavernImage.width;
-        const imgH = this.tavernImage.height;
+        const imgW = this.tavernSize.width;
+        const imgH = this.tavernSize.height;
         const zoom = Math.min(width / imgW, height / imgH);
         this.cameras.main.setZoom(zoom);
         this.cameras.main.centerOn(imgW / 2, imgH / 2);
@@ -1572,7 +1690,10 @@ class BootScene extends Phaser.Scene {
     }
 
     create() {
-        this.scene.start('StartScene');
+        // 매니페스트(작은 JSON)와 첫 화면 묶음만 기다림, 게임/선술집 묶음은 헤더의 prefetch로 뒤에서 받음
+        assetsReady
+            .then(() => sceneAssetsReady('StartScene'))
+            .then(() => this.scene.start('StartScene'));
     }
 }
 
@@ -1598,4 +1719,10 @@ const config = {
     }
 };
 
+// 게임은 바로 시작하고 자산 매니페스트는 동시에 요청 (자산 URL은 각 씬 preload에서 그때 바꿈)
+const assetsReady = fetch('/asset-manifest.json')
+    .then(response => (response.ok ? response.json() : {}))
+    .then(manifest => { ASSET_URLS = manifest.assets || {}; })
+    .catch(() => {});
+
 new Phaser.Game(config);
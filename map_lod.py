@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+타일맵 LOD 단계 + 미니맵 생성
+
+멀리서 보는 화면이나 미니맵도 지금은 120x168 = 20,160개 타일을 전부 그려야 한다.
+2x2 타일 묶음을 한 타일로 합치는 과정을 단계별로 반복해 거친 맵(LOD)을 만들고,
+타일 평균 색상표로 미니맵 이미지를 벡터 연산 한 번에 그린다.
+
+합치는 방식:
+    mode  : 2x2 안에서 가장 많은 타일 ID (같으면 왼쪽 위 우선)
+    color : 2x2 평균 색상에 가장 가까운 평균 색상의 타일
+
+사용 예:
+    python map_lod.py public/default_map.json public/assets/New_Tileset.png --levels 3 \\
+        --out-dir public/assets/lod --minimap-scale 2
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+from PIL import Image
+
+from progressive_convert import match_means, tile_mean_colors
+from sparse_map import decode_map
+
+
+def pad_even(grid):
+    """홀수 크기면 마지막 행/열을 복제해 짝수로"""
+    pad_y = grid.shape[0] % 2
+    pad_x = grid.shape[1] % 2
+    if pad_y or pad_x:
+        widths = ((0, pad_y), (0, pad_x)) + ((0, 0),) * (grid.ndim - 2)
+        grid = np.pad(grid, widths, mode='edge')
+    return grid
+
+
+def quads(grid):
+    """(H, W, ...) → (H/2, W/2, 4, ...) 2x2 묶음 (왼쪽 위, 오른쪽 위, 왼쪽 아래, 오른쪽 아래)"""
+    grid = pad_even(grid)
+    h, w = grid.shape[0] // 2, grid.shape[1] // 2
+    blocks = grid.reshape(h, 2, w, 2, *grid.shape[2:]).swapaxes(1, 2)
+    return blocks.reshape(h, w, 4, *grid.shape[2:])
+
+
+def downsample_mode(data):
+    """2x2 묶음마다 가장 많은 타일 ID"""
+    q = quads(np.asarray(data))
+    # 각 위치의 값이 묶음 안에서 몇 번 나오는지 (…, 4, 4) 비교 후 최댓값 위치
+    counts = (q[..., :, None] == q[..., None, :]).sum(axis=-1)
+    pick = counts.argmax(axis=-1)
+    return np.take_along_axis(q, pick[..., None], axis=-1)[..., 0]
+
+
+def build_lods(data, levels, mode='mode', tile_averages=None):
+    """
+    LOD 단계 목록 [(단계, mapData 배열)] (단계 1 = 2배 축소)
+
+    color 방식은 원본 타일 평균 색상을 단계마다 2x2 평균으로 줄여가며 가장 가까운 타일을 고른다.
+    """
+    data = np.asarray(data, dtype=np.int64)
+    if mode == 'color':
+        if tile_averages is None:
+            raise ValueError("color 방식에는 타일 평균 색상이 필요합니다")
+        colors = tile_averages[data]
+
+    lods = []
+    for level in range(1, levels + 1):
+        if min(data.shape) <= 1:
+            break
+        if mode == 'color':
+            colors = quads(colors).mean(axis=2)
+            data = match_means(colors, tile_averages)
+        else:
+            data = downsample_mode(data)
+        lods.append((level, data))
+    return lods
+
+
+def render_minimap(data, tile_averages, scale=1, collision_tiles=None, collision_color=(40, 40, 40)):
+    """타일 ID → 평균 색상 조회 한 번으로 미니맵 이미지 (타일당 scale x scale 픽셀)"""
+    palette = np.clip(np.round(tile_averages), 0, 255).astype(np.uint8)
+    if collision_tiles:
+        palette = palette.copy()
+        valid = [t for t in collision_tiles if 0 <= t < len(palette)]
+        palette[valid] = collision_color
+    pixels = palette[np.asarray(data, dtype=np.int64)]
+    if scale > 1:
+        pixels = pixels.repeat(scale, axis=0).repeat(scale, axis=1)
+    return Image.fromarray(pixels)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='타일맵 LOD 단계 + 미니맵 생성')
+    parser.add_argument('map')
+    parser.add_argument('tileset')
+    parser.add_argument('--levels', type=int, default=3)
+    parser.add_argument('--mode', choices=['mode', 'color'], default='mode')
+    parser.add_argument('--tile-size', type=int, default=None, help='기본값: 맵의 tileSize')
+    parser.add_argument('--out-dir', default=None, help='기본값: 맵 파일 폴더')
+    parser.add_argument('--minimap-scale', type=int, default=1, help='미니맵 타일당 픽셀 수')
+    parser.add_argument('--mark-collision', action='store_true', help='미니맵에서 충돌 타일을 어둡게 표시')
+    args = parser.parse_args()
+
+    with open(args.map, 'r', encoding='utf-8') as f:
+        map_json = decode_map(json.load(f))
+    tile_size = args.tile_size or map_json.get("tileSize", 32)
+    tile_averages = tile_mean_colors(args.tileset, tile_size)
+
+    out_dir = args.out_dir or os.path.dirname(os.path.abspath(args.map))
+    os.makedirs(out_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(args.map))[0]
+
+    data = np.asarray(map_json["mapData"], dtype=np.int64)
+    if data.max() >= len(tile_averages):
+        raise ValueError(f"mapData에 타일셋 범위({len(tile_averages)})를 벗어난 타일 ID가 있습니다")
+
+    print(f"🗺️ {name}: {data.shape[1]}x{data.shape[0]} ({data.size}개 타일)")
+    lod_files = []
+    for level, lod in build_lods(data, args.levels, args.mode, tile_averages):
+        lod_json = dict(map_json)
+        lod_json.update({
+            "width": lod.shape[1],
+            "height": lod.shape[0],
+            "mapData": lod.tolist(),
+            "lodLevel": level,
+            "lodScale": 2 ** level,  # 같은 타일셋으로 그린 뒤 레이어를 이 배율로 키움
+            "lodMode": args.mode,
+            "source": f"LOD {level} of {os.path.basename(args.map)}"
+        })
+        path = os.path.join(out_dir, f"{name}.lod{level}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(lod_json, f, indent=2, ensure_ascii=False)
+        lod_files.append(path)
+        print(f"   LOD {level}: {lod.shape[1]}x{lod.shape[0]} ({lod.size}개 타일, 표시 크기 {tile_size * 2 ** level}px) → {path}")
+
+    minimap_path = os.path.join(out_dir, f"{name}_minimap.png")
+    collision = map_json.get("collisionTiles") if args.mark_collision else None
+    render_minimap(data, tile_averages, args.minimap_scale, collision).save(minimap_path, optimize=True)
+    print(f"🧭 미니맵: {minimap_path}")
+    print(f"✅ LOD {len(lod_files)}단계 생성 완료")
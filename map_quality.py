@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+타일맵 복원 렌더러 + 품질 지표 (PSNR / SSIM / 타일별 오차 열지도)
+
+convert_world_map.py의 평균 RGB 매칭, extract_map_tiles.py의 compare_tiles,
+extract_map_simple.py의 색상 규칙 등은 결과가 원본과 얼마나 비슷한지 브라우저에 띄워 봐야 알 수 있었다.
+mapData + 타일셋으로 이미지를 한 번의 인덱싱(gather)으로 다시 그리고
+원본과 비교해 PSNR / SSIM과 타일별 오차를 숫자로 낸다.
+120x168 맵은 1초보다 훨씬 빨리 끝나므로 매칭 방식의 품질과 속도를 같이 비교할 수 있다.
+
+- 복원: 타일 배열 (T, s, s, 3)[mapData] → reshape (bake_chunks.render_tiles와 같은 방식)
+- 원본: 맵 픽셀 크기로 LANCZOS 리사이즈 (image_cache 디스크 캐시)
+- PSNR: 전체 / 타일별 MSE 기준
+- SSIM: 밝기(Y) 채널에서 겹치지 않는 window x window 블록마다 계산한 뒤 평균
+  (가우시안 창을 한 픽셀씩 미는 원래 SSIM보다 빠른 근사, 같은 설정끼리 비교용)
+- 비교 해상도: --compare-size로 타일을 작게 줄여 비교하면 더 빠르다 (타일 크기의 약수)
+
+사용 예:
+    python map_quality.py assets/world_map_original.jpg default_map.json \\
+        --tileset assets/New_Tileset.png --render render.png --heatmap heatmap.png
+    python map_quality.py assets/world_map_original.jpg a.json b.json --compare-size 16
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+from PIL import Image
+
+from bake_chunks import load_tileset, render_tiles
+from image_cache import load_image_array
+from sparse_map import decode_map
+
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def load_rgb_tiles(tileset_path, tile_size, compare_size=None):
+    """타일셋 → (T, s, s, 3) uint8 (투명 부분은 검은 배경에 합성, compare_size로 블록 평균 축소)"""
+    tiles = load_tileset(tileset_path, tile_size)
+    if tiles.shape[3] == 4:
+        alpha = tiles[..., 3:].astype(np.float32) / 255
+        tiles = (tiles[..., :3] * alpha + 0.5).astype(np.uint8)
+    if compare_size and compare_size != tile_size:
+        if tile_size % compare_size:
+            raise ValueError(f"비교 크기 {compare_size}는 타일 크기 {tile_size}의 약수여야 합니다")
+        k = tile_size // compare_size
+        t = tiles.shape[0]
+        tiles = tiles.reshape(t, compare_size, k, compare_size, k, 3).mean(axis=(2, 4))
+        tiles = (tiles + 0.5).astype(np.uint8)
+    return tiles
+
+
+def render_map(data, tiles):
+    """mapData (h, w) → (h*s, w*s, 3) 복원 이미지 (타일셋 밖 ID는 오류)"""
+    data = np.asarray(data, dtype=np.int64)
+    if data.size and (data.min() < 0 or data.max() >= len(tiles)):
+        raise ValueError(f"타일 ID 범위 밖: {data.min()}..{data.max()} (타일셋 {len(tiles)}개)")
+    return render_tiles(data, tiles)
+
+
+def tile_mse(source, rebuilt, tile_size):
+    """타일별 평균 제곱 오차 (h, w) (RGB 채널 평균)"""
+    h, w = source.shape[0] // tile_size, source.shape[1] // tile_size
+    diff = (source.astype(np.float32) - rebuilt).reshape(h, tile_size, w, tile_size * 3)
+    # 제곱 임시 배열 없이 타일마다 내적으로 합산
+    return np.einsum('iajb,iajb->ij', diff, diff) / (tile_size * tile_size * 3)
+
+
+def psnr(mse):
+    """MSE → PSNR dB (배열 가능, 손실 없으면 inf)"""
+    mse = np.asarray(mse, dtype=np.float64)
+    with np.errstate(divide='ignore'):
+        return 10 * np.log10(255.0 ** 2 / mse)
+
+
+def luma(pixels):
+    """(..., 3) RGB → (...) 밝기 float32"""
+    return pixels.astype(np.float32) @ LUMA
+
+
+def block_ssim(x, y, window=8):
+    """
+    밝기 평면 두 장의 블록 SSIM (겹치지 않는 window x window 블록)
+
+    블록 합은 reshape + einsum으로 구해 제곱/곱 임시 배열을 만들지 않는다.
+
+    Returns:
+        (H/window, W/window) 블록별 SSIM
+    """
+    bh, bw = x.shape[0] // window, x.shape[1] // window
+    x = x[:bh * window, :bw * window].reshape(bh, window, bw, window)
+    y = y[:bh * window, :bw * window].reshape(bh, window, bw, window)
+    n = window * window
+
+    mx = np.einsum('iajb->ij', x) / n
+    my = np.einsum('iajb->ij', y) / n
+    vx = np.einsum('iajb,iajb->ij', x, x) / n - mx * mx
+    vy = np.einsum('iajb,iajb->ij', y, y) / n - my * my
+    cov = np.einsum('iajb,iajb->ij', x, y) / n - mx * my
+    return ((2 * mx * my + SSIM_C1) * (2 * cov + SSIM_C2)) / ((mx * mx + my * my + SSIM_C1) * (vx + vy + SSIM_C2))
+
+
+def evaluate(map_json, tiles, source):
+    """
+    복원 이미지 + 품질 지표
+
+    Returns:
+        (복원 이미지, 결과 dict: psnr, ssim, tileMse (h, w), tileSsim (h, w), renderSeconds, metricSeconds)
+    """
+    started = time.perf_counter()
+    data = np.asarray(map_json["mapData"], dtype=np.int64)
+    rebuilt = render_map(data, tiles)
+    rendered = time.perf_counter()
+
+    ts = tiles.shape[1]
+    if source.shape[:2] != rebuilt.shape[:2]:
+        raise ValueError(f"원본 {source.shape[1]}x{source.shape[0]}과 복원 {rebuilt.shape[1]}x{rebuilt.shape[0]} 크기가 다릅니다")
+
+    mse = tile_mse(source, rebuilt, ts)
+    # 복원 이미지 밝기는 타일 밝기를 같은 방식으로 모아 그림 (전체 크기 행렬곱 한 번 절약)
+    rebuilt_luma = render_tiles(data, luma(tiles)[..., np.newaxis])[..., 0]
+    # SSIM 블록이 타일 경계를 넘지 않도록 창 크기는 타일 크기의 약수
+    window = next(w for w in (8, 4, 2, 1) if ts % w == 0)
+    ssim_blocks = block_ssim(luma(source), rebuilt_luma, window)
+    k = ts // window
+    tile_ssim = ssim_blocks.reshape(mse.shape[0], k, mse.shape[1], k).mean(axis=(1, 3))
+    finished = time.perf_counter()
+
+    return rebuilt, {
+        "psnr": float(psnr(mse.mean())),
+        "ssim": float(ssim_blocks.mean()),
+        "tileMse": mse,
+        "tileSsim": tile_ssim,
+        "renderSeconds": rendered - started,
+        "metricSeconds": finished - rendered,
+    }
+
+
+def heatmap_image(tile_error, scale=4, vmax=None):
+    """타일별 오차 (h, w) → 열지도 이미지 (검정 → 빨강 → 노랑 → 흰색, 타일마다 scale px)"""
+    err = np.asarray(tile_error, dtype=np.float64)
+    vmax = vmax or (np.percentile(err, 99) if err.size else 1.0) or 1.0
+    t = np.clip(err / vmax, 0, 1)
+    rgb = np.stack([np.clip(3 * t, 0, 1), np.clip(3 * t - 1, 0, 1), np.clip(3 * t - 2, 0, 1)], axis=-1)
+    rgb = (rgb * 255 + 0.5).astype(np.uint8)
+    return Image.fromarray(rgb.repeat(scale, axis=0).repeat(scale, axis=1))
+
+
+def load_map(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return decode_map(json.load(f))
+
+
+def load_source(image_path, map_json, compare_size):
+    """원본 이미지를 맵 픽셀 크기(칸당 compare_size px)로 리사이즈한 (H, W, 3) 배열 (메모리로 읽음)"""
+    size = (map_json["width"] * compare_size, map_json["height"] * compare_size)
+    return np.array(load_image_array(image_path, size=size))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='mapData 복원 렌더링 + 원본 대비 PSNR/SSIM')
+    parser.add_argument('source', help='원본 맵 이미지')
+    parser.add_argument('maps', nargs='+', help='비교할 맵 JSON (여러 개면 표로 비교)')
+    parser.add_argument('--tileset', default='assets/New_Tileset.png')
+    parser.add_argument('--tile-size', type=int, default=None, help='타일셋 타일 크기 (기본값: 맵 tileSize)')
+    parser.add_argument('--compare-size', type=int, default=None, help='비교할 칸 크기 px (기본값: 타일 크기)')
+    parser.add_argument('--render', default=None, help='복원 이미지 저장 (맵이 하나일 때)')
+    parser.add_argument('--heatmap', default=None, help='타일별 MSE 열지도 저장 (맵이 하나일 때)')
+    parser.add_argument('--heatmap-scale', type=int, default=4, help='열지도에서 타일 하나의 픽셀 크기')
+    parser.add_argument('--worst', type=int, default=5, help='오차가 큰 타일 몇 개를 출력할지')
+    args = parser.parse_args()
+
+    results = []
+    tile_sets = {}
+    for path in args.maps:
+        map_json = load_map(path)
+        tile_size = args.tile_size or map_json.get("tileSize", 32)
+        compare_size = args.compare_size or tile_size
+        key = (tile_size, compare_size)
+        if key not in tile_sets:
+            tile_sets[key] = load_rgb_tiles(args.tileset, tile_size, compare_size)
+        source = load_source(args.source, map_json, compare_size)
+        rebuilt, result = evaluate(map_json, tile_sets[key], source)
+        results.append((path, map_json, rebuilt, result))
+
+    print(f"📐 원본: {args.source}, 타일셋: {args.tileset}")
+    print(f"{'맵':<32} {'크기':>9} {'PSNR':>8} {'SSIM':>7} {'렌더':>8} {'지표':>8}")
+    for path, map_json, _, r in results:
+        print(f"{path:<32} {map_json['width']:>4}x{map_json['height']:<4} {r['psnr']:>8.2f} {r['ssim']:>7.4f} "
+              f"{r['renderSeconds'] * 1000:>6.1f}ms {r['metricSeconds'] * 1000:>6.1f}ms")
+
+    if len(results) == 1:
+        path, map_json, rebuilt, r = results[0]
+        data = np.asarray(map_json["mapData"])
+        worst = np.argsort(r["tileMse"], axis=None)[::-1][:args.worst]
+        if len(worst):
+            print(f"\n🔥 오차가 큰 타일 {len(worst)}개:")
+        for idx in worst:
+            y, x = np.unravel_index(idx, r["tileMse"].shape)
+            print(f"   ({x:3d}, {y:3d}) 타일 {data[y, x]:3d}: PSNR {psnr(r['tileMse'][y, x]):6.2f} dB, "
+                  f"SSIM {r['tileSsim'][y, x]:.3f}")
+        if args.render:
+            Image.fromarray(rebuilt).save(args.render)
+            print(f"🖼️ 복원 이미지: {args.render}")
+        if args.heatmap:
+            heatmap_image(r["tileMse"], args.heatmap_scale).save(args.heatmap)
+            print(f"🌡️ 타일 오차 열지도: {args.heatmap}")
+    elif args.render or args.heatmap:
+        print("⚠️ --render / --heatmap은 맵이 하나일 때만 저장합니다")
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+타일 행 스트림 파이프라인
+
+지금 스크립트들은 map_data 전체 → JSON 전체를 만든 뒤에야 파일에 쓰고,
+expand_map.py / extract_map_simple.py의 타일 통계는 그 뒤에 한 번 더 전체를 돈다.
+소스가 타일 행(1차원 목록)을 하나씩 내보내고 변환/탭/싱크가 제너레이터로 이어 받으면
+변환 → 통계 → 쓰기가 한 번의 순회로 끝나고 메모리에는 몇 행만 남는다.
+
+    소스  : 행을 내보내는 반복자 (repeat_rows, generate_rows, map_rows, row_bands.iter_row_bands)
+    단계  : rows 반복자 → rows 반복자 함수 (map_tiles, autotile_rows, TileHistogram, collect ...)
+    싱크  : rows를 끝까지 소비해 기록 (write_json_rows, write_sparse_rows, write_binary_rows)
+
+예:
+    histogram = TileHistogram()
+    rows = pipe(repeat_rows(data, 120, 168), map_tiles(vary), autotile_rows(NEW_TILESET_RULES), histogram)
+    write_json_rows(rows, 'out.json', {"width": 120, "height": 168, "tileSize": 32})
+    histogram.report()
+"""
+
+import json
+import struct
+from collections import Counter, deque
+
+import numpy as np
+
+from autotile import autotile
+from sparse_map import SparseMap, row_runs
+
+BINARY_MAGIC = b'RBWM'
+BINARY_HEADER = struct.Struct('<4sII')  # 매직, 너비, 높이 (뒤에 uint16 리틀 엔디언 행 데이터)
+
+
+def pipe(source, *stages):
+    """source에 단계를 차례로 연결한 반복자"""
+    for stage in stages:
+        source = stage(source)
+    return source
+
+
+# 소스
+
+def generate_rows(height, make_row):
+    """make_row(y) → 행"""
+    for y in range(height):
+        yield make_row(y)
+
+
+def repeat_rows(data, width, height):
+    """작은 맵을 가로/세로로 반복해 width x height 행 (expand_map 패턴 복제)"""
+    src_h = len(data)
+    for y in range(height):
+        row = data[y % src_h]
+        yield [row[x % len(row)] for x in range(width)]
+
+
+def map_rows(map_json):
+    """맵 dict의 행 (밀집 mapData 또는 희소 mapRuns)"""
+    if "mapRuns" in map_json:
+        sparse = SparseMap.from_runs(map_json["width"], map_json["height"],
+                                     map_json["mapRuns"], map_json.get("defaultTile", 0))
+        for y in range(sparse.height):
+            yield sparse.row(y).tolist()
+    else:
+        yield from map_json["mapData"]
+
+
+# 단계
+
+def map_tiles(func):
+    """칸마다 func(tile) 적용 (무작위 변형 등)"""
+    def stage(rows):
+        for row in rows:
+            yield [func(tile) for tile in row]
+    return stage
+
+
+def autotile_rows(rules, mode=4):
+    """
+    위아래 한 행씩만 보는 3행 창으로 autotile 적용
+
+    맵 위/아래 가장자리는 autotile과 같이 가장자리 행을 복제해 이웃으로 본다.
+    """
+    def center(window):
+        return autotile(np.asarray(window), rules, mode)[1].tolist()
+
+    def stage(rows):
+        window = deque(maxlen=3)
+        for row in rows:
+            if not window:
+                window.append(row)  # 첫 행 위쪽 = 첫 행
+            window.append(row)
+            if len(window) == 3:
+                yield center(window)
+        if window:
+            window.append(window[-1])  # 마지막 행 아래쪽 = 마지막 행
+            yield center(window)
+    return stage
+
+
+class TileHistogram:
+    """지나가는 행의 타일 사용 횟수를 세는 탭 (행은 그대로 내보냄)"""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.total = 0
+
+    def __call__(self, rows):
+        for row in rows:
+            self.counts.update(row)
+            self.total += len(row)
+            yield row
+
+    def report(self, width=5):
+        """expand_map / extract_map_simple 형식의 타일 사용 통계 출력"""
+        print("\n📊 타일 사용 통계:")
+        for tile_idx in sorted(self.counts):
+            count = self.counts[tile_idx]
+            percentage = count / self.total * 100 if self.total else 0.0
+            print(f"   타일 {tile_idx:3d}: {count:{width}d}개 ({percentage:5.1f}%)")
+
+
+def progress_rows(total, callback, every=1):
+    """every행마다 callback(완료 행 수, total)"""
+    def stage(rows):
+        for y, row in enumerate(rows, 1):
+            if y % every == 0 or y == total:
+                callback(y, total)
+            yield row
+    return stage
+
+
+def collect(into):
+    """지나가는 행을 목록 into에 모으는 탭 (결과를 메모리에도 남겨야 할 때)"""
+    def stage(rows):
+        for row in rows:
+            into.append(row)
+            yield row
+    return stage
+
+
+# 싱크
+
+def _open_json(f, header, key):
+    """header 뒤에 key 배열을 여는 JSON 앞부분 쓰기"""
+    body = json.dumps(header, indent=2, ensure_ascii=False)
+    f.write(body[:-2] + ',\n' if header else '{\n')
+    f.write(f'  "{key}": [')
+
+
+def write_json_rows(rows, path, header):
+    """
+    행을 하나씩 mapData에 기록 (행마다 한 줄)
+
+    Returns:
+        (width, height)
+    """
+    width = height = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        _open_json(f, header, "mapData")
+        for row in rows:
+            f.write((',\n    ' if height else '\n    ') + json.dumps([int(t) for t in row]))
+            width = len(row)
+            height += 1
+        f.write('\n  ]\n}\n' if height else ']\n}\n')
+    return width, height
+
+
+def write_sparse_rows(rows, path, header, default=0):
+    """행을 하나씩 mapRuns에 기록 (sparse_map 희소 형식, 기본 타일은 미리 지정)"""
+    width = height = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        _open_json(f, dict(header, defaultTile=default), "mapRuns")
+        for row in rows:
+            f.write((',\n    ' if height else '\n    ') + json.dumps(row_runs(row, default)))
+            width = len(row)
+            height += 1
+        f.write('\n  ]\n}\n' if height else ']\n}\n')
+    return width, height
+
+
+def write_binary_rows(rows, path):
+    """
+    행을 uint16 리틀 엔디언으로 기록 (앞에 매직/너비/높이, 높이는 끝에서 채움)
+
+    Returns:
+        (width, height)
+    """
+    width = height = 0
+    with open(path, 'wb') as f:
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, 0, 0))
+        for row in rows:
+            if height == 0:
+                width = len(row)
+            elif len(row) != width:
+                raise ValueError(f"{height}행 너비({len(row)})가 첫 행({width})과 다릅니다")
+            f.write(np.asarray(row, dtype='<u2').tobytes())
+            height += 1
+        f.seek(0)
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, width, height))
+    return width, height
+
+
+def read_binary_rows(path):
+    """write_binary_rows 파일의 행"""
+    with open(path, 'rb') as f:
+        magic, width, height = BINARY_HEADER.unpack(f.read(BINARY_HEADER.size))
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"{path}: 타일 행 바이너리 파일이 아닙니다")
+        for _ in range(height):
+            yield np.frombuffer(f.read(width * 2), dtype='<u2').astype(np.int64).tolist()
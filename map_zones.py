@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+맵 관심 영역(zone) 분할
+
+서버는 playerMoved를 모든 소켓에 보내고 클라이언트가 scene으로 걸러낸다.
+맵을 청크 격자로 나누고, 각 청크 안에서 충돌 타일로 끊긴 걸을 수 있는 연결 영역을
+하나의 zone으로 만든 뒤 다음을 맵 옆 <맵>.zones.json으로 내보낸다.
+    - 타일 → zone ID 표 (sparse_map 형식 행 런, 충돌 타일은 -1)
+    - zone 인접 목록 (같은/이웃 8방향 청크의 zone: 이동 브로드캐스트 대상)
+
+사용 예:
+    python map_zones.py public/default_map.json --chunk-size 16
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from sparse_map import SparseMap, decode_map
+
+BLOCKED = -1
+
+
+def collision_mask(map_json):
+    """충돌 타일이면 True인 (H, W) 배열"""
+    data = np.asarray(map_json["mapData"], dtype=np.int64)
+    return np.isin(data, map_json.get("collisionTiles", []))
+
+
+def label_regions(walkable, chunk_size):
+    """
+    청크 경계와 충돌 타일로 나뉜 4방향 연결 영역 라벨링 (벡터화 라벨 전파)
+
+    각 칸의 라벨은 영역 안 가장 작은 칸 번호. 이웃 최솟값 전파 후
+    라벨이 가리키는 칸의 라벨로 건너뛰기(pointer jumping)를 반복해 빠르게 수렴한다.
+
+    Returns:
+        (H, W) 라벨 (막힌 칸은 -1)
+    """
+    height, width = walkable.shape
+    ys, xs = np.indices((height, width))
+    chunk = (ys // chunk_size) * ((width + chunk_size - 1) // chunk_size) + xs // chunk_size
+
+    big = height * width
+    labels = np.where(walkable, np.arange(big).reshape(height, width), big)
+
+    # 방향별로 이웃과 이어질 수 있는 칸 (둘 다 걸을 수 있고 같은 청크)
+    link_x = walkable[:, 1:] & walkable[:, :-1] & (chunk[:, 1:] == chunk[:, :-1])
+    link_y = walkable[1:, :] & walkable[:-1, :] & (chunk[1:, :] == chunk[:-1, :])
+
+    while True:
+        prev = labels
+        labels = labels.copy()
+        np.minimum(labels[:, 1:], np.where(link_x, labels[:, :-1], big), out=labels[:, 1:])
+        np.minimum(labels[:, :-1], np.where(link_x, labels[:, 1:], big), out=labels[:, :-1])
+        np.minimum(labels[1:, :], np.where(link_y, labels[:-1, :], big), out=labels[1:, :])
+        np.minimum(labels[:-1, :], np.where(link_y, labels[1:, :], big), out=labels[:-1, :])
+        # 라벨이 가리키는 칸의 라벨로 건너뛰기
+        flat = np.append(labels.ravel(), big)
+        labels = np.where(walkable, flat[labels], big)
+        if np.array_equal(labels, prev):
+            break
+
+    return np.where(walkable, labels, BLOCKED)
+
+
+def partition_zones(map_json, chunk_size=16):
+    """
+    맵 → zone 분할
+
+    Returns:
+        (zone_grid, zones, adjacency)
+        zone_grid: (H, W) zone ID (충돌 타일은 -1)
+        zones: zone별 {"chunk": [cx, cy], "tiles": 칸 수, "bounds": [x0, y0, x1, y1]}
+        adjacency: zone별 같은/이웃 청크의 zone ID 목록
+    """
+    walkable = ~collision_mask(map_json)
+    labels = label_regions(walkable, chunk_size)
+
+    # 라벨(가장 작은 칸 번호)을 청크 순서 → 영역 순서로 0부터 다시 매김
+    height, width = walkable.shape
+    roots = np.unique(labels[labels >= 0])
+    root_y, root_x = np.divmod(roots, width)
+    chunks_x = (width + chunk_size - 1) // chunk_size
+    chunk_of_root = (root_y // chunk_size) * chunks_x + root_x // chunk_size
+    order = np.lexsort((roots, chunk_of_root))
+    zone_of_root = np.empty(len(roots), dtype=np.int64)
+    zone_of_root[order] = np.arange(len(roots))
+
+    zone_grid = np.full(labels.shape, BLOCKED, dtype=np.int64)
+    mask = labels >= 0
+    zone_grid[mask] = zone_of_root[np.searchsorted(roots, labels[mask])]
+
+    # zone별 칸 수 / 경계 상자
+    ys, xs = np.nonzero(mask)
+    ids = zone_grid[ys, xs]
+    count = len(roots)
+    tiles = np.bincount(ids, minlength=count)
+    x0 = np.full(count, width)
+    y0 = np.full(count, height)
+    x1 = np.zeros(count, dtype=np.int64)
+    y1 = np.zeros(count, dtype=np.int64)
+    np.minimum.at(x0, ids, xs)
+    np.minimum.at(y0, ids, ys)
+    np.maximum.at(x1, ids, xs + 1)
+    np.maximum.at(y1, ids, ys + 1)
+
+    zone_chunk = np.empty((count, 2), dtype=np.int64)
+    zone_chunk[zone_of_root, 0] = root_x // chunk_size
+    zone_chunk[zone_of_root, 1] = root_y // chunk_size
+
+    zones = [{"chunk": zone_chunk[z].tolist(), "tiles": int(tiles[z]),
+              "bounds": [int(x0[z]), int(y0[z]), int(x1[z]), int(y1[z])]}
+             for z in range(count)]
+
+    # 청크 → zone 목록, 이웃 8방향 청크의 zone을 인접으로
+    by_chunk = {}
+    for z, (cx, cy) in enumerate(zone_chunk.tolist()):
+        by_chunk.setdefault((cx, cy), []).append(z)
+    adjacency = []
+    for z, (cx, cy) in enumerate(zone_chunk.tolist()):
+        near = [n for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+                for n in by_chunk.get((cx + dx, cy + dy), []) if n != z]
+        adjacency.append(sorted(near))
+
+    return zone_grid, zones, adjacency
+
+
+def zones_path_for(map_path):
+    root, _ = os.path.splitext(map_path)
+    return f"{root}.zones.json"
+
+
+def write_zones(map_path, chunk_size=16, output_path=None):
+    """맵 파일을 읽어 <맵>.zones.json 저장"""
+    with open(map_path, 'r', encoding='utf-8') as f:
+        map_json = decode_map(json.load(f))
+
+    zone_grid, zones, adjacency = partition_zones(map_json, chunk_size)
+    sparse = SparseMap.from_dense(zone_grid, default=BLOCKED)
+
+    output_path = output_path or zones_path_for(map_path)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "map": os.path.basename(map_path),
+            "width": map_json["width"],
+            "height": map_json["height"],
+            "tileSize": map_json.get("tileSize", 32),
+            "chunkSize": chunk_size,
+            "zoneCount": len(zones),
+            "defaultZone": BLOCKED,
+            "zoneRuns": sparse.runs(),
+            "zones": zones,
+            "adjacency": adjacency
+        }, f, separators=(',', ':'))
+
+    return output_path, zones, adjacency
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='맵 관심 영역(zone) 분할')
+    parser.add_argument('maps', nargs='+')
+    parser.add_argument('--chunk-size', type=int, default=16, help='청크 크기 (타일)')
+    args = parser.parse_args()
+
+    for map_path in args.maps:
+        output_path, zones, adjacency = write_zones(map_path, args.chunk_size)
+        avg = sum(len(a) for a in adjacency) / len(adjacency) if adjacency else 0
+        print(f"🗺️ {map_path}: zone {len(zones)}개 (청크 {args.chunk_size}x{args.chunk_size}), 평균 인접 {avg:.1f}개")
+        print(f"✅ 저장: {output_path}")
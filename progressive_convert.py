@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+점진적(coarse-to-fine) 미리보기 변환
+
+전체 해상도 변환(convert_world_map.py)을 기다리지 않고,
+1) 크게 축소한 이미지로 전체 타일맵을 먼저 만든 뒤
+2) 해상도를 올려가며 우선 영역(스폰 지점/뷰포트)부터 구역 단위로 다시 매칭하고
+3) 바뀐 칸만 증분 패치로 내보낸다.
+
+마지막 단계는 기본적으로 convert_world_map.py 기본 경로(mean_only = True, 원본 적분 영상의 칸별 평균)와 같은
+summed_area.image_grid_means를 쓰므로 모든 패치를 적용하면 전체 변환과 같은 결과가 된다.
+mean_only=False(--lanczos)면 마지막 단계가 LANCZOS 리사이즈 + 블록 평균이 되어
+convert_world_map.py의 mean_only = False 경로와 같아진다.
+
+사용 예:
+    python progressive_convert.py assets/world_map_original.jpg assets/New_Tileset.png \\
+        --out default_map.json --focus 8 58
+"""
+
+import argparse
+import json
+
+import numpy as np
+from PIL import Image
+
+from image_cache import load_image_array
+from summed_area import image_grid_means
+from tile_store import atlas_to_tiles
+
+SPAWN_TILE = (8, 58)  # gameserver.js 기본 스폰 위치 (8 * 32 + 16, 58 * 32 + 16)
+
+
+def tile_mean_colors(tileset_path, tile_size):
+    """타일셋 각 타일의 평균 RGB (T, 3)"""
+    tileset = np.asarray(Image.open(tileset_path).convert('RGB'))
+    return atlas_to_tiles(tileset, tile_size).mean(axis=(1, 2))
+
+
+def match_means(means, tile_averages):
+    """(h, w, 3) 평균 색상 → 가장 가까운 타일 인덱스 (h, w)"""
+    result = np.empty(means.shape[:2], dtype=np.int64)
+    # 행 단위로 계산해 (w, T, 3) 크기만 메모리에 올림
+    for y, row in enumerate(means):
+        diffs = ((row[:, np.newaxis, :] - tile_averages) ** 2).sum(axis=-1)
+        result[y] = diffs.argmin(axis=-1)
+    return result
+
+
+def region_order(width, height, region_size, focus):
+    """focus 타일에 가까운 구역부터 (x, y, w, h) 순서"""
+    regions = []
+    fx, fy = focus
+    for y in range(0, height, region_size):
+        for x in range(0, width, region_size):
+            w = min(region_size, width - x)
+            h = min(region_size, height - y)
+            cx = min(max(fx, x), x + w - 1)
+            cy = min(max(fy, y), y + h - 1)
+            regions.append(((cx - fx) ** 2 + (cy - fy) ** 2, y, x, w, h))
+    regions.sort()
+    return [(x, y, w, h) for _, y, x, w, h in regions]
+
+
+def progressive_convert(image_path, tileset_path, width=120, height=168, tile_size=32,
+                        levels=(1, 8), region_size=16, focus=SPAWN_TILE, mean_only=True):
+    """
+    점진적 변환 패치 생성기
+
+    Args:
+        levels: 미리보기 단계별 칸당 픽셀 수 (BOX 축소). 마지막에는 항상 최종 단계가 이어진다.
+        mean_only: 최종 단계를 원본 적분 영상 칸 평균으로 (False면 tile_size 픽셀 LANCZOS 리사이즈)
+        region_size: 다듬기 구역 크기 (타일 단위)
+        focus: 먼저 다듬을 타일 좌표 (x, y), None이면 맵 중앙
+
+    Yields:
+        {"level", "x", "y", "w", "h", "data"} 패치.
+        첫 패치는 맵 전체, 이후 패치는 바뀐 칸이 있는 구역만.
+    """
+    tile_averages = tile_mean_colors(tileset_path, tile_size)
+    focus = focus or (width // 2, height // 2)
+
+    steps = [(k, Image.Resampling.BOX) for k in levels if k < tile_size]
+    # None = 리사이즈 없이 원본 해상도 칸 평균 (convert_world_map.py 기본 경로)
+    steps.append((None, None) if mean_only else (tile_size, Image.Resampling.LANCZOS))
+
+    current = None
+    for level, (k, resample) in enumerate(steps):
+        if k is None:
+            grid_means = image_grid_means(image_path, width, height)
+        else:
+            pixels = load_image_array(image_path, (width * k, height * k), resample)
+
+        def region_means(x, y, w, h):
+            if k is None:
+                return grid_means[y:y + h, x:x + w]
+            block = np.asarray(pixels[y * k:(y + h) * k, x * k:(x + w) * k], dtype=np.float64)
+            return block.reshape(h, k, w, k, 3).mean(axis=(1, 3))
+
+        if current is None:
+            # 첫 단계: 맵 전체를 한 번에
+            current = match_means(region_means(0, 0, width, height), tile_averages)
+            yield {"level": level, "x": 0, "y": 0, "w": width, "h": height, "data": current.tolist()}
+            continue
+
+        for x, y, w, h in region_order(width, height, region_size, focus):
+            refined = match_means(region_means(x, y, w, h), tile_averages)
+            if np.array_equal(refined, current[y:y + h, x:x + w]):
+                continue
+            current[y:y + h, x:x + w] = refined
+            yield {"level": level, "x": x, "y": y, "w": w, "h": h, "data": refined.tolist()}
+
+
+def apply_patch(map_data, patch):
+    """패치를 2차원 리스트 mapData에 적용"""
+    for dy, row in enumerate(patch["data"]):
+        map_data[patch["y"] + dy][patch["x"]:patch["x"] + patch["w"]] = row
+    return map_data
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='점진적 미리보기 맵 변환')
+    parser.add_argument('image')
+    parser.add_argument('tileset')
+    parser.add_argument('--out', default='default_map.json')
+    parser.add_argument('--patches', default=None, help='증분 패치 파일 (기본: <out>.patches.jsonl)')
+    parser.add_argument('--width', type=int, default=120)
+    parser.add_argument('--height', type=int, default=168)
+    parser.add_argument('--tile-size', type=int, default=32)
+    parser.add_argument('--region-size', type=int, default=16)
+    parser.add_argument('--focus', type=int, nargs=2, default=SPAWN_TILE, metavar=('X', 'Y'))
+    parser.add_argument('--lanczos', action='store_true',
+                        help='최종 단계를 LANCZOS 리사이즈로 (convert_world_map.py mean_only = False와 같은 결과)')
+    args = parser.parse_args()
+
+    patches_path = args.patches or f"{args.out}.patches.jsonl"
+    output = {
+        "width": args.width,
+        "height": args.height,
+        "tileSize": args.tile_size,
+        "mapData": None,
+        "collisionTiles": [80, 81, 82, 83, 192, 193, 194, 195],
+        "source": f"Progressive conversion of {args.image}"
+    }
+
+    with open(patches_path, 'w', encoding='utf-8') as patches:
+        for patch in progressive_convert(args.image, args.tileset, args.width, args.height,
+                                         args.tile_size, region_size=args.region_size,
+                                         focus=tuple(args.focus), mean_only=not args.lanczos):
+            patches.write(json.dumps(patch) + '\n')
+            patches.flush()  # 에디터가 바로 읽을 수 있도록
+
+            if output["mapData"] is None:
+                output["mapData"] = patch["data"]
+                # 미리보기 맵을 먼저 저장
+                with open(args.out, 'w') as f:
+                    json.dump(output, f, indent=2)
+                print(f"⚡ 미리보기 저장: {args.out}")
+            else:
+                apply_patch(output["mapData"], patch)
+                print(f"  🔍 단계 {patch['level']} 구역 ({patch['x']}, {patch['y']}) {patch['w']}x{patch['h']}")
+
+    with open(args.out, 'w') as f:
+        json.dump(output, f, indent=2)
+    print(f"\n✅ 변환 완료: {args.out}")
+    print(f"🧩 패치: {patches_path}")
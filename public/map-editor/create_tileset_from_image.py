@@ -9,7 +9,17 @@ import os
 import sys
 import math
 
-def create_tileset_and_map(image_path, tile_size=64, output_tileset='custom_tileset.png', output_map='custom_map.json'):
+import numpy as np
+
+# 저장소 루트의 공용 파이프라인 모듈 사용
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from tile_library import TileLibrary, attach_global_ids
+from tile_phash import cluster_tiles
+from tile_store import build_atlas, dedup_tiles, flatten_tiles, split_tiles
+
+def create_tileset_and_map(image_path, tile_size=64, output_tileset='custom_tileset.png', output_map='custom_map.json',
+                           near_duplicate_distance=None, max_tile_error=12.0, library_dir=None,
+                           progress=None):
     """
     이미지를 타일로 분할하여 타일셋과 맵 데이터 생성
     
@@ -18,6 +28,10 @@ def create_tileset_and_map(image_path, tile_size=64, output_tileset='custom_tile
         tile_size: 타일 크기 (기본 64x64)
         output_tileset: 출력 타일셋 이미지 파일명
         output_map: 출력 맵 JSON 파일명
+        near_duplicate_distance: 유사 타일 병합 pHash 해밍 거리 (None이면 완전히 같은 타일만 병합)
+        max_tile_error: 유사 타일 병합 시 허용할 최대 평균 픽셀 오차 (0~255, None이면 검사 안 함)
+        library_dir: 공유 타일 라이브러리 폴더 (지정하면 타일을 등록하고 맵에 전역 ID 테이블 기록)
+        progress: 진행 콜백 progress(완료 단계, 전체 단계) (선택)
     """
     
     # 이미지 열기
@@ -32,38 +46,21 @@ def create_tileset_and_map(image_path, tile_size=64, output_tileset='custom_tile
     
     print(f"📌 타일 개수: {tiles_x}x{tiles_y} = {tiles_x * tiles_y} 타일")
     
-    # 타일 추출 및 고유 타일 저장
-    tile_dict = {}  # 타일 데이터를 키로 사용하여 인덱스 저장
-    unique_tiles = []  # 고유한 타일 이미지 리스트
-    map_data = []  # 맵 데이터 (타일 인덱스)
-    
-    for y in range(tiles_y):
-        row = []
-        for x in range(tiles_x):
-            # 타일 추출
-            left = x * tile_size
-            top = y * tile_size
-            right = left + tile_size
-            bottom = top + tile_size
-            
-            tile = img.crop((left, top, right, bottom))
-            
-            # 타일을 바이트로 변환하여 고유성 확인
-            tile_bytes = tile.tobytes()
-            
-            if tile_bytes not in tile_dict:
-                # 새로운 고유 타일
-                tile_index = len(unique_tiles)
-                tile_dict[tile_bytes] = tile_index
-                unique_tiles.append(tile)
-                print(f"  새 타일 발견: 인덱스 {tile_index} (위치: {x}, {y})")
-            else:
-                tile_index = tile_dict[tile_bytes]
-            
-            row.append(tile_index)
-        
-        map_data.append(row)
-        print(f"✓ 진행: {y+1}/{tiles_y} 행 완료")
+    # 타일 분할 (reshape/transpose 뷰) 및 바이트 단위 중복 제거
+    tiles = flatten_tiles(split_tiles(np.asarray(img), tile_size))
+    unique_tiles, inverse = dedup_tiles(tiles)
+    
+    # 손실 중복 제거: JPEG 노이즈 수준의 차이는 같은 타일로 취급
+    if near_duplicate_distance is not None:
+        exact_count = len(unique_tiles)
+        representatives, labels = cluster_tiles(unique_tiles, near_duplicate_distance, max_tile_error)
+        unique_tiles = unique_tiles[representatives]
+        inverse = labels[inverse]
+        print(f"🧩 유사 타일 병합: {exact_count}개 → {len(unique_tiles)}개")
+    
+    map_data = inverse.reshape(tiles_y, tiles_x).tolist()
+    if progress:
+        progress(1, 3)
     
     print(f"\n📊 고유 타일 개수: {len(unique_tiles)}")
     
@@ -74,15 +71,12 @@ def create_tileset_and_map(image_path, tile_size=64, output_tileset='custom_tile
     tileset_width = tiles_per_row * tile_size
     tileset_height = tileset_rows * tile_size
     
-    tileset_image = Image.new('RGBA', (tileset_width, tileset_height), (0, 0, 0, 0))
-    
-    for idx, tile in enumerate(unique_tiles):
-        tile_x = (idx % tiles_per_row) * tile_size
-        tile_y = (idx // tiles_per_row) * tile_size
-        tileset_image.paste(tile, (tile_x, tile_y))
+    tileset_image = Image.fromarray(build_atlas(unique_tiles, tiles_per_row))
     
     # 타일셋 이미지 저장
     tileset_image.save(output_tileset, 'PNG')
+    if progress:
+        progress(2, 3)
     print(f"\n✅ 타일셋 이미지 생성: {output_tileset}")
     print(f"   크기: {tileset_width}x{tileset_height} ({tiles_per_row}x{tileset_rows} 타일)")
     
@@ -97,9 +91,19 @@ def create_tileset_and_map(image_path, tile_size=64, output_tileset='custom_tile
         "source": f"generated from {os.path.basename(image_path)}"
     }
     
+    # 공유 타일 라이브러리에 등록 (맵은 globalTileIds로 전역 타일 참조)
+    if library_dir:
+        library = TileLibrary(tile_size, library_dir)
+        attach_global_ids(map_json, library.register(unique_tiles), output_map, library_dir)
+        library.save()
+        print(f"📚 타일 라이브러리 등록: {library_dir} (전체 {len(library)}개)")
+    
     with open(output_map, 'w', encoding='utf-8') as f:
         json.dump(map_json, f, indent=2, ensure_ascii=False)
     
+    if progress:
+        progress(3, 3)
+    
     print(f"✅ 맵 데이터 생성: {output_map}")
     print(f"   맵 크기: {tiles_x}x{tiles_y}")
     print(f"   총 타일: {len(unique_tiles)}개의 고유 타일 사용")
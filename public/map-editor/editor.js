@@ -24,6 +24,9 @@ class MapEditor {
         this.isPainting = false;
         this.isPanning = false;
 
+        // Local conversion service (conversion_server.py)
+        this.conversionServer = 'http://127.0.0.1:8765';
+
         // Undo/Redo stacks
         this.undoStack = [];
         this.redoStack = [];
@@ -59,6 +62,19 @@ class MapEditor {
         this.showStatus('Ready to map collisions!');
     }
 
+    // Expand sparse maps (defaultTile + per-row runs [x, length, tile, ...]) to a 2D array
+    decodeMapData(data) {
+        if (!data.mapRuns) return data.mapData;
+        const fill = data.defaultTile || 0;
+        return data.mapRuns.map(runs => {
+            const row = Array(data.width).fill(fill);
+            for (let i = 0; i < runs.length; i += 3) {
+                row.fill(runs[i + 2], runs[i], runs[i] + runs[i + 1]);
+            }
+            return row;
+        });
+    }
+
     initializeMap() {
         this.map = [];
         for (let y = 0; y < this.mapHeight; y++) {
@@ -74,7 +90,7 @@ class MapEditor {
                 const data = await response.json();
                 this.mapWidth = data.width || (this.currentMapType === 'tavern' ? 40 : 120);
                 this.mapHeight = data.height || (this.currentMapType === 'tavern' ? 30 : 168);
-                this.map = data.mapData;
+                this.map = this.decodeMapData(data);
                 this.showStatus(`Loaded ${filename}`);
             } else {
                 throw new Error('File not found');
@@ -177,6 +193,19 @@ class MapEditor {
             };
         }
 
+        // Image Conversion Handler
+        const imageInput = document.getElementById('imageInput');
+        if (document.getElementById('convertImage') && imageInput) {
+            document.getElementById('convertImage').onclick = () => imageInput.click();
+            imageInput.onchange = (e) => {
+                const file = e.target.files[0];
+                if (!file) return;
+                const type = document.getElementById('convertType')?.value || 'extract_simple';
+                this.convertImage(file, type);
+                e.target.value = '';
+            };
+        }
+
         // Load Map Handler
         const fileInput = document.getElementById('fileInput');
         if (document.getElementById('loadMap')) {
@@ -191,8 +220,8 @@ class MapEditor {
             reader.onload = (event) => {
                 try {
                     const data = JSON.parse(event.target.result);
-                    if (data.mapData) {
-                        this.map = data.mapData;
+                    if (data.mapData || data.mapRuns) {
+                        this.map = this.decodeMapData(data);
                         this.mapWidth = data.width || this.map[0].length;
                         this.mapHeight = data.height || this.map.length;
                         // Update UI inputs
@@ -427,6 +456,76 @@ class MapEditor {
     saveMap() {
         this.exportForGame();
     }
+
+    applyPatch(patch) {
+        if (patch.level === 0) {
+            // Coarse preview covers the whole map
+            this.saveState();
+            this.map = patch.data.map(row => [...row]);
+            this.mapWidth = patch.w;
+            this.mapHeight = patch.h;
+            this.resizeCanvas();
+            this.updateUI();
+            return;
+        }
+        patch.data.forEach((row, dy) => {
+            this.map[patch.y + dy].splice(patch.x, patch.w, ...row);
+        });
+        this.render();
+    }
+
+    async convertImage(file, type) {
+        const imageData = await new Promise((resolve, reject) => {
+            const reader = new FileReader();
+            reader.onload = () => resolve(reader.result);
+            reader.onerror = reject;
+            reader.readAsDataURL(file);
+        });
+
+        let job;
+        try {
+            const response = await fetch(`${this.conversionServer}/jobs`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ type, imageData, tileSize: this.tileSize })
+            });
+            job = await response.json();
+            if (!response.ok) throw new Error(job.error || response.statusText);
+        } catch (err) {
+            this.showStatus(`Conversion failed: ${err.message} (is conversion_server.py running?)`, 'error');
+            return;
+        }
+
+        const events = new EventSource(`${this.conversionServer}${job.events}`);
+        events.onmessage = (e) => {
+            const event = JSON.parse(e.data);
+            if (event.patch) {
+                this.applyPatch(event.patch);
+                this.showStatus(`Refining ${file.name}... level ${event.patch.level} (${event.patch.x}, ${event.patch.y})`);
+            } else if (event.status === 'running' && event.total) {
+                this.showStatus(`Converting ${file.name}... ${event.done}/${event.total}`);
+            } else if (event.status === 'queued') {
+                this.showStatus(`Queued ${file.name}`);
+            } else if (event.status === 'done') {
+                events.close();
+                const data = event.result.map;
+                if (type !== 'progressive') this.saveState(); // progressive already saved on preview
+                this.map = data.mapData;
+                this.mapWidth = data.width;
+                this.mapHeight = data.height;
+                this.resizeCanvas();
+                this.updateUI();
+                this.showStatus(`Converted ${file.name} (${data.width}x${data.height})`);
+            } else if (event.status === 'error') {
+                events.close();
+                this.showStatus(`Conversion failed: ${event.error}`, 'error');
+            }
+        };
+        events.onerror = () => {
+            events.close();
+            this.showStatus('Lost connection to conversion server', 'error');
+        };
+    }
 }
 
 window.addEventListener('load', () => {
@@ -4,10 +4,16 @@
 """
 
 import json
+import os
 import random
 import sys
 
-def expand_map(input_json, output_json, target_width=40, target_height=40):
+# 저장소 루트의 공용 파이프라인 모듈 사용
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from map_stream import (TileHistogram, autotile_rows, collect, map_rows, map_tiles, pipe, progress_rows,
+                        repeat_rows, write_json_rows)
+
+def expand_map(input_json, output_json, target_width=40, target_height=40, autotile_rules=None, autotile_mode=4):
     """
     기존 맵을 더 큰 맵으로 확장
     
@@ -16,6 +22,43 @@ def expand_map(input_json, output_json, target_width=40, target_height=40):
         output_json: 출력 맵 JSON 파일
         target_width: 목표 맵 너비
         target_height: 목표 맵 높이
+        autotile_rules: 확장 후 지형 경계에 적용할 autotile 규칙 (None이면 적용 안 함)
+        autotile_mode: 오토타일 이웃 방향 수 (4 또는 8)
+    
+    Returns:
+        확장된 맵 (mapData 포함)
+    """
+    map_data = []
+    summary = expand_map_stream(input_json, output_json, target_width, target_height,
+                                autotile_rules, autotile_mode, into=map_data)
+    return {
+        "width": summary["width"],
+        "height": summary["height"],
+        "tileSize": summary["tileSize"],
+        "mapData": map_data,
+        "collisionTiles": summary["collisionTiles"],
+        "source": summary["source"]
+    }
+
+
+def expand_map_stream(input_json, output_json, target_width=40, target_height=40, autotile_rules=None,
+                      autotile_mode=4, into=None):
+    """
+    expand_map의 스트리밍 버전 (mapData를 메모리에 모으지 않고 파일에만 기록)
+    
+    원본 행 반복 → 변형 → 오토타일 → 통계 → 쓰기를 map_stream 파이프라인으로 한 번에 처리한다.
+    
+    Args:
+        input_json: 입력 맵 JSON 파일
+        output_json: 출력 맵 JSON 파일
+        target_width: 목표 맵 너비
+        target_height: 목표 맵 높이
+        autotile_rules: 확장 후 지형 경계에 적용할 autotile 규칙 (None이면 적용 안 함)
+        autotile_mode: 오토타일 이웃 방향 수 (4 또는 8)
+        into: 지정하면 생성한 행을 이 목록에도 모음
+    
+    Returns:
+        맵 헤더 + 타일 사용 횟수 (tileCounts)
     """
     
     # 원본 맵 로드
@@ -24,64 +67,48 @@ def expand_map(input_json, output_json, target_width=40, target_height=40):
     
     orig_width = original_map['width']
     orig_height = original_map['height']
-    orig_data = original_map['mapData']
+    orig_data = list(map_rows(original_map))
     
     print(f"📌 원본 맵 크기: {orig_width}x{orig_height}")
     print(f"📌 목표 맵 크기: {target_width}x{target_height}")
     
-    # 새 맵 데이터 생성
-    new_map_data = []
-    
-    for y in range(target_height):
-        row = []
-        for x in range(target_width):
-            # 원본 맵에서 타일 선택 (반복 패턴)
-            orig_x = x % orig_width
-            orig_y = y % orig_height
-            
-            tile = orig_data[orig_y][orig_x]
-            
-            # 약간의 변형 추가 (5% 확률로 주변 타일로 변경)
-            if random.random() < 0.05:
-                tile = add_variation(tile)
-            
-            row.append(tile)
-        
-        new_map_data.append(row)
-        if (y + 1) % 5 == 0:
-            print(f"✓ 진행: {y+1}/{target_height} 행 완료 ({int((y+1)/target_height*100)}%)")
-    
-    # 새 맵 JSON 생성
+    def vary(tile):
+        # 약간의 변형 추가 (5% 확률로 주변 타일로 변경)
+        if random.random() < 0.05:
+            return add_variation(tile)
+        return tile
+    
+    def report(done, total):
+        print(f"✓ 진행: {done}/{total} 행 완료 ({int(done/total*100)}%)")
+    
+    # 패턴 복제 → 변형 → (오토타일) → 통계 → 쓰기를 행 단위로 한 번에 처리
+    stages = [map_tiles(vary)]
+    if autotile_rules:
+        # 패턴 복제/변형으로 생긴 지형 경계를 전환 타일로 교체
+        stages.append(autotile_rows(autotile_rules, autotile_mode))
+        print(f"🧩 오토타일 적용 ({autotile_mode}방향)")
+    histogram = TileHistogram()
+    stages += [histogram, progress_rows(target_height, report, every=5)]
+    if into is not None:
+        stages.append(collect(into))
+    
     new_map = {
         "width": target_width,
         "height": target_height,
         "tileSize": original_map.get('tileSize', 64),
-        "mapData": new_map_data,
         "collisionTiles": original_map.get('collisionTiles', [80, 81, 82, 83, 192, 193, 194, 195]),
         "source": f"expanded from {input_json}"
     }
-    
-    # JSON 파일 저장
-    with open(output_json, 'w', encoding='utf-8') as f:
-        json.dump(new_map, f, indent=2, ensure_ascii=False)
+    rows = pipe(repeat_rows(orig_data, target_width, target_height), *stages)
+    write_json_rows(rows, output_json, new_map)
     
     print(f"\n✅ 확장된 맵 생성 완료: {output_json}")
     print(f"   맵 크기: {target_width}x{target_height}")
     print(f"   총 타일: {target_width * target_height}")
     
-    # 타일 통계
-    tile_counts = {}
-    for row in new_map_data:
-        for tile in row:
-            tile_counts[tile] = tile_counts.get(tile, 0) + 1
-    
-    print(f"\n📊 타일 사용 통계:")
-    for tile_idx in sorted(tile_counts.keys()):
-        count = tile_counts[tile_idx]
-        percentage = (count / (target_width * target_height)) * 100
-        print(f"   타일 {tile_idx:3d}: {count:5d}개 ({percentage:5.1f}%)")
+    histogram.report()
     
-    return new_map
+    return dict(new_map, tileCounts=dict(histogram.counts))
 
 
 def add_variation(tile):
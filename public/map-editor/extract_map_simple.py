@@ -4,24 +4,16 @@
 """
 
 from PIL import Image
-import json
 import os
 import sys
 
-def get_dominant_color(tile):
-    """타일의 지배적인 색상 반환"""
-    pixels = list(tile.getdata())
-    
-    if not pixels:
-        return (0, 0, 0)
-    
-    # RGB 평균
-    avg_r = sum(p[0] if isinstance(p, tuple) else p for p in pixels) / len(pixels)
-    avg_g = sum(p[1] if isinstance(p, tuple) else 0 for p in pixels) / len(pixels)
-    avg_b = sum(p[2] if isinstance(p, tuple) else 0 for p in pixels) / len(pixels)
-    
-    return (int(avg_r), int(avg_g), int(avg_b))
+import numpy as np
 
+# 저장소 루트의 공용 파이프라인 모듈 사용
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from biome_kmeans import BiomeClassifier, block_means
+from map_stream import TileHistogram, collect, pipe, write_json_rows
+from row_bands import iter_row_bands
 
 def color_to_tile_index(r, g, b):
     """
@@ -89,9 +81,33 @@ def color_to_tile_index(r, g, b):
         return 1
 
 
-def extract_map_simple(image_path, tile_size=64, output_json='large_world_map.json'):
+def classify_tile_rows(pixels, y0, y1, tile_size, tiles_x):
+    """타일 행 y0..y1-1의 평균 색상 → color_to_tile_index (row_bands 워커 작업)"""
+    rows = []
+    for y in range(y0, y1):
+        row = []
+        for x in range(tiles_x):
+            # 현재 타일 영역의 RGB 평균 (block_means와 같은 칸 평균, 정수 합으로 구해 소수점 버림)
+            block = pixels[y * tile_size:(y + 1) * tile_size, x * tile_size:(x + 1) * tile_size]
+            sums = block.reshape(-1, block.shape[-1]).sum(axis=0, dtype=np.int64)
+            r, g, b = (int(v / (tile_size * tile_size)) for v in sums[:3])
+            
+            # 색상을 타일 인덱스로 변환
+            row.append(color_to_tile_index(r, g, b))
+        rows.append(row)
+    return rows
+
+
+def extract_map_simple(image_path, tile_size=64, output_json='large_world_map.json', progress=None,
+                       classifier=None, workers=None):
     """
     이미지를 색상 기반으로 빠르게 분석하여 맵 데이터 생성
+    
+    Args:
+        progress: 진행 콜백 progress(완료 행 수, 전체 행 수) (선택)
+        classifier: biome_kmeans로 학습한 중심값 파일 경로 또는 BiomeClassifier (선택).
+                    지정하면 임계값 대신 가장 가까운 군집 중심의 타일을 사용
+        workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 순차 실행)
     """
     
     # 이미지 열기
@@ -106,60 +122,47 @@ def extract_map_simple(image_path, tile_size=64, output_json='large_world_map.js
     
     print(f"📌 타일 개수: {tiles_x}x{tiles_y} = {tiles_x * tiles_y} 타일")
     
-    # 맵 데이터 생성
-    map_data = []
-    
-    for y in range(tiles_y):
-        row = []
-        for x in range(tiles_x):
-            # 현재 타일 영역 추출
-            left = x * tile_size
-            top = y * tile_size
-            right = left + tile_size
-            bottom = top + tile_size
-            
-            current_tile = img.crop((left, top, right, bottom))
-            
-            # 지배적 색상 추출
-            r, g, b = get_dominant_color(current_tile)
-            
-            # 색상을 타일 인덱스로 변환
-            tile_index = color_to_tile_index(r, g, b)
-            
-            row.append(tile_index)
-            
-        map_data.append(row)
-        print(f"✓ 진행: {y+1}/{tiles_y} 행 완료 ({int((y+1)/tiles_y*100)}%)")
+    # 맵 데이터 생성 (분류 → 통계 → 쓰기를 행 단위로 한 번에 처리)
+    source = "color-based mapping"
+    
+    if classifier is not None:
+        if isinstance(classifier, str):
+            classifier = BiomeClassifier.load(classifier)
+        colors, _ = block_means(np.asarray(img), tile_size)
+        rows = iter(classifier.classify(colors).reshape(tiles_y, tiles_x).tolist())
+        source = "k-means biome classifier"
+        print(f"✓ 군집 중심 {len(classifier.centroids)}개로 분류 완료")
+        if progress:
+            progress(tiles_y, tiles_y)
+    else:
+        def report(done, total):
+            print(f"✓ 진행: {done}/{total} 행 완료 ({int(done/total*100)}%)")
+            if progress:
+                progress(done, total)
+        
+        # 타일 행 묶음을 여러 프로세스에서 처리하고 끝난 행부터 바로 다음 단계로
+        rows = iter_row_bands(np.asarray(img), tiles_y, classify_tile_rows, (tile_size, tiles_x),
+                              workers=workers, progress=report)
     
-    # JSON 데이터 생성
     output_data = {
         "width": tiles_x,
         "height": tiles_y,
         "tileSize": tile_size,
-        "mapData": map_data,
         "collisionTiles": [80, 81, 82, 83, 192, 193, 194, 195],
-        "source": "extracted from uploaded image (color-based mapping)"
+        "source": f"extracted from uploaded image ({source})"
     }
     
-    # JSON 파일 저장
-    with open(output_json, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    # 호출하는 쪽(conversion_server 등)이 결과 맵을 쓰므로 행은 모아 둠
+    map_data = []
+    histogram = TileHistogram()
+    write_json_rows(pipe(rows, histogram, collect(map_data)), output_json, output_data)
+    output_data["mapData"] = map_data
     
     print(f"\n✅ 맵 데이터 생성 완료: {output_json}")
     print(f"   맵 크기: {tiles_x}x{tiles_y}")
     print(f"   총 타일: {tiles_x * tiles_y}")
     
-    # 맵 데이터 미리보기
-    print(f"\n📊 타일 사용 통계:")
-    tile_counts = {}
-    for row in map_data:
-        for tile in row:
-            tile_counts[tile] = tile_counts.get(tile, 0) + 1
-    
-    for tile_idx in sorted(tile_counts.keys()):
-        count = tile_counts[tile_idx]
-        percentage = (count / (tiles_x * tiles_y)) * 100
-        print(f"   타일 {tile_idx:3d}: {count:4d}개 ({percentage:5.1f}%)")
+    histogram.report(width=4)
     
     return output_data
 
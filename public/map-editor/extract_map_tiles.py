@@ -4,11 +4,36 @@
 """
 
 from PIL import Image
+from functools import lru_cache
 import json
 import os
 import sys
 
-def extract_map_from_image(image_path, tile_size=64, output_json='extracted_map.json'):
+import numpy as np
+
+# 저장소 루트의 공용 파이프라인 모듈 사용
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from row_bands import map_row_bands
+from tile_match_cache import TileMatchCache, tileset_namespace
+
+@lru_cache(maxsize=8)
+def load_tileset_tiles(tileset_path, tile_size, mtime):
+    """
+    타일셋의 모든 타일 잘라두기 (같은 파일/크기/수정시각이면 프로세스 안에서 재사용)
+    """
+    tileset = Image.open(tileset_path)
+    tileset.load()
+    tile_cache = {}
+    for idx in range(256):  # 16x16 타일셋
+        tx = (idx % 16) * tile_size
+        ty = (idx // 16) * tile_size
+        tile_cache[idx] = tileset.crop((tx, ty, tx + tile_size, ty + tile_size))
+    return tileset, tile_cache
+
+
+def extract_map_from_image(image_path, tile_size=64, output_json='extracted_map.json',
+                           cache_path='tile_match_cache.json', quantize_bits=0,
+                           match_cache=None, progress=None, workers=None):
     """
     이미지를 타일 단위로 분석하여 맵 데이터 생성
     
@@ -16,6 +41,11 @@ def extract_map_from_image(image_path, tile_size=64, output_json='extracted_map.
         image_path: 입력 이미지 경로
         tile_size: 타일 크기 (기본 64x64)
         output_json: 출력 JSON 파일명
+        cache_path: 매칭 캐시 저장 경로 (None이면 메모리에만 유지)
+        quantize_bits: 캐시 키 계산 전 버릴 하위 비트 수 (0 = 정확히 같은 블록만)
+        match_cache: 이미 만들어 둔 TileMatchCache (상주 서비스용, 지정 시 cache_path 무시)
+        progress: 진행 콜백 progress(완료 행 수, 전체 행 수) (선택)
+        workers: 매칭 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 순차 실행)
     """
     
     # 이미지 열기
@@ -36,49 +66,54 @@ def extract_map_from_image(image_path, tile_size=64, output_json='extracted_map.
     tile_cache = {}
     
     if os.path.exists(tileset_path):
-        tileset = Image.open(tileset_path)
+        # 타일셋의 모든 타일 캐시
+        tileset, tile_cache = load_tileset_tiles(tileset_path, tile_size, os.path.getmtime(tileset_path))
         tileset_width = tileset.width // tile_size
         print(f"📌 타일셋 로드: {tileset.width}x{tileset.height}, {tileset_width}개/행")
-        
-        # 타일셋의 모든 타일 캐시
-        for idx in range(256):  # 16x16 타일셋
-            tx = (idx % 16) * tile_size
-            ty = (idx // 16) * tile_size
-            tile_img = tileset.crop((tx, ty, tx + tile_size, ty + tile_size))
-            tile_cache[idx] = tile_img
     
-    # 맵 데이터 생성
-    map_data = []
+    # 동일 블록은 한 번만 매칭
+    if match_cache is None:
+        if tileset and tile_cache:
+            namespace = tileset_namespace(tileset_path, tile_size, 'compare_tiles')
+        else:
+            namespace = 'estimate_tile_from_color'
+        match_cache = TileMatchCache(namespace=namespace, quantize_bits=quantize_bits,
+                                     cache_path=cache_path)
     
+    # 캐시에 있는 블록은 미리 채우고 (-1 = 아직 모름) 나머지만 워커에서 매칭
+    pixels = np.asarray(img if img.mode in ('RGB', 'RGBA', 'L') else img.convert('RGB'))
+    keys = []
+    known = []
     for y in range(tiles_y):
-        row = []
+        key_row = []
+        known_row = []
         for x in range(tiles_x):
-            # 현재 타일 영역 추출
-            left = x * tile_size
-            top = y * tile_size
-            right = left + tile_size
-            bottom = top + tile_size
-            
-            current_tile = img.crop((left, top, right, bottom))
-            
-            # 타일셋과 비교하여 가장 유사한 타일 찾기
-            best_match = 0
-            best_similarity = -1
-            
-            if tileset and tile_cache:
-                for tile_idx, cached_tile in tile_cache.items():
-                    similarity = compare_tiles(current_tile, cached_tile)
-                    if similarity > best_similarity:
-                        best_similarity = similarity
-                        best_match = tile_idx
-            else:
-                # 타일셋이 없으면 색상 기반으로 추정
-                best_match = estimate_tile_from_color(current_tile)
-            
-            row.append(best_match)
-            
-        map_data.append(row)
-        print(f"진행: {y+1}/{tiles_y} 행 완료")
+            block = pixels[y * tile_size:(y + 1) * tile_size, x * tile_size:(x + 1) * tile_size]
+            cache_key = match_cache.block_key(block)
+            cached = match_cache.get(cache_key)
+            key_row.append(cache_key)
+            known_row.append(-1 if cached is None else cached)
+        keys.append(key_row)
+        known.append(known_row)
+    
+    def report(done, total):
+        print(f"진행: {done}/{total} 행 완료")
+        if progress:
+            progress(done, total)
+    
+    # 맵 데이터 생성 (타일 행 묶음을 여러 프로세스에서 처리)
+    match_tileset = os.path.abspath(tileset_path) if (tileset and tile_cache) else None
+    map_data = map_row_bands(pixels, tiles_y, match_tile_rows,
+                             (tile_size, tiles_x, match_tileset, known, quantize_bits),
+                             workers=workers, progress=report)
+    
+    for y in range(tiles_y):
+        for x in range(tiles_x):
+            if known[y][x] < 0:
+                match_cache.put(keys[y][x], map_data[y][x])
+    
+    match_cache.save()
+    print(f"🧠 {match_cache.stats()}")
     
     # JSON 데이터 생성
     output_data = {
@@ -101,6 +136,47 @@ def extract_map_from_image(image_path, tile_size=64, output_json='extracted_map.
     return output_data
 
 
+def match_tile_rows(pixels, y0, y1, tile_size, tiles_x, tileset_path, known, quantize_bits=0):
+    """
+    타일 행 y0..y1-1 매칭 (row_bands 워커 작업)
+    
+    known[y][x]가 0 이상이면 캐시된 결과를 그대로 쓰고, 나머지 블록은
+    타일셋 비교(tileset_path가 없으면 색상 추정)로 찾는다. 같은 묶음 안의 같은 블록은 한 번만 계산한다.
+    """
+    tile_cache = {}
+    if tileset_path:
+        _, tile_cache = load_tileset_tiles(tileset_path, tile_size, os.path.getmtime(tileset_path))
+    
+    def find_best(block):
+        current_tile = Image.fromarray(block)
+        if not tile_cache:
+            # 타일셋이 없으면 색상 기반으로 추정
+            return estimate_tile_from_color(current_tile)
+        
+        # 타일셋과 비교하여 가장 유사한 타일 찾기
+        best_match = 0
+        best_similarity = -1
+        for tile_idx, cached_tile in tile_cache.items():
+            similarity = compare_tiles(current_tile, cached_tile)
+            if similarity > best_similarity:
+                best_similarity = similarity
+                best_match = tile_idx
+        return best_match
+    
+    local_cache = TileMatchCache(quantize_bits=quantize_bits)
+    rows = []
+    for y in range(y0, y1):
+        row = []
+        for x in range(tiles_x):
+            if known[y][x] >= 0:
+                row.append(known[y][x])
+                continue
+            block = pixels[y * tile_size:(y + 1) * tile_size, x * tile_size:(x + 1) * tile_size]
+            row.append(local_cache.match(block, find_best))
+        rows.append(row)
+    return rows
+
+
 def compare_tiles(tile1, tile2):
     """
     두 타일의 유사도 계산 (0.0 ~ 1.0) - 최적화 버전
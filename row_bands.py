@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+타일 행 묶음(row band) 병렬 실행기
+
+타일 행마다 독립적인 변환 루프(extract_map_tiles, extract_map_simple 등)를
+여러 프로세스로 나눠 실행한다. 이미지 픽셀은 작업마다 피클링하지 않고
+multiprocessing.shared_memory에 한 번 올려 워커가 그대로 읽는다.
+결과는 행 순서대로 합치므로 워커 수와 상관없이 항상 같은 결과가 나온다.
+
+작업 함수 형식 (모듈 최상위 함수여야 함):
+    func(pixels, y0, y1, *args) → 타일 행 y0..y1-1의 결과 목록 (행마다 하나)
+    pixels는 전체 이미지 배열 (읽기 전용으로 사용)
+"""
+
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+_shared = {}  # 워커 프로세스 안의 공유 배열 (이름 → (SharedMemory, ndarray))
+
+
+def _attach(name, shape, dtype):
+    """워커 초기화: 공유 메모리를 배열로 연결"""
+    shm = shared_memory.SharedMemory(name=name)
+    _shared['pixels'] = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+
+
+def _run_band(task):
+    index, func, y0, y1, args = task
+    return index, func(_shared['pixels'][1], y0, y1, *args)
+
+
+def default_workers():
+    """사용 가능한 CPU 수 (컨테이너 CPU 제한 반영)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS
+        return os.cpu_count() or 1
+
+
+def row_bands(rows, workers, band_rows=None):
+    """[(y0, y1), ...] 행 묶음 (워커당 약 4개 묶음으로 나눠 부하 균형)"""
+    band_rows = band_rows or max(1, -(-rows // (workers * 4)))
+    return [(y0, min(y0 + band_rows, rows)) for y0 in range(0, rows, band_rows)]
+
+
+def iter_row_bands(pixels, rows, func, args=(), workers=None, band_rows=None, progress=None):
+    """
+    타일 행 0..rows-1을 묶음으로 나눠 func 실행 후 결과를 행 순서대로 하나씩 내보냄
+
+    앞 묶음이 끝나는 대로 바로 내보내므로 뒤쪽 처리와 소비(쓰기/통계)가 겹친다.
+    인자는 map_row_bands와 같다.
+    """
+    workers = default_workers() if workers is None else workers
+    workers = min(workers, rows)
+
+    if workers <= 1:
+        for y0, y1 in row_bands(rows, 1, band_rows or 1):
+            yield from func(pixels, y0, y1, *args)
+            if progress:
+                progress(y1, rows)
+        return
+
+    pixels = np.ascontiguousarray(pixels)
+    bands = row_bands(rows, workers, band_rows)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, pixels.nbytes))
+    try:
+        np.ndarray(pixels.shape, dtype=pixels.dtype, buffer=shm.buf)[...] = pixels
+        ctx = mp.get_context()
+        with ctx.Pool(workers, initializer=_attach, initargs=(shm.name, pixels.shape, pixels.dtype.str)) as pool:
+            tasks = [(i, func, y0, y1, args) for i, (y0, y1) in enumerate(bands)]
+            # imap은 제출 순서대로 결과를 돌려주므로 그대로 내보내면 행 순서가 유지됨
+            for index, band_result in pool.imap(_run_band, tasks):
+                yield from band_result
+                if progress:
+                    progress(bands[index][1], rows)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def map_row_bands(pixels, rows, func, args=(), workers=None, band_rows=None, progress=None):
+    """
+    타일 행 0..rows-1을 묶음으로 나눠 func 실행 후 행 순서대로 결과 합치기
+
+    Args:
+        pixels: (H, W, C) 이미지 배열 (공유 메모리로 복사됨)
+        rows: 타일 행 수
+        func: 모듈 최상위 작업 함수 func(pixels, y0, y1, *args) → 행별 결과 목록
+        args: func에 넘길 추가 인자 (피클링 가능해야 함)
+        workers: 프로세스 수 (None이면 CPU 수, 1 이하이면 현재 프로세스에서 순차 실행)
+        progress: 진행 콜백 progress(완료 행 수, 전체 행 수) (선택)
+
+    Returns:
+        길이 rows의 행별 결과 목록
+    """
+    return list(iter_row_bands(pixels, rows, func, args, workers, band_rows, progress))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+씬별 자산 묶음 파일 (오프셋 색인 헤더)
+
+main.js는 씬에 들어갈 때 맵 JSON, 타일셋, 포탈 스프라이트시트, 캐릭터 이미지, 주점 프레임 등을
+파일마다 따로 요청한다. 씬에 필요한 자산을 파일 하나로 묶어 첫 로드를 씬당 요청 한 번으로 줄인다.
+
+파일 구조 (리틀 엔디언):
+    0   매직 b'RBWB'
+    4   버전 u32
+    8   헤더 JSON 길이 u32
+    12  예약 u32 (0)
+    16  헤더 JSON (UTF-8)
+    ... 자산 데이터 (각 자산 시작 위치는 align 바이트 배수)
+
+헤더 JSON:
+    {"scene", "align", "prefetch": [다음에 미리 받을 씬, ...],
+     "assets": [{"name": "/assets/New_Tileset.png", "offset", "length", "type"}, ...]}
+    offset은 파일 시작 기준이므로 브라우저는 new Uint8Array(buffer, offset, length)로 복사 없이 잘라 쓴다.
+
+사용 예:
+    python scene_bundle.py dist --out-dir dist/bundles
+    python scene_bundle.py --list dist/bundles/GameScene.bundle
+"""
+
+import argparse
+import glob
+import json
+import mimetypes
+import os
+import struct
+
+MAGIC = b'RBWB'
+VERSION = 1
+PREAMBLE = struct.Struct('<4sIII')
+DEFAULT_ALIGN = 16
+
+CHARACTER_SPRITES = [f'/assets/Character0{i}.png' for i in range(1, 9)]
+
+# 씬별 자산 (사이트 루트 기준 경로, glob 가능) + 씬 시작 뒤 백그라운드로 미리 받을 씬
+# 첫 화면(StartScene) 묶음은 작게 두고, 게임/선술집 묶음은 앞 씬이 뜬 뒤 미리 받는다.
+SCENES = {
+    'StartScene': {
+        'assets': [
+            '/assets/Background_intro.jpeg',
+            *CHARACTER_SPRITES,
+            '/assets/audio/lobby.mp3',
+            '/assets/audio/bgm.mp3',
+        ],
+        'prefetch': ['GameScene'],
+    },
+    'GameScene': {
+        'assets': [
+            '/assets/New_Tileset.png',
+            '/assets/Re-Be_World.jpeg',
+            '/assets/new_portal_spritesheet.png',
+            '/default_map.json',
+            '/assets/chunks/default_map.chunks.json',
+            '/assets/chunks/*.png',
+            '/assets/chunks/*.webp',
+        ],
+        'prefetch': ['TavernScene'],
+    },
+    'TavernScene': {
+        # 프레임 이미지 대신 bake_tavern_animation.py 타일셋 + 애니메이션 표
+        'assets': [
+            '/assets/tavern_tileset.jpg',
+            '/tavern_map.json',
+            '/assets/audio/pub.mp3',
+        ],
+        'prefetch': [],
+    },
+}
+
+
+def align_up(value, align):
+    return -(-value // align) * align
+
+
+def content_type(name):
+    if name.endswith('.json'):
+        return 'application/json'
+    return mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+
+def resolve_assets(root, patterns):
+    """씬 자산 패턴 → [(이름, 파일 경로)] (없는 파일은 건너뜀), 누락 목록"""
+    found, missing, seen = [], [], set()
+    for pattern in patterns:
+        paths = sorted(glob.glob(os.path.join(root, pattern.lstrip('/'))))
+        if not paths and not glob.has_magic(pattern):
+            missing.append(pattern)
+        for path in paths:
+            name = '/' + os.path.relpath(path, root).replace(os.sep, '/')
+            if os.path.isfile(path) and name not in seen:
+                seen.add(name)
+                found.append((name, path))
+    return found, missing
+
+
+def layout(scene, entries, prefetch, align):
+    """
+    헤더 JSON 바이트와 자산 오프셋 계산
+
+    헤더 길이가 오프셋 자릿수에 따라 달라지므로 데이터 시작 위치가 더 이상 바뀌지 않을 때까지 반복한다.
+    """
+    data_start = align_up(PREAMBLE.size, align)
+    while True:
+        offset = data_start
+        assets = []
+        for name, length in entries:
+            assets.append({"name": name, "offset": offset, "length": length, "type": content_type(name)})
+            offset = align_up(offset + length, align)
+        header = json.dumps({"scene": scene, "align": align, "prefetch": prefetch, "assets": assets},
+                            ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        needed = align_up(PREAMBLE.size + len(header), align)
+        if needed <= data_start:
+            return header, assets
+        data_start = needed
+
+
+def write_bundle(out_path, scene, files, prefetch=(), align=DEFAULT_ALIGN):
+    """
+    묶음 파일 쓰기
+
+    Args:
+        files: [(이름, 파일 경로), ...]
+    Returns:
+        헤더 dict
+    """
+    entries = [(name, os.path.getsize(path)) for name, path in files]
+    header, assets = layout(scene, entries, list(prefetch), align)
+
+    with open(out_path, 'wb') as out:
+        out.write(PREAMBLE.pack(MAGIC, VERSION, len(header), 0))
+        out.write(header)
+        for (name, path), asset in zip(files, assets):
+            out.write(b'\0' * (asset["offset"] - out.tell()))
+            with open(path, 'rb') as f:
+                data = f.read()
+            if len(data) != asset["length"]:
+                raise RuntimeError(f"{name} 크기가 묶는 중에 바뀌었습니다")
+            out.write(data)
+    return {"scene": scene, "align": align, "prefetch": list(prefetch), "assets": assets}
+
+
+def read_header(path):
+    """묶음 파일 헤더 dict"""
+    with open(path, 'rb') as f:
+        magic, version, header_length, _ = PREAMBLE.unpack(f.read(PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path}: 묶음 파일이 아닙니다")
+        if version != VERSION:
+            raise ValueError(f"{path}: 지원하지 않는 버전 {version}")
+        return json.loads(f.read(header_length).decode('utf-8'))
+
+
+def read_asset(path, name):
+    """묶음 파일에서 자산 하나의 바이트"""
+    for asset in read_header(path)["assets"]:
+        if asset["name"] == name:
+            with open(path, 'rb') as f:
+                f.seek(asset["offset"])
+                return f.read(asset["length"])
+    raise KeyError(name)
+
+
+def build_bundles(root, out_dir, scenes=None, align=DEFAULT_ALIGN):
+    """씬마다 <씬>.bundle 생성 → {씬: (헤더, 누락 목록)}"""
+    os.makedirs(out_dir, exist_ok=True)
+    results = {}
+    for scene, spec in (scenes or SCENES).items():
+        files, missing = resolve_assets(root, spec['assets'])
+        header = write_bundle(os.path.join(out_dir, f"{scene}.bundle"), scene, files, spec['prefetch'], align)
+        results[scene] = (header, missing)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='씬별 자산 묶음 파일 생성')
+    parser.add_argument('root', nargs='?', default='dist', help='사이트 루트 (dist 또는 public)')
+    parser.add_argument('--out-dir', default=None, help='기본값: <root>/bundles')
+    parser.add_argument('--align', type=int, default=DEFAULT_ALIGN, help='자산 시작 위치 정렬 (바이트)')
+    parser.add_argument('--list', metavar='BUNDLE', default=None, help='묶음 파일 색인 출력')
+    args = parser.parse_args()
+
+    if args.list:
+        header = read_header(args.list)
+        print(f"📦 {header['scene']} (align {header['align']}, prefetch {header['prefetch']})")
+        for asset in header["assets"]:
+            print(f"   {asset['offset']:>10} {asset['length']:>10}  {asset['type']:<18} {asset['name']}")
+    else:
+        out_dir = args.out_dir or os.path.join(args.root, 'bundles')
+        for scene, (header, missing) in build_bundles(args.root, out_dir, align=args.align).items():
+            path = os.path.join(out_dir, f"{scene}.bundle")
+            print(f"📦 {scene}: 자산 {len(header['assets'])}개, {os.path.getsize(path) / 2 ** 20:.2f} MB → {path}")
+            for name in missing:
+                print(f"   ⚠️ 없음: {name}")
+        print("✅ 묶음 생성 완료 (asset_manifest.py를 이어서 실행하면 해시 이름이 붙습니다)")
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+gameserver.js 부하 테스트 (Socket.IO 가상 클라이언트)
+
+asyncio로 수백~수천 개의 가상 클라이언트를 띄워 join → 이동(스크립트/재생) → 캐릭터 변경/채팅을 보내고,
+서버가 다른 클라이언트에게 다시 보내는 playerMoved를 받아 다음을 측정한다.
+    - 이동 브로드캐스트 종단 간 지연 (p50/p90/p99/최대)
+    - 초당 송신/수신 메시지 수
+    - 서버 프로세스 CPU 사용률 / 메모리 (/proc, psutil이 있으면 psutil)
+
+이동 메시지마다 (보낸 소켓 id, x, y)가 겹치지 않게 만들어
+수신 측에서 playerMoved의 (id, x, y)로 송신 시각을 찾는다.
+
+필요 패키지: python-socketio, aiohttp (선택: psutil)
+
+사용 예:
+    node gameserver.js &
+    python socketio_load_test.py --clients 500 --rate 10 --duration 60 --ramp 10
+    python socketio_load_test.py --clients 200 --replay movement.jsonl --server-pid 12345
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+try:
+    import socketio
+except ImportError:  # 선택 의존성: 실행 시에만 필요
+    socketio = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+SPAWN = (8 * 32 + 16, 58 * 32 + 16)  # gameserver.js 기본 스폰 위치
+TILE = 32
+MAX_SAMPLES = 200000  # 지연 시간 표본 최대 개수 (저수지 샘플링)
+PENDING_TTL = 10.0  # 이 시간(초)이 지나도록 수신되지 않은 송신 기록은 정리
+
+
+class LoadStats:
+    """송수신 카운터 + 지연 시간 표본"""
+
+    def __init__(self):
+        self.sent = {}  # (소켓 id, x, y) → 송신 시각
+        self.samples = []
+        self.seen = 0
+        self.moves_sent = 0
+        self.moves_received = 0
+        self.other_sent = 0
+        self.other_received = 0
+        self.connect_errors = 0
+        self.connected = 0
+
+    def record_send(self, sid, x, y):
+        self.sent[(sid, x, y)] = time.perf_counter()
+        self.moves_sent += 1
+
+    def record_move(self, data):
+        self.moves_received += 1
+        sent_at = self.sent.get((data.get('id'), data.get('x'), data.get('y')))
+        if sent_at is None:
+            return
+        latency = time.perf_counter() - sent_at
+        self.seen += 1
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(latency)
+        else:
+            i = random.randrange(self.seen)
+            if i < MAX_SAMPLES:
+                self.samples[i] = latency
+
+    def prune(self):
+        cutoff = time.perf_counter() - PENDING_TTL
+        stale = [k for k, t in self.sent.items() if t < cutoff]
+        for k in stale:
+            del self.sent[k]
+
+    def percentiles(self, qs=(0.5, 0.9, 0.99)):
+        if not self.samples:
+            return {}
+        ordered = sorted(self.samples)
+        result = {f"p{int(q * 100)}": ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in qs}
+        result["max"] = ordered[-1]
+        return result
+
+
+class ServerMonitor:
+    """서버 프로세스 CPU/메모리 측정 (psutil 또는 /proc)"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.process = psutil.Process(pid) if (psutil and pid) else None
+        self.samples = []
+        self.rss = 0
+        self._last = None
+
+    def _cpu_seconds(self):
+        if self.process:
+            t = self.process.cpu_times()
+            return t.user + t.system
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+    def _rss_bytes(self):
+        if self.process:
+            return self.process.memory_info().rss
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    def sample(self):
+        if not self.pid:
+            return
+        try:
+            now = (time.perf_counter(), self._cpu_seconds())
+            self.rss = max(self.rss, self._rss_bytes())
+        except (OSError, IndexError, ValueError):
+            return
+        if self._last:
+            wall = now[0] - self._last[0]
+            if wall > 0:
+                self.samples.append((now[1] - self._last[1]) / wall * 100)
+        self._last = now
+
+
+def find_server_pid(script='gameserver.js'):
+    """/proc에서 node gameserver.js 프로세스 찾기"""
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/cmdline", 'rb') as f:
+                cmdline = f.read().split(b'\0')
+        except OSError:
+            continue
+        if any(arg.endswith(script.encode()) for arg in cmdline) and b'node' in cmdline[0]:
+            return int(entry)
+    return None
+
+
+def load_replay(path):
+    """이동 재생 파일 (JSON lines: {"x", "y", "animation"?, "scene"?}) → 목록"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def scripted_path(index):
+    """재생 파일이 없을 때: 스폰 주변 랜덤 워크"""
+    rng = random.Random(index)
+    x, y = SPAWN
+    while True:
+        dx, dy, animation = rng.choice([(1, 0, 'right'), (-1, 0, 'left'), (0, 1, 'down'), (0, -1, 'up')])
+        for _ in range(rng.randint(4, 20)):
+            x = min(max(x + dx * 4, TILE), 119 * TILE)
+            y = min(max(y + dy * 4, TILE), 167 * TILE)
+            yield {"x": x, "y": y, "animation": animation}
+
+
+async def run_client(index, args, stats, replay, stop):
+    client = socketio.AsyncClient(reconnection=False)
+    client.on('playerMoved', stats.record_move)
+
+    @client.on('*')
+    async def other(event, *data):
+        stats.other_received += 1
+
+    try:
+        await client.connect(args.url, transports=['websocket'])
+    except Exception:
+        stats.connect_errors += 1
+        return
+    stats.connected += 1
+
+    rng = random.Random(index)
+    steps = iter(replay[index % len(replay):] + replay[:index % len(replay)]) if replay else scripted_path(index)
+    interval = 1.0 / args.rate
+    sid = client.get_sid()  # 서버의 socket.id (네임스페이스 id, playerMoved의 id와 같음)
+    seq = 0
+    try:
+        await client.emit('join', {"nickname": f"load{index}"})
+        stats.other_sent += 1
+        await asyncio.sleep(rng.random() * interval)  # 클라이언트 간 송신 시점 분산
+
+        next_send = time.perf_counter()
+        while not stop.is_set():
+            step = next(steps, None)
+            if step is None:  # 재생 파일 끝: 처음부터 반복
+                steps = iter(replay)
+                step = next(steps)
+            seq += 1
+            # 같은 좌표 재전송과 구분되도록 y에 순번을 아주 작게 더함 (화면상 차이 없음)
+            x, y = step["x"], step["y"] + (seq % 1000) / 1000
+            stats.record_send(sid, x, y)
+            await client.emit('playerMovement', {"x": x, "y": y, "animation": step.get("animation", "down"),
+                                                 "scene": step.get("scene", "GameScene")})
+
+            if args.chat_rate and rng.random() < args.chat_rate / 60 * interval:
+                await client.emit('chatMessage', {"message": f"hello {seq}", "scene": "GameScene"})
+                stats.other_sent += 1
+            if args.character_rate and rng.random() < args.character_rate / 60 * interval:
+                await client.emit('characterChange', rng.randrange(8))
+                stats.other_sent += 1
+
+            next_send += interval
+            await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+    finally:
+        await client.disconnect()
+
+
+async def main(args):
+    stats = LoadStats()
+    monitor = ServerMonitor(args.server_pid or find_server_pid())
+    replay = load_replay(args.replay) if args.replay else None
+    stop = asyncio.Event()
+
+    tasks = []
+    delay = args.ramp / args.clients if args.clients else 0
+    start = time.perf_counter()
+    print(f"🚀 클라이언트 {args.clients}개 → {args.url} (초당 이동 {args.rate}회, 증가 {args.ramp}초)")
+    for i in range(args.clients):
+        tasks.append(asyncio.create_task(run_client(i, args, stats, replay, stop)))
+        if delay:
+            await asyncio.sleep(delay)
+
+    monitor.sample()
+    last = (time.perf_counter(), stats.moves_sent, stats.moves_received)
+    while time.perf_counter() - start < args.ramp + args.duration:
+        await asyncio.sleep(args.report_interval)
+        now = time.perf_counter()
+        monitor.sample()
+        stats.prune()
+        elapsed = now - last[0]
+        cpu = f", 서버 CPU {monitor.samples[-1]:.0f}%" if monitor.samples else ""
+        print(f"  ⏱️ {now - start:5.1f}s 연결 {stats.connected}개, "
+              f"송신 {(stats.moves_sent - last[1]) / elapsed:.0f}/s, "
+              f"수신 {(stats.moves_received - last[2]) / elapsed:.0f}/s{cpu}")
+        last = (now, stats.moves_sent, stats.moves_received)
+
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    total = time.perf_counter() - start
+
+    print(f"\n📊 결과 ({total:.1f}초)")
+    print(f"   연결: {stats.connected}개 성공, {stats.connect_errors}개 실패")
+    print(f"   이동 송신 {stats.moves_sent}개 ({stats.moves_sent / total:.0f}/s), "
+          f"playerMoved 수신 {stats.moves_received}개 ({stats.moves_received / total:.0f}/s)")
+    print(f"   기타 송신 {stats.other_sent}개, 기타 수신 {stats.other_received}개")
+    latency = stats.percentiles()
+    if latency:
+        print("   브로드캐스트 지연: " + ", ".join(f"{k} {v * 1000:.1f}ms" for k, v in latency.items()))
+    if monitor.samples:
+        print(f"   서버 CPU 평균 {sum(monitor.samples) / len(monitor.samples):.0f}%, "
+              f"최대 {max(monitor.samples):.0f}%, 최대 RSS {monitor.rss / 1024 / 1024:.0f}MB")
+    elif not monitor.pid:
+        print("   (서버 프로세스를 찾지 못해 CPU는 측정하지 않음, --server-pid 지정)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='gameserver.js Socket.IO 부하 테스트')
+    parser.add_argument('--url', default='http://localhost:3005')
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--rate', type=float, default=10, help='클라이언트당 초당 이동 메시지 수')
+    parser.add_argument('--duration', type=float, default=30, help='모든 클라이언트 연결 후 측정 시간 (초)')
+    parser.add_argument('--ramp', type=float, default=5, help='클라이언트를 나눠 연결하는 시간 (초)')
+    parser.add_argument('--chat-rate', type=float, default=1, help='클라이언트당 분당 채팅 수')
+    parser.add_argument('--character-rate', type=float, default=0.5, help='클라이언트당 분당 캐릭터 변경 수')
+    parser.add_argument('--replay', default=None, help='이동 재생 파일 (JSON lines)')
+    parser.add_argument('--server-pid', type=int, default=None, help='CPU를 측정할 서버 PID (기본: 자동 탐색)')
+    parser.add_argument('--report-interval', type=float, default=5)
+    args = parser.parse_args()
+
+    if socketio is None:
+        raise SystemExit("❌ python-socketio가 필요합니다: pip install python-socketio aiohttp")
+    asyncio.run(main(args))
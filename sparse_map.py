@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+희소 맵 표현 (행 단위 런 길이 + 기본 타일)
+
+pad_map_simple.py / expand_map_to_120x168.py 결과처럼 대부분이 기본 타일(0)인 맵은
+mapData를 칸마다 저장하면 내용과 상관없이 면적만큼 커진다.
+기본 타일이 아닌 구간만 행별 런 [x, 길이, 타일, ...]으로 저장하고,
+행마다 런 시작 위치를 이진 탐색해 임의 칸을 O(log 런 수)로 읽는다.
+
+JSON 형식 (mapData 대신):
+    "defaultTile": 0,
+    "mapRuns": [[x, 길이, 타일, x, 길이, 타일, ...], ...]   # height개 행
+
+사용 예:
+    python sparse_map.py encode default_map.json --out default_map.json
+    python sparse_map.py decode default_map.json --out default_map_dense.json
+"""
+
+import argparse
+import json
+from bisect import bisect_right
+
+import numpy as np
+
+
+class SparseMap:
+    """행 단위 런 길이 맵 (기본 타일이 아닌 구간만 저장)"""
+
+    def __init__(self, width, height, default=0):
+        self.width = width
+        self.height = height
+        self.default = default
+        # 행별 런: 시작 x / 끝 x(미포함) / 타일 (시작 x 오름차순)
+        self.starts = [[] for _ in range(height)]
+        self.ends = [[] for _ in range(height)]
+        self.values = [[] for _ in range(height)]
+
+    @classmethod
+    def from_dense(cls, data, default=None):
+        """2차원 mapData → SparseMap (default가 None이면 가장 많은 타일)"""
+        grid = np.asarray(data, dtype=np.int64)
+        height, width = grid.shape
+        if default is None:
+            values, counts = np.unique(grid, return_counts=True)
+            default = int(values[counts.argmax()]) if values.size else 0
+        sparse = cls(width, height, default)
+        for y, row in enumerate(grid):
+            sparse._set_row_runs(y, row)
+        return sparse
+
+    @classmethod
+    def from_runs(cls, width, height, runs, default=0):
+        """mapRuns 목록 → SparseMap"""
+        if len(runs) != height:
+            raise ValueError(f"mapRuns 행 수({len(runs)})가 height({height})와 다릅니다")
+        sparse = cls(width, height, default)
+        for y, flat in enumerate(runs):
+            for x, length, tile in zip(flat[0::3], flat[1::3], flat[2::3]):
+                sparse.starts[y].append(x)
+                sparse.ends[y].append(x + length)
+                sparse.values[y].append(tile)
+        return sparse
+
+    def _set_row_runs(self, y, row):
+        """한 행(1차원 배열)에서 기본 타일이 아닌 연속 구간 추출"""
+        # 값이 바뀌는 위치로 행을 같은 값 구간들로 나눔
+        cuts = np.flatnonzero(row[1:] != row[:-1]) + 1
+        seg_starts = np.concatenate(([0], cuts))
+        seg_ends = np.concatenate((cuts, [len(row)]))
+        seg_values = row[seg_starts]
+        keep = seg_values != self.default
+        self.starts[y] = seg_starts[keep].tolist()
+        self.ends[y] = seg_ends[keep].tolist()
+        self.values[y] = seg_values[keep].tolist()
+
+    def get(self, x, y):
+        """(x, y) 타일 (런 시작 위치 이진 탐색)"""
+        i = bisect_right(self.starts[y], x) - 1
+        if i >= 0 and x < self.ends[y][i]:
+            return self.values[y][i]
+        return self.default
+
+    def paste(self, data, left, top):
+        """작은 2차원 맵을 (left, top)에 덮어쓰기 (맵 밖은 잘라냄)"""
+        block = np.asarray(data, dtype=np.int64)
+        for dy, block_row in enumerate(block):
+            y = top + dy
+            if not 0 <= y < self.height:
+                continue
+            row = self.row(y)
+            x0 = max(left, 0)
+            x1 = min(left + block.shape[1], self.width)
+            if x0 < x1:
+                row[x0:x1] = block_row[x0 - left:x1 - left]
+                self._set_row_runs(y, row)
+
+    def row(self, y):
+        """y행 전체를 1차원 배열로"""
+        row = np.full(self.width, self.default, dtype=np.int64)
+        for start, end, value in zip(self.starts[y], self.ends[y], self.values[y]):
+            row[start:end] = value
+        return row
+
+    def to_dense(self):
+        """2차원 리스트 mapData로 복원"""
+        return [self.row(y).tolist() for y in range(self.height)]
+
+    def runs(self):
+        """mapRuns 형식 ([x, 길이, 타일, ...] 행 목록)"""
+        return [
+            [v for start, end, value in zip(self.starts[y], self.ends[y], self.values[y])
+             for v in (start, end - start, value)]
+            for y in range(self.height)
+        ]
+
+
+def row_runs(row, default=0):
+    """한 행 → mapRuns 한 줄 [x, 길이, 타일, ...] (스트림 기록용)"""
+    sparse = SparseMap(len(row), 1, default)
+    sparse._set_row_runs(0, np.asarray(row, dtype=np.int64))
+    return sparse.runs()[0]
+
+
+def encode_map(map_json, default=None):
+    """밀집 맵 JSON → 희소 맵 JSON (mapData를 defaultTile + mapRuns로 교체)"""
+    sparse = SparseMap.from_dense(map_json["mapData"], default)
+    out = {k: v for k, v in map_json.items() if k != "mapData"}
+    out["defaultTile"] = sparse.default
+    out["mapRuns"] = sparse.runs()
+    return out
+
+
+def decode_map(map_json):
+    """희소 맵 JSON → 밀집 맵 JSON (이미 밀집이면 그대로)"""
+    if "mapRuns" not in map_json:
+        return map_json
+    sparse = SparseMap.from_runs(map_json["width"], map_json["height"],
+                                 map_json["mapRuns"], map_json.get("defaultTile", 0))
+    out = {k: v for k, v in map_json.items() if k not in ("mapRuns", "defaultTile")}
+    out["mapData"] = sparse.to_dense()
+    return out
+
+
+def dump_sparse_map(map_json, path):
+    """희소 맵 저장 (행마다 한 줄: 칸마다 줄을 바꾸는 indent 출력 대신)"""
+    header = {k: v for k, v in map_json.items() if k != "mapRuns"}
+    lines = [json.dumps(run) for run in map_json["mapRuns"]]
+    body = json.dumps(header, indent=2, ensure_ascii=False)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(body[:-2])
+        f.write(',\n  "mapRuns": [\n    ' + ',\n    '.join(lines) + '\n  ]\n}\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='밀집 ↔ 희소(런 길이) 맵 변환')
+    parser.add_argument('mode', choices=['encode', 'decode'])
+    parser.add_argument('map')
+    parser.add_argument('--out', required=True)
+    parser.add_argument('--default', type=int, default=None, help='기본 타일 (기본값: 가장 많은 타일)')
+    args = parser.parse_args()
+
+    with open(args.map, 'r', encoding='utf-8') as f:
+        map_json = json.load(f)
+
+    if args.mode == 'encode':
+        if "mapRuns" in map_json:
+            map_json = decode_map(map_json)
+        sparse_json = encode_map(map_json, args.default)
+        dump_sparse_map(sparse_json, args.out)
+        runs = sum(len(r) // 3 for r in sparse_json["mapRuns"])
+        print(f"🗜️ {map_json['width']}x{map_json['height']} → 런 {runs}개 (기본 타일 {sparse_json['defaultTile']})")
+    else:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(decode_map(map_json), f, indent=2, ensure_ascii=False)
+        print("📤 밀집 맵으로 복원")
+    print(f"✅ 저장: {args.out}")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+적분 영상(summed-area table)으로 원본 해상도에서 바로 블록 평균 색상 계산
+
+convert_world_map.py는 블록마다 평균 색상 하나만 쓰면서 원본을 3840x5376으로 LANCZOS 리사이즈한다.
+원본 해상도의 적분 영상을 한 번 만들어 두면 임의 격자(소수 경계 포함)의
+칸별 면적 가중 평균을 칸마다 O(1)로 읽을 수 있어 큰 리사이즈가 필요 없고,
+맵 크기를 바꿔 다시 나누는 것도 즉시 가능하다.
+
+픽셀 안에서 영상 값은 일정하므로 적분 영상은 픽셀 칸 안에서 쌍선형이다.
+따라서 소수 좌표의 적분 값은 적분 영상의 쌍선형 보간으로 정확히 구해진다.
+(LANCZOS 리사이즈 후 평균과는 필터가 달라 경계 부근 색상이 조금 다를 수 있다.)
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from image_cache import load_image_array
+from tile_match_cache import file_digest
+
+
+def summed_area_table(pixels):
+    """(H, W, C) → (H+1, W+1, C) 적분 영상 (float64, 첫 행/열은 0)"""
+    pixels = np.asarray(pixels, dtype=np.float64)
+    if pixels.ndim == 2:
+        pixels = pixels[..., np.newaxis]
+    sat = np.zeros((pixels.shape[0] + 1, pixels.shape[1] + 1, pixels.shape[2]), dtype=np.float64)
+    np.cumsum(pixels, axis=0, out=sat[1:, 1:])
+    np.cumsum(sat[1:, 1:], axis=1, out=sat[1:, 1:])
+    return sat
+
+
+def sample_sat(sat, ys, xs):
+    """소수 좌표 격자 (len(ys), len(xs))의 적분 값 (쌍선형 보간)"""
+    h, w = sat.shape[0] - 1, sat.shape[1] - 1
+    ys = np.clip(np.asarray(ys, dtype=np.float64), 0, h)
+    xs = np.clip(np.asarray(xs, dtype=np.float64), 0, w)
+    y0 = np.minimum(np.floor(ys).astype(np.int64), h - 1)
+    x0 = np.minimum(np.floor(xs).astype(np.int64), w - 1)
+    fy = (ys - y0)[:, None, None]
+    fx = (xs - x0)[None, :, None]
+
+    top = sat[y0][:, x0] * (1 - fx) + sat[y0][:, x0 + 1] * fx
+    bottom = sat[y0 + 1][:, x0] * (1 - fx) + sat[y0 + 1][:, x0 + 1] * fx
+    return top * (1 - fy) + bottom * fy
+
+
+def grid_means(sat, grid_width, grid_height, box=None):
+    """
+    이미지(또는 box 영역)를 grid_width x grid_height 칸으로 나눈 칸별 평균 색상
+
+    Args:
+        box: (left, top, right, bottom) 픽셀 좌표 (소수 가능), None이면 이미지 전체
+
+    Returns:
+        (grid_height, grid_width, C) float64
+    """
+    h, w = sat.shape[0] - 1, sat.shape[1] - 1
+    left, top, right, bottom = box or (0, 0, w, h)
+    xs = np.linspace(left, right, grid_width + 1)
+    ys = np.linspace(top, bottom, grid_height + 1)
+    corners = sample_sat(sat, ys, xs)
+
+    sums = corners[1:, 1:] - corners[:-1, 1:] - corners[1:, :-1] + corners[:-1, :-1]
+    area = np.diff(ys)[:, None, None] * np.diff(xs)[None, :, None]
+    return sums / area
+
+
+@lru_cache(maxsize=4)
+def _cached_sat(path, digest, mode):
+    return summed_area_table(load_image_array(path, mode=mode))
+
+
+def image_sat(path, mode='RGB'):
+    """이미지 파일의 적분 영상 (파일 내용이 같으면 프로세스 안에서 재사용)"""
+    return _cached_sat(path, file_digest(path), mode)
+
+
+def image_grid_means(path, grid_width, grid_height, mode='RGB'):
+    """이미지 파일 → 격자 칸별 평균 색상 (리사이즈 없이)"""
+    return grid_means(image_sat(path, mode), grid_width, grid_height)
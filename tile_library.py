@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+맵 간 공유 타일 라이브러리 (내용 주소 기반)
+
+월드/선술집/에디터 맵의 타일셋을 하나의 라이브러리에 등록해 같은 타일은 한 번만 저장하고,
+각 맵은 전역 타일 ID 테이블(globalTileIds)로 라이브러리를 참조한다.
+함께 로드되는 맵 묶음에 필요한 타일만 아틀라스 페이지로 묶어 내보낸다.
+
+사용 예:
+    python tile_library.py register public/assets/New_Tileset.png public/default_map.json
+    python tile_library.py pack --out public/assets/packed public/default_map.json public/tavern_map.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+from PIL import Image
+
+from sparse_map import decode_map
+from tile_store import atlas_to_tiles, build_atlas
+
+DEFAULT_LIBRARY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tile_library')
+
+
+def tile_digest(tile):
+    return hashlib.blake2b(np.ascontiguousarray(tile).tobytes(), digest_size=16).hexdigest()
+
+
+def to_rgba(arr):
+    """(…, 3) RGB 배열에 불투명 알파 채널 추가"""
+    if arr.shape[-1] == 4:
+        return arr
+    alpha = np.full(arr.shape[:-1] + (1,), 255, dtype=arr.dtype)
+    return np.concatenate([arr, alpha], axis=-1)
+
+
+class TileLibrary:
+    """
+    타일 크기별 전역 타일 저장소
+
+    <library_dir>/<tile_size>px/index.json : 전역 ID 순서의 타일 해시 목록
+    <library_dir>/<tile_size>px/tiles.npy  : (N, ts, ts, 4) RGBA 타일 배열
+    """
+
+    def __init__(self, tile_size, library_dir=DEFAULT_LIBRARY_DIR):
+        self.tile_size = tile_size
+        self.path = os.path.join(library_dir, f"{tile_size}px")
+        self.digests = []
+        self.ids = {}
+        self.tiles = np.zeros((0, tile_size, tile_size, 4), dtype=np.uint8)
+
+        index_path = os.path.join(self.path, 'index.json')
+        if os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as f:
+                self.digests = json.load(f)['tiles']
+            self.ids = {d: i for i, d in enumerate(self.digests)}
+            self.tiles = np.load(os.path.join(self.path, 'tiles.npy'))
+
+    def __len__(self):
+        return len(self.digests)
+
+    def register(self, tiles):
+        """
+        타일 등록 후 각 타일의 전역 ID 배열 반환 (이미 있는 타일은 기존 ID)
+
+        Args:
+            tiles: (N, ts, ts, 3|4) uint8 타일 배열
+        """
+        tiles = to_rgba(np.asarray(tiles, dtype=np.uint8))
+        global_ids = np.empty(len(tiles), dtype=np.int64)
+        new_tiles = []
+        for i, tile in enumerate(tiles):
+            digest = tile_digest(tile)
+            gid = self.ids.get(digest)
+            if gid is None:
+                gid = len(self.digests)
+                self.ids[digest] = gid
+                self.digests.append(digest)
+                new_tiles.append(tile)
+            global_ids[i] = gid
+        if new_tiles:
+            self.tiles = np.concatenate([self.tiles, np.stack(new_tiles)])
+        return global_ids
+
+    def register_tileset_image(self, tileset_path):
+        """타일셋 이미지의 모든 칸을 등록하고 (로컬 인덱스 → 전역 ID) 배열 반환"""
+        atlas = np.asarray(Image.open(tileset_path).convert('RGBA'))
+        return self.register(atlas_to_tiles(atlas, self.tile_size))
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        np.save(os.path.join(self.path, 'tiles.npy'), self.tiles)
+        with open(os.path.join(self.path, 'index.json'), 'w', encoding='utf-8') as f:
+            json.dump({"tileSize": self.tile_size, "tiles": self.digests}, f)
+
+
+def attach_global_ids(map_json, global_ids, map_path, library_dir=DEFAULT_LIBRARY_DIR):
+    """
+    맵 JSON에 로컬 타일 인덱스 → 전역 ID 테이블 추가 (mapData는 그대로 유지)
+
+    tileLibrary는 실행 위치와 관계없이 풀리도록 맵 파일(map_path) 폴더 기준 상대 경로로 기록
+    """
+    map_dir = os.path.dirname(os.path.abspath(map_path))
+    map_json["tileLibrary"] = os.path.relpath(os.path.abspath(library_dir), map_dir)
+    map_json["globalTileIds"] = [int(g) for g in global_ids]
+    return map_json
+
+
+def register_map(map_path, tileset_path, library):
+    """타일셋을 라이브러리에 등록하고 맵 파일에 전역 ID 테이블 기록"""
+    global_ids = library.register_tileset_image(tileset_path)
+    with open(map_path, 'r', encoding='utf-8') as f:
+        map_json = json.load(f)
+    attach_global_ids(map_json, global_ids, map_path, os.path.dirname(library.path))
+    with open(map_path, 'w', encoding='utf-8') as f:
+        json.dump(map_json, f, indent=2, ensure_ascii=False)
+    return global_ids
+
+
+def global_map_data(map_json):
+    """맵의 mapData를 전역 ID 배열로 변환"""
+    table = np.asarray(map_json["globalTileIds"], dtype=np.int64)
+    return table[np.asarray(map_json["mapData"], dtype=np.int64)]
+
+
+def pack_pages(library, map_paths, output_dir, page_size=2048):
+    """
+    함께 로드되는 맵들이 쓰는 타일만 모아 최소 개수의 아틀라스 페이지로 내보내기
+
+    페이지 k의 타일은 패킹된 ID k * tiles_per_page + slot을 가지므로
+    Phaser에서 페이지마다 addTilesetImage(..., firstgid)로 이어 붙일 수 있다.
+    각 맵은 패킹된 ID 기준 mapData로 output_dir에 다시 저장된다.
+    """
+    ts = library.tile_size
+    per_row = page_size // ts
+    tiles_per_page = per_row * per_row
+
+    maps = []
+    for path in map_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            maps.append((path, decode_map(json.load(f))))
+
+    # 맵 순서 → 맵 안의 등장 순서대로 사용 타일 수집 (먼저 로드되는 맵의 타일이 앞 페이지로)
+    used = []
+    for _, map_json in maps:
+        used.append(global_map_data(map_json).ravel())
+    used = np.concatenate(used)
+    _, first = np.unique(used, return_index=True)
+    used_ids = used[np.sort(first)]
+
+    packed_of = np.full(len(library), -1, dtype=np.int64)
+    packed_of[used_ids] = np.arange(len(used_ids))
+
+    os.makedirs(output_dir, exist_ok=True)
+    pages = []
+    for page, start in enumerate(range(0, len(used_ids), tiles_per_page)):
+        ids = used_ids[start:start + tiles_per_page]
+        image_name = f"tile_page_{page}.png"
+        Image.fromarray(build_atlas(library.tiles[ids], per_row)).save(
+            os.path.join(output_dir, image_name), optimize=True)
+        pages.append({"image": image_name, "firstgid": start, "tiles": ids.tolist()})
+
+    for path, map_json in maps:
+        table = np.asarray(map_json["globalTileIds"], dtype=np.int64)
+        packed = packed_of[global_map_data(map_json)]
+        collision = [int(packed_of[table[t]]) for t in map_json.get("collisionTiles", [])
+                     if t < len(table) and packed_of[table[t]] >= 0]
+        out = {k: v for k, v in map_json.items() if k not in ("globalTileIds", "tileLibrary")}
+        out["mapData"] = packed.tolist()
+        out["collisionTiles"] = collision
+        out["tilePages"] = "tile_pages.json"
+        with open(os.path.join(output_dir, os.path.basename(path)), 'w', encoding='utf-8') as f:
+            json.dump(out, f, indent=2, ensure_ascii=False)
+
+    manifest = {
+        "tileSize": ts,
+        "pageSize": page_size,
+        "tilesPerPage": tiles_per_page,
+        "maps": [os.path.basename(p) for p, _ in maps],
+        "pages": pages
+    }
+    with open(os.path.join(output_dir, 'tile_pages.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"📦 페이지 {len(pages)}장, 사용 타일 {len(used_ids)}개 / 라이브러리 {len(library)}개")
+    return manifest
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='공유 타일 라이브러리 관리')
+    parser.add_argument('--library', default=DEFAULT_LIBRARY_DIR, help='라이브러리 폴더')
+    parser.add_argument('--tile-size', type=int, default=32)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    reg = sub.add_parser('register', help='타일셋 등록 + 맵에 전역 ID 테이블 기록')
+    reg.add_argument('tileset')
+    reg.add_argument('maps', nargs='+')
+
+    pack = sub.add_parser('pack', help='함께 로드되는 맵 묶음의 아틀라스 페이지 생성')
+    pack.add_argument('maps', nargs='+')
+    pack.add_argument('--out', required=True)
+    pack.add_argument('--page-size', type=int, default=2048)
+
+    args = parser.parse_args()
+    library = TileLibrary(args.tile_size, args.library)
+
+    if args.command == 'register':
+        for map_path in args.maps:
+            ids = register_map(map_path, args.tileset, library)
+            print(f"✅ {map_path}: 타일 {len(ids)}개 → 라이브러리 {len(library)}개")
+        library.save()
+    else:
+        pack_pages(library, args.maps, args.out, args.page_size)
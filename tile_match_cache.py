@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+타일 매칭 결과 캐시 (블록 픽셀 해시 → 타일 인덱스)
+
+바다, 풀밭, 패딩 영역처럼 같은 블록이 반복되는 맵에서는
+동일한 블록을 한 번만 매칭하고 이후에는 캐시된 결과를 재사용한다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """파일 내용의 해시 (캐시 네임스페이스용)"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def tileset_namespace(tileset_path, tile_size, matcher):
+    """
+    타일셋 내용 + 타일 크기 + 매칭 방식으로 캐시 네임스페이스 생성
+
+    타일셋이나 매칭 방식이 바뀌면 이전 결과가 재사용되지 않도록 한다.
+    """
+    return f"{file_digest(tileset_path)}:{tile_size}:{matcher}"
+
+
+class TileMatchCache:
+    """
+    크기 제한 LRU 매칭 캐시 (선택적으로 디스크에 저장)
+
+    conversion_server.py처럼 여러 작업 스레드가 같은 캐시를 쓰므로 항목 접근은 잠금 안에서 한다.
+    (matcher 실행은 잠금 밖)
+
+    Args:
+        namespace: 캐시 구분자 (타일셋/매칭 방식이 다르면 다른 값)
+        max_entries: 최대 항목 수 (초과 시 가장 오래 안 쓴 항목 제거)
+        quantize_bits: 해시 전에 버릴 하위 비트 수 (0 = 정확히 같은 블록만)
+        cache_path: JSON 저장 경로 (None이면 메모리에만 유지)
+    """
+
+    def __init__(self, namespace='', max_entries=65536, quantize_bits=0, cache_path=None):
+        self.namespace = f"{namespace}:q{quantize_bits}"
+        self.max_entries = max_entries
+        self.quantize_bits = quantize_bits
+        self.cache_path = cache_path
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if cache_path and os.path.exists(cache_path):
+            self.load()
+
+    def block_key(self, block):
+        """블록 픽셀(필요 시 양자화)의 빠른 해시"""
+        arr = np.ascontiguousarray(block, dtype=np.uint8)
+        if self.quantize_bits:
+            arr = arr >> self.quantize_bits
+        h = hashlib.blake2b(digest_size=16)
+        h.update(str(arr.shape).encode())
+        h.update(arr.tobytes())
+        return h.hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def match(self, block, matcher):
+        """캐시에 있으면 재사용, 없으면 matcher(block) 실행 후 저장"""
+        key = self.block_key(block)
+        value = self.get(key)
+        if value is None:
+            value = int(matcher(block))
+            self.put(key, value)
+        return value
+
+    def load(self):
+        """디스크 캐시 로드 (네임스페이스가 다르면 무시)"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('namespace') != self.namespace:
+            return
+        with self.lock:
+            for key, value in data.get('entries', [])[-self.max_entries:]:
+                self.entries[key] = value
+
+    def save(self):
+        """디스크에 캐시 저장 (LRU 순서 유지, 원자적 교체)"""
+        if not self.cache_path:
+            return
+        with self.lock:
+            entries = list(self.entries.items())
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "namespace": self.namespace,
+                "entries": entries
+            }, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def stats(self):
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return f"캐시 적중 {self.hits}/{total} ({rate:.1f}%), 항목 {len(self.entries)}개"
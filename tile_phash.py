@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+지각 해시(pHash) 기반 유사 타일 클러스터링
+
+JPEG 원본은 압축 노이즈 때문에 바이트 단위로 같은 타일이 거의 없다.
+타일별 DCT 해시를 한 번에 계산하고 LSH 인덱스로 해밍 거리 안의 타일을 묶어
+클러스터마다 대표 타일 하나만 남긴다.
+"""
+
+import numpy as np
+
+from tile_store import dedup_tiles
+
+HASH_SIZE = 8
+HASH_SAMPLE = HASH_SIZE * 4  # DCT 입력 크기 (32x32)
+
+
+def _area_matrix(src, dst):
+    """길이 src → dst 면적 평균 리샘플링 행렬 (dst, src)"""
+    m = np.zeros((dst, src), dtype=np.float32)
+    scale = src / dst
+    for i in range(dst):
+        start, end = i * scale, (i + 1) * scale
+        for j in range(int(start), min(src, int(np.ceil(end)))):
+            m[i, j] = min(end, j + 1) - max(start, j)
+    return m / m.sum(axis=1, keepdims=True)
+
+
+def _dct_matrix(n):
+    """직교 DCT-II 행렬 (n, n)"""
+    k = np.arange(n)[:, np.newaxis]
+    i = np.arange(n)[np.newaxis, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    m[0] /= np.sqrt(2.0)
+    return m.astype(np.float32)
+
+
+def perceptual_hashes(tiles):
+    """
+    (N, ts, ts, C) 타일의 64비트 pHash를 한 번에 계산
+
+    Returns:
+        (N,) uint64 배열
+    """
+    tiles = np.asarray(tiles)
+    rgb = tiles[..., :3].astype(np.float32)
+    if rgb.shape[-1] == 3:
+        gray = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    else:
+        gray = rgb[..., 0]
+
+    rows = _area_matrix(gray.shape[1], HASH_SAMPLE)
+    cols = _area_matrix(gray.shape[2], HASH_SAMPLE)
+    small = rows @ gray @ cols.T
+
+    # 저주파 8x8 성분만 필요하므로 DCT 행렬도 앞 8행만 사용
+    dct = _dct_matrix(HASH_SAMPLE)[:HASH_SIZE]
+    freq = dct @ small @ dct.T
+    low = freq.reshape(len(freq), -1)
+
+    # DC 성분을 제외한 중앙값 기준으로 비트 결정
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    bits = (low > median).astype(np.uint64)
+    weights = np.uint64(1) << np.arange(HASH_SIZE * HASH_SIZE, dtype=np.uint64)
+    return (bits * weights).sum(axis=1, dtype=np.uint64)
+
+
+_POPCOUNT8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount64(values):
+    """uint64 배열의 비트 수 (원소별)"""
+    values = np.ascontiguousarray(values, dtype=np.uint64)
+    return _POPCOUNT8[values.view(np.uint8)].reshape(values.shape + (8,)).sum(axis=-1)
+
+
+class HammingIndex:
+    """
+    해밍 거리 반경 검색용 다중 인덱스 LSH
+
+    64비트 해시를 여러 구간으로 나누고 구간 값이 같은 항목만 후보로 모은 뒤
+    실제 해밍 거리는 벡터 연산으로 확인한다. 구간 수가 radius + 1 이상이면
+    비둘기집 원리에 따라 반경 안의 항목을 빠짐없이 찾는다 (radius <= 7).
+    그보다 큰 반경은 구간을 8비트 이상으로 유지하는 근사 검색이 된다.
+    """
+
+    def __init__(self, radius):
+        self.radius = radius
+        bands = min(radius + 1, 8)
+        bounds = np.linspace(0, 64, bands + 1).astype(int)
+        self.bands = [(int(lo), (1 << int(hi - lo)) - 1) for lo, hi in zip(bounds[:-1], bounds[1:])]
+        self.buckets = [{} for _ in self.bands]
+        self.hashes = np.zeros(1024, dtype=np.uint64)
+        self.size = 0
+
+    def _keys(self, value):
+        return [(value >> shift) & mask for shift, mask in self.bands]
+
+    def add(self, value):
+        """해시 추가 후 항목 번호 반환"""
+        item = self.size
+        if item == len(self.hashes):
+            self.hashes = np.concatenate([self.hashes, np.zeros_like(self.hashes)])
+        self.hashes[item] = value
+        self.size += 1
+        for bucket, key in zip(self.buckets, self._keys(value)):
+            bucket.setdefault(key, []).append(item)
+        return item
+
+    def search(self, value):
+        """반경 안의 항목 (distances, items) 배열 (거리순)"""
+        candidates = []
+        for bucket, key in zip(self.buckets, self._keys(value)):
+            candidates.extend(bucket.get(key, ()))
+        # 여러 구간에서 겹친 후보는 중복되어도 결과 순서에 영향 없음
+        items = np.array(candidates, dtype=np.int64)
+        dist = popcount64(self.hashes[items] ^ np.uint64(value))
+        keep = dist <= self.radius
+        order = np.argsort(dist[keep], kind='stable')
+        return dist[keep][order], items[keep][order]
+
+
+def cluster_tiles(tiles, max_distance=6, max_error=12.0):
+    """
+    유사 타일을 클러스터로 묶고 클러스터별 대표 타일 선택
+
+    pHash는 밝기 구조만 보므로 색이 다른 타일이 섞이지 않도록
+    대표 타일과의 평균 픽셀 오차도 함께 확인한다.
+
+    Args:
+        tiles: (N, ts, ts, C) 타일 배열
+        max_distance: 같은 클러스터로 볼 최대 pHash 해밍 거리 (0~64)
+        max_error: 대표 타일과의 최대 평균 절대 픽셀 오차 (None이면 검사 안 함)
+
+    Returns:
+        (representatives, labels): 대표 타일 인덱스 배열,
+        각 타일이 속한 클러스터 번호 (representatives 기준)
+    """
+    # 바이트가 같은 타일은 먼저 합쳐서 해시/비교 횟수를 줄임
+    unique, inverse = dedup_tiles(tiles)
+    _, first_index = np.unique(inverse, return_index=True)
+    hashes = perceptual_hashes(unique)
+
+    # 8x8 축소본의 평균 오차는 원본 평균 오차 이하이므로 먼저 축소본으로 후보를 거른다
+    thumbs = None
+    if max_error is not None:
+        th, tw = unique.shape[1:3]
+        thumbs = (_area_matrix(th, HASH_SIZE) @ unique.astype(np.float32).transpose(0, 3, 1, 2)
+                  @ _area_matrix(tw, HASH_SIZE).T)
+
+    index = HammingIndex(max_distance)
+    representatives = np.empty(len(unique), dtype=np.int64)  # 클러스터 번호 → 대표 타일
+    unique_labels = np.empty(len(unique), dtype=np.int64)
+
+    for i, h in enumerate(hashes.tolist()):
+        _, candidates = index.search(h)
+        if max_error is not None and len(candidates):
+            rep_index = representatives[candidates]
+            coarse = np.abs(thumbs[rep_index] - thumbs[i]).mean(axis=(1, 2, 3))
+            candidates = candidates[coarse <= max_error]
+            rep_index = rep_index[coarse <= max_error]
+            if len(candidates):
+                reps = unique[rep_index].astype(np.int16)
+                errors = np.abs(reps - unique[i].astype(np.int16)).mean(axis=(1, 2, 3))
+                candidates = candidates[errors <= max_error]
+
+        if len(candidates):
+            label = int(candidates[0])
+        else:
+            label = index.add(h)
+            representatives[label] = i
+        unique_labels[i] = label
+
+    reps = first_index[representatives[:index.size]]
+    return reps, unique_labels[inverse]
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+타일 크기별 텍스처 메모리 / 다운로드 크기 / 재구성 오차 비교
+
+convert_world_map.py, generate_large_map.py는 32px, extract_tiles_*와 pad_map_simple.py는 64px 타일을 쓴다.
+같은 월드 이미지를 여러 타일 크기로 나눴을 때의 비용을 한 번에 비교한다.
+원본은 한 번만 디코딩(리사이즈)하고, 가장 작은 부분 블록의 합에서 시작해
+2x2씩 합쳐 올라가는 블록 피라미드를 모든 타일 크기가 같이 쓴다.
+
+타일 크기마다:
+    unique      : 바이트가 같은 타일을 합친 뒤 타일 수
+    near-unique : 4x4 부분 블록 평균 색상을 quant 단계로 양자화한 서명이 같은 타일을 합친 뒤 타일 수
+    pages       : near-unique 타일을 page_size 아틀라스 페이지에 담았을 때 페이지 수 (tile_library.pack_pages 배치)
+    GPU         : 아틀라스 페이지의 RGBA8 텍스처 바이트
+    download    : 아틀라스 PNG + gzip mapData 바이트
+    PSNR        : 각 타일을 그룹 대표 타일로 바꿔 다시 그린 이미지의 원본 대비 PSNR
+
+타일 크기는 가장 작은 크기의 2의 거듭제곱 배여야 한다 (예: 16 32 64).
+
+사용 예:
+    python tile_size_sweep.py public/assets/world_map_original.jpg --sizes 16 32 64 \\
+        --world 3840 5376 --budget-mb 64 --csv tile_sizes.csv
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+
+import numpy as np
+from PIL import Image
+
+from image_cache import load_image_array
+from tile_store import build_atlas, flatten_tiles, split_tiles
+
+SIGNATURE_GRID = 4  # 타일 하나를 4x4 부분 블록으로 나눠 서명 계산
+
+
+def block_pyramid(pixels, base, levels):
+    """
+    부분 블록 합 피라미드 [단계 0 (base px 블록), 단계 1 (2*base px), ...]
+
+    각 단계는 (H/블록, W/블록, C) float64 합 배열이며 윗단계는 아랫단계 2x2 합이다.
+    """
+    h, w, c = pixels.shape
+    sums = pixels.reshape(h // base, base, w // base, base, c).sum(axis=(1, 3), dtype=np.float64)
+    pyramid = [sums]
+    for _ in range(levels - 1):
+        s = pyramid[-1]
+        pyramid.append(s.reshape(s.shape[0] // 2, 2, s.shape[1] // 2, 2, c).sum(axis=(1, 3)))
+    return pyramid
+
+
+def tile_signatures(block_sums, block_size, quant):
+    """부분 블록 합 (gy*4, gx*4, C) → 타일별 양자화 서명 (gy*gx, 4*4*C) uint8"""
+    g = SIGNATURE_GRID
+    hy, hx, c = block_sums.shape
+    means = block_sums / (block_size * block_size)
+    sig = means.reshape(hy // g, g, hx // g, g, c).swapaxes(1, 2).reshape(-1, g * g * c)
+    return (sig // quant).astype(np.uint8)
+
+
+def group_rows(rows):
+    """행이 같은 항목끼리 묶기 → (first_index, inverse) (첫 등장 순서 번호)"""
+    rows = np.ascontiguousarray(rows)
+    keys = rows.reshape(len(rows), -1).view(np.dtype((np.void, rows[0].nbytes))).ravel()
+    _, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first_index, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    return first_index[order], rank[inverse.ravel()]
+
+
+def reconstruction_psnr(tiles, representatives, labels, batch=4096):
+    """각 타일을 대표 타일로 바꿨을 때 원본 대비 PSNR (dB, 손실 없으면 inf)"""
+    total = 0.0
+    for start in range(0, len(tiles), batch):
+        original = tiles[start:start + batch].astype(np.float32)
+        rebuilt = tiles[representatives[labels[start:start + batch]]].astype(np.float32)
+        total += float(((original - rebuilt) ** 2).sum(dtype=np.float64))
+    mse = total / tiles.size
+    return float('inf') if mse == 0 else 10 * np.log10(255.0 ** 2 / mse)
+
+
+def atlas_pages(tiles, page_size):
+    """tile_library.pack_pages와 같은 배치로 페이지 이미지 배열 목록"""
+    ts = tiles.shape[1]
+    per_row = page_size // ts
+    per_page = per_row * per_row
+    return [build_atlas(tiles[start:start + per_page], per_row) for start in range(0, len(tiles), per_page)]
+
+
+def png_bytes(pixels):
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, 'PNG')
+    return buf.tell()
+
+
+def evaluate_size(pixels, tile_size, block_sums, block_size, quant=16, page_size=2048):
+    """타일 크기 하나의 통계 dict"""
+    grid = split_tiles(pixels, tile_size)
+    tiles_y, tiles_x = grid.shape[:2]
+    tiles = flatten_tiles(grid)
+
+    unique = len(group_rows(tiles.reshape(len(tiles), -1))[0])
+    representatives, labels = group_rows(tile_signatures(block_sums, block_size, quant))
+    psnr = reconstruction_psnr(tiles, representatives, labels)
+
+    pages = atlas_pages(tiles[representatives], page_size)
+    gpu_bytes = sum(page.shape[0] * page.shape[1] * 4 for page in pages)
+    atlas_bytes = sum(png_bytes(page) for page in pages)
+    map_bytes = len(gzip.compress(json.dumps(labels.reshape(tiles_y, tiles_x).tolist()).encode()))
+
+    return {
+        "tileSize": tile_size,
+        "grid": f"{tiles_x}x{tiles_y}",
+        "tiles": len(tiles),
+        "unique": unique,
+        "nearUnique": len(representatives),
+        "pages": len(pages),
+        "gpuBytes": gpu_bytes,
+        "downloadBytes": atlas_bytes + map_bytes,
+        "psnr": round(psnr, 2),
+    }
+
+
+def sweep(image_path, sizes, world=None, quant=16, page_size=2048):
+    """
+    여러 타일 크기 비교 (원본 디코딩 + 블록 피라미드 한 번)
+
+    Args:
+        world: 월드 픽셀 크기 (width, height), None이면 원본 크기
+        quant: 서명 양자화 단계 (클수록 더 많은 타일이 합쳐짐)
+    """
+    sizes = sorted(set(sizes))
+    smallest, largest = sizes[0], sizes[-1]
+    for size in sizes:
+        ratio = size // smallest
+        if size % smallest or ratio & (ratio - 1):
+            raise ValueError(f"타일 크기 {size}는 {smallest}의 2의 거듭제곱 배가 아닙니다")
+        if size % SIGNATURE_GRID or size > page_size:
+            raise ValueError(f"타일 크기 {size}는 {SIGNATURE_GRID}의 배수이고 페이지 크기 이하여야 합니다")
+
+    pixels = load_image_array(image_path, world)
+    # 가장 큰 타일 크기로 나누어떨어지도록 오른쪽/아래를 자름 (모든 크기가 같은 영역을 비교)
+    h = pixels.shape[0] // largest * largest
+    w = pixels.shape[1] // largest * largest
+    pixels = np.ascontiguousarray(pixels[:h, :w])
+
+    base = smallest // SIGNATURE_GRID
+    pyramid = block_pyramid(pixels, base, (largest // smallest).bit_length())
+    results = []
+    for size in sizes:
+        level = (size // smallest).bit_length() - 1
+        results.append(evaluate_size(pixels, size, pyramid[level], base << level, quant, page_size))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='타일 크기별 텍스처 메모리/다운로드/오차 비교')
+    parser.add_argument('image')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[16, 32, 64])
+    parser.add_argument('--world', type=int, nargs=2, metavar=('WIDTH', 'HEIGHT'), default=(3840, 5376),
+                        help='월드 픽셀 크기 (기본값: 120x168칸 x 32px)')
+    parser.add_argument('--quant', type=int, default=16, help='near-unique 서명 양자화 단계')
+    parser.add_argument('--page-size', type=int, default=2048)
+    parser.add_argument('--budget-mb', type=float, default=None, help='GPU 텍스처 예산 (MB)')
+    parser.add_argument('--csv', default=None)
+    args = parser.parse_args()
+
+    print(f"🖼️ {args.image} → {args.world[0]}x{args.world[1]}px, 타일 크기 {args.sizes}")
+    results = sweep(args.image, args.sizes, tuple(args.world), args.quant, args.page_size)
+
+    print(f"\n{'size':>5} {'grid':>9} {'unique':>7} {'near':>7} {'pages':>5} "
+          f"{'GPU MB':>8} {'down MB':>8} {'PSNR':>7}")
+    for r in results:
+        print(f"{r['tileSize']:>5} {r['grid']:>9} {r['unique']:>7} {r['nearUnique']:>7} {r['pages']:>5} "
+              f"{r['gpuBytes'] / 2 ** 20:>8.2f} {r['downloadBytes'] / 2 ** 20:>8.2f} {r['psnr']:>7.2f}")
+
+    if args.budget_mb is not None:
+        fits = [r for r in results if r['gpuBytes'] <= args.budget_mb * 2 ** 20]
+        if fits:
+            best = max(fits, key=lambda r: (r['psnr'], -r['downloadBytes']))
+            print(f"\n🎯 GPU {args.budget_mb:g} MB 이내 최고 화질: {best['tileSize']}px "
+                  f"(PSNR {best['psnr']:.2f} dB, 다운로드 {best['downloadBytes'] / 2 ** 20:.2f} MB)")
+        else:
+            print(f"\n⚠️ GPU {args.budget_mb:g} MB 안에 들어가는 타일 크기가 없습니다")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"💾 CSV: {args.csv}")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+NumPy 타일 저장소
+
+이미지를 타일별 PIL crop/paste 대신 하나의 (N, ts, ts, C) uint8 배열로 다룬다.
+타일 분할은 reshape/transpose 뷰, 중복 제거는 행 단위 바이트 비교,
+타일셋(아틀라스) 조립은 배열 재배치 한 번으로 처리한다.
+"""
+
+import numpy as np
+
+
+def split_tiles(arr, tile_size):
+    """
+    (H, W[, C]) 이미지를 (tiles_y, tiles_x, ts, ts, C) 뷰로 분할 (복사 없음)
+
+    타일 크기로 나누어떨어지지 않는 오른쪽/아래 가장자리는 버린다.
+    """
+    arr = np.asarray(arr)
+    if arr.ndim == 2:
+        arr = arr[..., np.newaxis]
+    tiles_y = arr.shape[0] // tile_size
+    tiles_x = arr.shape[1] // tile_size
+    arr = arr[:tiles_y * tile_size, :tiles_x * tile_size]
+    return arr.reshape(tiles_y, tile_size, tiles_x, tile_size, arr.shape[2]).swapaxes(1, 2)
+
+
+def flatten_tiles(grid):
+    """(tiles_y, tiles_x, ts, ts, C) 그리드를 행 우선 (N, ts, ts, C) 연속 배열로"""
+    return np.ascontiguousarray(grid).reshape((-1,) + grid.shape[2:])
+
+
+def dedup_tiles(tiles):
+    """
+    바이트가 동일한 타일 제거 (처음 나온 순서 유지)
+
+    Returns:
+        (unique_tiles, inverse): unique_tiles[inverse[i]] == tiles[i]
+    """
+    tiles = np.ascontiguousarray(tiles)
+    n = tiles.shape[0]
+    if n == 0:
+        return tiles, np.zeros(0, dtype=np.int64)
+
+    # 각 타일을 하나의 바이트 행(void 스칼라)으로 보고 한 번에 비교
+    row_bytes = tiles[0].nbytes
+    keys = tiles.reshape(n, -1).view(np.dtype((np.void, row_bytes))).ravel()
+    _, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+    # np.unique는 정렬 순서이므로 최초 등장 순서로 번호를 다시 매김
+    order = np.argsort(first_index, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    return tiles[first_index[order]], rank[inverse.ravel()]
+
+
+def build_atlas(tiles, tiles_per_row=16, fill=0):
+    """
+    (N, ts, ts, C) 타일을 tiles_per_row 열 그리드의 타일셋 이미지 배열로 조립
+
+    마지막 행의 빈 칸은 fill 값으로 채운다.
+    """
+    n, th, tw, channels = tiles.shape
+    rows = max(1, -(-n // tiles_per_row))
+    padded = np.full((rows * tiles_per_row, th, tw, channels), fill, dtype=tiles.dtype)
+    padded[:n] = tiles
+    return padded.reshape(rows, tiles_per_row, th, tw, channels).swapaxes(1, 2).reshape(
+        rows * th, tiles_per_row * tw, channels)
+
+
+def atlas_to_tiles(atlas, tile_size):
+    """타일셋 이미지 배열을 인덱스 순서의 (N, ts, ts, C) 타일 배열로"""
+    return flatten_tiles(split_tiles(atlas, tile_size))
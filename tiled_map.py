@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Tiled 맵 형식(TMJ/TMX) 내보내기 / 가져오기
+
+우리 맵 JSON(width, height, tileSize, mapData, collisionTiles)은 우리 스크립트와 editor.js만 읽고
+압축 없이 저장된다. Tiled 표준 형식으로 바꾸면 Tiled 에디터와 Phaser(load.tilemapTiledJSON)가 바로 읽는다.
+
+    레이어 데이터 : base64(리틀 엔디언 uint32 GID), 압축 zlib / gzip / zstd / 없음
+    타일셋       : 맵 안에 포함 (이미지 경로는 맵 파일 기준 상대 경로, firstgid = 1)
+    충돌         : 충돌 타일마다 타일 속성 collides = true
+                   (Phaser: layer.setCollisionByProperty({ collides: true }))
+    GID          : 타일 ID + 1 (0은 빈 칸)
+
+Phaser 3의 Tiled 파서는 압축된 레이어를 읽지 못하므로 클라이언트용 파일은 --compression none으로 만들고
+전송 압축은 asset_manifest.py의 .gz/.br 파일에 맡긴다. zstd는 zstandard 모듈이 있을 때만 사용한다.
+
+사용 예:
+    python tiled_map.py export public/default_map.json public/assets/New_Tileset.png \\
+        --out public/default_map.tmj --compression zlib
+    python tiled_map.py import public/default_map.tmj --out default_map_from_tiled.json
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import xml.etree.ElementTree as ET
+import zlib
+
+import numpy as np
+from PIL import Image
+
+from sparse_map import decode_map
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+FIRST_GID = 1
+GID_MASK = 0x1FFFFFFF  # 상위 3비트는 Tiled 뒤집기 플래그
+COLLISION_PROPERTY = 'collides'
+TILED_VERSION = '1.10'
+
+
+def _compressor(compression):
+    if compression == 'zlib':
+        return zlib.compress, zlib.decompress
+    if compression == 'gzip':
+        return (lambda b: gzip.compress(b, mtime=0)), gzip.decompress
+    if compression == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstd 압축에는 zstandard 모듈이 필요합니다 (pip install zstandard)")
+        return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+    if compression in (None, '', 'none'):
+        return (lambda b: b), (lambda b: b)
+    raise ValueError(f"지원하지 않는 압축 방식: {compression}")
+
+
+def encode_layer(gids, compression='zlib'):
+    """(H, W) GID 배열 → base64 문자열"""
+    raw = np.ascontiguousarray(gids, dtype='<u4').tobytes()
+    return base64.b64encode(_compressor(compression)[0](raw)).decode('ascii')
+
+
+def decode_layer(data, width, height, encoding='base64', compression=None):
+    """Tiled 레이어 데이터 (base64 문자열, CSV 문자열 또는 숫자 목록) → (H, W) GID 배열"""
+    if encoding == 'base64':
+        raw = _compressor(compression)[1](base64.b64decode(data.strip()))
+        gids = np.frombuffer(raw, dtype='<u4')
+    elif isinstance(data, str):  # TMX CSV
+        gids = np.array([int(v) for v in data.replace('\n', '').split(',') if v.strip()], dtype=np.uint32)
+    else:
+        gids = np.asarray(data, dtype=np.uint32)
+    if gids.size != width * height:
+        raise ValueError(f"레이어 타일 수({gids.size})가 맵 크기({width}x{height})와 다릅니다")
+    return gids.reshape(height, width)
+
+
+def tileset_info(tileset_path, tile_size, collision_tiles, relative_to):
+    """포함 타일셋 정보 dict (TMJ 형식 키)"""
+    with Image.open(tileset_path) as img:
+        image_width, image_height = img.size
+    columns = image_width // tile_size
+    tile_count = columns * (image_height // tile_size)
+    return {
+        "firstgid": FIRST_GID,
+        "name": os.path.splitext(os.path.basename(tileset_path))[0],
+        "image": os.path.relpath(tileset_path, relative_to).replace(os.sep, '/'),
+        "imagewidth": image_width,
+        "imageheight": image_height,
+        "tilewidth": tile_size,
+        "tileheight": tile_size,
+        "columns": columns,
+        "tilecount": tile_count,
+        "margin": 0,
+        "spacing": 0,
+        "tiles": [
+            {"id": int(t), "properties": [{"name": COLLISION_PROPERTY, "type": "bool", "value": True}]}
+            for t in sorted(set(collision_tiles)) if 0 <= t < tile_count
+        ],
+    }
+
+
+def to_tiled(map_json, tileset_path, out_path, compression='zlib'):
+    """우리 맵 dict → TMJ dict"""
+    map_json = decode_map(map_json)
+    width, height = map_json["width"], map_json["height"]
+    tile_size = map_json.get("tileSize", 32)
+    data = np.asarray(map_json["mapData"], dtype=np.int64)
+
+    tileset = tileset_info(tileset_path, tile_size, map_json.get("collisionTiles", []),
+                           os.path.dirname(os.path.abspath(out_path)))
+    if data.min() < 0 or data.max() >= tileset["tilecount"]:
+        raise ValueError(f"mapData에 타일셋 범위(0-{tileset['tilecount'] - 1})를 벗어난 타일 ID가 있습니다")
+
+    layer = {
+        "id": 1,
+        "name": "ground",
+        "type": "tilelayer",
+        "x": 0,
+        "y": 0,
+        "width": width,
+        "height": height,
+        "opacity": 1,
+        "visible": True,
+        "encoding": "base64",
+        "data": encode_layer(data + FIRST_GID, compression),
+    }
+    if compression not in (None, '', 'none'):
+        layer["compression"] = compression
+
+    # 그 밖의 최상위 키(source 등)는 맵 속성으로 보존
+    extra = {k: v for k, v in map_json.items()
+             if k not in ("width", "height", "tileSize", "mapData", "collisionTiles")}
+    tmj = {
+        "type": "map",
+        "version": TILED_VERSION,
+        "orientation": "orthogonal",
+        "renderorder": "right-down",
+        "infinite": False,
+        "width": width,
+        "height": height,
+        "tilewidth": tile_size,
+        "tileheight": tile_size,
+        "nextlayerid": 2,
+        "nextobjectid": 1,
+        "layers": [layer],
+        "tilesets": [tileset],
+    }
+    if extra:
+        tmj["properties"] = [{"name": k, "type": "string", "value": json.dumps(v, ensure_ascii=False)}
+                             for k, v in extra.items()]
+    return tmj
+
+
+def tmj_to_tmx(tmj):
+    """TMJ dict → TMX ElementTree 루트"""
+    root = ET.Element('map', {
+        "version": tmj["version"], "orientation": tmj["orientation"], "renderorder": tmj["renderorder"],
+        "width": str(tmj["width"]), "height": str(tmj["height"]),
+        "tilewidth": str(tmj["tilewidth"]), "tileheight": str(tmj["tileheight"]),
+        "infinite": "0", "nextlayerid": str(tmj["nextlayerid"]), "nextobjectid": str(tmj["nextobjectid"]),
+    })
+    if tmj.get("properties"):
+        props = ET.SubElement(root, 'properties')
+        for p in tmj["properties"]:
+            ET.SubElement(props, 'property', {"name": p["name"], "type": p["type"], "value": str(p["value"])})
+
+    for ts in tmj["tilesets"]:
+        el = ET.SubElement(root, 'tileset', {
+            "firstgid": str(ts["firstgid"]), "name": ts["name"],
+            "tilewidth": str(ts["tilewidth"]), "tileheight": str(ts["tileheight"]),
+            "tilecount": str(ts["tilecount"]), "columns": str(ts["columns"]),
+        })
+        ET.SubElement(el, 'image', {"source": ts["image"], "width": str(ts["imagewidth"]),
+                                    "height": str(ts["imageheight"])})
+        for tile in ts["tiles"]:
+            tile_el = ET.SubElement(el, 'tile', {"id": str(tile["id"])})
+            props = ET.SubElement(tile_el, 'properties')
+            for p in tile["properties"]:
+                ET.SubElement(props, 'property', {"name": p["name"], "type": p["type"],
+                                                  "value": str(p["value"]).lower()})
+
+    for layer in tmj["layers"]:
+        el = ET.SubElement(root, 'layer', {"id": str(layer["id"]), "name": layer["name"],
+                                           "width": str(layer["width"]), "height": str(layer["height"])})
+        attrs = {"encoding": layer["encoding"]}
+        if layer.get("compression"):
+            attrs["compression"] = layer["compression"]
+        ET.SubElement(el, 'data', attrs).text = layer["data"]
+    return root
+
+
+def tmx_to_tmj(root):
+    """TMX 루트 → from_tiled가 읽는 TMJ 형식 dict (필요한 키만)"""
+    def props(el):
+        return [{"name": p.get("name"), "type": p.get("type", "string"), "value": p.get("value")}
+                for p in el.findall('properties/property')]
+
+    tilesets = []
+    for ts in root.findall('tileset'):
+        if ts.get("source"):
+            raise ValueError(f"외부 타일셋({ts.get('source')})은 지원하지 않습니다")
+        tilesets.append({
+            "firstgid": int(ts.get("firstgid")),
+            "image": ts.find('image').get("source"),
+            "tilewidth": int(ts.get("tilewidth")),
+            "tiles": [{"id": int(t.get("id")), "properties": props(t)} for t in ts.findall('tile')],
+        })
+    layers = []
+    for layer in root.findall('layer'):
+        data = layer.find('data')
+        layers.append({
+            "type": "tilelayer",
+            "width": int(layer.get("width")),
+            "height": int(layer.get("height")),
+            "encoding": data.get("encoding", "xml"),
+            "compression": data.get("compression"),
+            "data": data.text if data.get("encoding") else [int(t.get("gid", 0)) for t in data.findall('tile')],
+        })
+    return {
+        "width": int(root.get("width")),
+        "height": int(root.get("height")),
+        "tilewidth": int(root.get("tilewidth")),
+        "layers": layers,
+        "tilesets": tilesets,
+        "properties": props(root),
+    }
+
+
+def from_tiled(tmj, empty_tile=0):
+    """
+    TMJ dict → 우리 맵 dict (첫 타일 레이어 + 첫 타일셋)
+
+    빈 칸(GID 0)은 empty_tile로, 뒤집기 플래그는 무시한다.
+    """
+    layer = next((l for l in tmj["layers"] if l.get("type", "tilelayer") == "tilelayer"), None)
+    if layer is None:
+        raise ValueError("타일 레이어가 없습니다")
+    if len(tmj["tilesets"]) > 1:
+        print(f"⚠️ 타일셋 {len(tmj['tilesets'])}개 중 첫 번째만 사용합니다")
+    tileset = tmj["tilesets"][0]
+    first_gid = tileset["firstgid"]
+
+    gids = decode_layer(layer["data"], layer["width"], layer["height"],
+                        layer.get("encoding", "csv"), layer.get("compression")) & GID_MASK
+    data = np.where(gids == 0, empty_tile, gids.astype(np.int64) - first_gid)
+
+    collision = [tile["id"] for tile in tileset.get("tiles", [])
+                 if any(p["name"] == COLLISION_PROPERTY and str(p["value"]).lower() == 'true'
+                        for p in tile.get("properties", []))]
+
+    map_json = {
+        "width": layer["width"],
+        "height": layer["height"],
+        "tileSize": tmj["tilewidth"],
+        "mapData": data.tolist(),
+        "collisionTiles": collision,
+    }
+    for p in tmj.get("properties", []):
+        try:
+            map_json[p["name"]] = json.loads(p["value"])
+        except (TypeError, ValueError):
+            map_json[p["name"]] = p["value"]
+    return map_json
+
+
+def export_map(map_path, tileset_path, out_path, compression='zlib'):
+    """맵 파일 → .tmj 또는 .tmx (확장자로 결정)"""
+    with open(map_path, 'r', encoding='utf-8') as f:
+        tmj = to_tiled(json.load(f), tileset_path, out_path, compression)
+    if out_path.endswith('.tmx'):
+        root = tmj_to_tmx(tmj)
+        ET.indent(root)
+        ET.ElementTree(root).write(out_path, encoding='UTF-8', xml_declaration=True)
+    else:
+        with open(out_path, 'w', encoding='utf-8') as f:
+            json.dump(tmj, f, ensure_ascii=False)
+    return tmj
+
+
+def import_map(tiled_path, empty_tile=0):
+    """.tmj 또는 .tmx 파일 → 우리 맵 dict"""
+    if tiled_path.endswith('.tmx'):
+        return from_tiled(tmx_to_tmj(ET.parse(tiled_path).getroot()), empty_tile)
+    with open(tiled_path, 'r', encoding='utf-8') as f:
+        return from_tiled(json.load(f), empty_tile)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tiled 맵 형식(TMJ/TMX) 내보내기/가져오기')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    exp = sub.add_parser('export', help='우리 맵 JSON → .tmj/.tmx')
+    exp.add_argument('map')
+    exp.add_argument('tileset')
+    exp.add_argument('--out', required=True, help='.tmj 또는 .tmx')
+    exp.add_argument('--compression', choices=['zlib', 'gzip', 'zstd', 'none'], default='zlib')
+
+    imp = sub.add_parser('import', help='.tmj/.tmx → 우리 맵 JSON')
+    imp.add_argument('tiled')
+    imp.add_argument('--out', required=True)
+    imp.add_argument('--empty-tile', type=int, default=0, help='빈 칸(GID 0)에 넣을 타일 ID')
+
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        tmj = export_map(args.map, args.tileset, args.out, args.compression)
+        before, after = os.path.getsize(args.map), os.path.getsize(args.out)
+        print(f"✅ {args.out}: {tmj['width']}x{tmj['height']}, 충돌 타일 {len(tmj['tilesets'][0]['tiles'])}개, "
+              f"{before / 1024:.1f} KB → {after / 1024:.1f} KB ({args.compression})")
+    else:
+        map_json = import_map(args.tiled, args.empty_tile)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(map_json, f, indent=2, ensure_ascii=False)
+        print(f"✅ {args.out}: {map_json['width']}x{map_json['height']}, 충돌 타일 {map_json['collisionTiles']}")